@@ -0,0 +1,92 @@
+"""관리용 CLI
+
+    python -m app.cli migrate   # 테이블 생성 및 마이그레이션
+    python -m app.cli seed      # 초기 계정 생성
+    python -m app.cli init      # migrate + seed
+    python -m app.cli import-library [--root ..] [--workers 4] [--no-watermark]
+    python -m app.cli archive [--dry-run]   # 오래된 미디어를 아카이브 묶음으로 이동
+"""
+import argparse
+import os
+from app.database import SessionLocal
+from app.migrations import run_migrations
+from app.seed import create_initial_users
+
+def migrate():
+    applied = run_migrations()
+    print(f"적용된 마이그레이션: {', '.join(applied) if applied else '없음'}")
+
+def import_library(args):
+    from app.services.library_importer import LibraryImporter
+    db = SessionLocal()
+    try:
+        result = LibraryImporter(
+            db,
+            root=args.root,
+            workers=args.workers,
+            batch_size=args.batch_size,
+            watermark=args.watermark,
+        ).run()
+    finally:
+        db.close()
+    print(
+        f"검사 {result.scanned}, 변경 없음 {result.unchanged}, "
+        f"추가 {result.created}, 갱신 {result.updated}, 실패 {len(result.errors)}"
+    )
+    for path, error in result.errors:
+        print(f"  실패: {path}: {error}")
+
+def archive(args):
+    from app.services.archive_service import run_sweep
+    result = run_sweep(dry_run=args.dry_run)
+    if result is None:
+        print("다른 프로세스가 정리 중입니다")
+        return
+    prefix = "(dry-run) " if args.dry_run else ""
+    print(
+        f"{prefix}대상 컨텐츠 {result.contents}, 새로 묶은 파일 {result.archived}, "
+        f"지운 사본 {result.released}, 묶음 {result.bundles}, 확보 {result.freed_bytes / 1024 / 1024:.1f} MiB"
+    )
+
+def seed():
+    db = SessionLocal()
+    try:
+        created = create_initial_users(db)
+    finally:
+        db.close()
+    print(f"생성된 계정: {created}")
+
+COMMANDS = {
+    "migrate": [migrate],
+    "seed": [seed],
+    "init": [migrate, seed],
+}
+
+# backend/ 의 상위 = 카테고리 폴더와 contents.json 이 있는 저장소 루트
+DEFAULT_LIBRARY_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m app.cli")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    for name in COMMANDS:
+        subparsers.add_parser(name)
+    library = subparsers.add_parser("import-library", help="카테고리 폴더/contents.json 가져오기")
+    library.add_argument("--root", default=DEFAULT_LIBRARY_ROOT)
+    library.add_argument("--workers", type=int, default=os.cpu_count() or 4)
+    library.add_argument("--batch-size", type=int, default=500)
+    library.add_argument("--no-watermark", dest="watermark", action="store_false")
+    archive_parser = subparsers.add_parser("archive", help="오래된 미디어를 아카이브 묶음으로 이동")
+    archive_parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args(argv)
+
+    if args.command == "import-library":
+        import_library(args)
+        return
+    if args.command == "archive":
+        archive(args)
+        return
+    for step in COMMANDS[args.command]:
+        step()
+
+if __name__ == "__main__":
+    main()
@@ -24,11 +24,32 @@ class Settings(BaseSettings):
     # JWT
     ALGORITHM: str = "HS256"
     
+    # 외부 HTTP 호출 (소셜 로그인 등)
+    HTTP_TIMEOUT: float = 5.0
+    HTTP_CONNECT_TIMEOUT: float = 3.0
+    HTTP_MAX_CONNECTIONS: int = 100
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    
+    # 소셜 로그인
+    GOOGLE_CLIENT_ID: Optional[str] = None  # 설정 시 id_token 의 aud 검증
+    GOOGLE_JWKS_URL: str = "https://www.googleapis.com/oauth2/v3/certs"
+    GOOGLE_ISSUERS: list = ["accounts.google.com", "https://accounts.google.com"]
+    GOOGLE_JWKS_DEFAULT_MAX_AGE: int = 3600  # Cache-Control 이 없을 때 (초)
+    KAKAO_USER_INFO_URL: str = "https://kapi.kakao.com/v2/user/me"
+    KAKAO_TOKEN_CACHE_TTL: int = 60  # 검증된 토큰 캐시 시간 (초)
+    KAKAO_TOKEN_CACHE_SIZE: int = 10000
+    
     # GitHub
     GITHUB_TOKEN: str = "your-github-token"
     GITHUB_REPO: str = "your-username/FitMate"
+    GITHUB_BRANCH: str = "main"
+    GITHUB_API_URL: str = "https://api.github.com"
+    GITHUB_RAW_URL: str = "https://raw.githubusercontent.com"
+    GITHUB_TREE_TTL: int = 60  # 트리 캐시를 조건부 요청으로 다시 확인하는 주기 (초)
+    GITHUB_TREE_CACHE_PATH: Optional[str] = "cache/github_tree.json"
     
     # Social Media
+    PUBLISH_PLATFORMS: list = ["facebook", "instagram", "twitter"]
     FACEBOOK_TOKEN: str = "your-facebook-token"
     TWITTER_API_KEY: str = "your-twitter-api-key"
     TWITTER_API_SECRET: str = "your-twitter-api-secret"
@@ -40,6 +61,76 @@ class Settings(BaseSettings):
     # File Upload
     UPLOAD_DIR: str = "uploads"
     FONT_PATH: str = "/System/Library/Fonts/Supplemental/Arial.ttf"  # macOS 기본 Arial 폰트 경로
+    FFMPEG_BINARY: Optional[str] = None  # 없으면 imageio-ffmpeg 또는 PATH 의 ffmpeg
+    MEDIA_WORKERS: int = 2  # 프로세스당 백그라운드 미디어 작업 수
+    
+    # 이미지 워터마크 (큰 이미지를 메모리 한도 안에서 처리)
+    # 헤더 기준 이보다 크면 디코딩하지 않고 거절 (Pillow 자체 한도인 약 179MP 를 넘는 이미지는 열 때 거절됨)
+    IMAGE_MAX_PIXELS: int = 150_000_000
+    WATERMARK_MAX_DIMENSION: int = 0  # 워터마크 사본의 긴 변을 이 값으로 줄임 (0 이면 원본 크기). JPEG 는 축소 디코딩
+    IMAGE_MEMORY_BUDGET_MB: int = 512  # 프로세스당 이미지 디코딩 메모리. 넘으면 앞 작업이 끝날 때까지 대기
+    
+    # 비디오 미리보기 (포스터, 스크러빙 스프라이트)
+    PREVIEW_DIR: str = "uploads/previews"
+    PREVIEW_THUMB_WIDTH: int = 160
+    PREVIEW_SPRITE_COLUMNS: int = 10
+    PREVIEW_SPRITE_MAX_TILES: int = 100
+    PREVIEW_SPRITE_MIN_INTERVAL: float = 2.0  # 초
+    
+    # HLS 스트리밍
+    HLS_DIR: str = "uploads/hls"
+    HLS_SEGMENT_SECONDS: int = 6
+    HLS_RENDITIONS: list = [
+        {"name": "360p", "height": 360, "video_kbps": 800, "audio_kbps": 96},
+        {"name": "720p", "height": 720, "video_kbps": 2800, "audio_kbps": 128},
+        {"name": "1080p", "height": 1080, "video_kbps": 5000, "audio_kbps": 128},
+    ]
+    
+    # 요청 제한 (워커 간 공유 SQLite 파일)
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_DB_PATH: str = "ratelimit.db"
+    LOGIN_RATE_LIMIT: int = 10  # IP 당 LOGIN_RATE_WINDOW 초 동안
+    LOGIN_RATE_WINDOW: int = 60
+    PASSWORD_HASH_MAX_CONCURRENCY: int = 8  # 전체 워커 합산 bcrypt 동시 작업 수
+    UPLOAD_RATE_PER_MINUTE: float = 6  # 사용자 당
+    UPLOAD_BURST: int = 3
+    MEDIA_MAX_CONCURRENCY: int = 4  # 전체 워커 합산 워터마크/인코딩 동시 작업 수
+    MEDIA_JOB_LEASE: float = 3600  # 백그라운드 인코딩이 잡는 슬롯 (죽은 워커의 슬롯은 이 시간 뒤 회수)
+    
+    # 진행 상황 이벤트 스트림 (SSE, 워커 간 공유 SQLite 파일)
+    EVENT_DB_PATH: str = "events.db"
+    EVENT_RETENTION: int = 10000  # 재연결 시 다시 보낼 수 있는 최근 이벤트 수
+    EVENT_QUEUE_SIZE: int = 256  # 구독자별 대기 이벤트 수 (넘치면 연결을 끊고 재연결 시 재전송)
+    EVENT_POLL_INTERVAL: float = 0.25  # 초
+    EVENT_HEARTBEAT_SECONDS: float = 15
+    EVENT_RETRY_MS: int = 3000  # 클라이언트 재연결 대기 시간
+    
+    # 좋아요/댓글 수 (워커별 버퍼를 주기적으로 일괄 반영)
+    ENGAGEMENT_FLUSH_INTERVAL: float = 1.0  # 초 - 다른 워커에 보이기까지 최대 지연
+    ENGAGEMENT_MAX_PENDING: int = 5000  # 이만큼 쌓이면 주기를 기다리지 않고 반영
+    ENGAGEMENT_STATE_CACHE_SIZE: int = 100000  # 탭 응답에 쓰는 좋아요 상태/카운터 캐시 (최근 것만)
+    
+    # 오래된 미디어 아카이브 (UPLOAD_DIR 의 원본/워터마크 파일을 zip 묶음으로 옮기고 필요할 때 꺼냄)
+    ARCHIVE_DIR: str = "archive"
+    ARCHIVE_MIN_AGE_DAYS: int = 90  # 이보다 오래된 컨텐츠
+    ARCHIVE_PUBLISHED_MIN_AGE_DAYS: int = 14  # 게시가 끝난 컨텐츠는 더 일찍
+    ARCHIVE_IDLE_DAYS: int = 30  # 최근 이 기간 안에 조회된 파일은 그대로 둠
+    ARCHIVE_BUNDLE_MAX_BYTES: int = 1024 * 1024 * 1024
+    ARCHIVE_SWEEP_BATCH: int = 500  # 한 번에 처리할 컨텐츠 수
+    ARCHIVE_SWEEP_INTERVAL: float = 6 * 3600  # 초, 0 이면 백그라운드 정리 끔 (python -m app.cli archive 로만 실행)
+    ARCHIVE_ACCESS_TOUCH_INTERVAL: float = 3600  # 조회 시각은 이 간격보다 자주 기록하지 않음
+    
+    # 관리자용 요청 프로파일링 (X-Profile: 1 헤더 또는 ?_profile=1)
+    PROFILING_ENABLED: bool = True
+    PROFILE_DIR: str = "profiles"
+    PROFILE_MAX_FILES: int = 50  # 최근 프로파일만 보관
+    PROFILE_SAMPLE_INTERVAL: float = 0.005  # 초
+    PROFILE_MAX_SECONDS: float = 120  # 이보다 긴 요청은 앞부분만 샘플링
+    
+    # 애플리케이션 시작 시 초기화 (CLI로 별도 실행하려면 False)
+    RUN_MIGRATIONS_ON_STARTUP: bool = True
+    SEED_INITIAL_USERS: bool = True
+    INIT_LOCK_PATH: str = "fitmate-init.lock"  # 여러 워커가 동시에 시작할 때 초기화를 한 번에 하나씩
     
     class Config:
         case_sensitive = True
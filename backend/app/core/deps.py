@@ -1,5 +1,5 @@
 from typing import Generator, Optional
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Query, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
 from sqlalchemy.orm import Session
@@ -8,6 +8,7 @@ from app.database import SessionLocal
 from app.models.user import User
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
+optional_oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token", auto_error=False)
 
 def get_db() -> Generator:
     """데이터베이스 세션 의존성"""
@@ -17,16 +18,15 @@ def get_db() -> Generator:
     finally:
         db.close()
 
-async def get_current_user(
-    db: Session = Depends(get_db),
-    token: str = Depends(oauth2_scheme)
-) -> User:
-    """현재 인증된 사용자 가져오기"""
+def user_from_token(db: Session, token: Optional[str]) -> User:
+    """JWT 의 sub 로 사용자 조회 (실패하면 401)"""
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+    if not token:
+        raise credentials_exception
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         username: str = payload.get("sub")
@@ -40,6 +40,30 @@ async def get_current_user(
         raise credentials_exception
     return user
 
+async def get_current_user(
+    db: Session = Depends(get_db),
+    token: str = Depends(oauth2_scheme)
+) -> User:
+    """현재 인증된 사용자 가져오기"""
+    return user_from_token(db, token)
+
+async def get_stream_user(
+    token: Optional[str] = Depends(optional_oauth2_scheme),
+    access_token: Optional[str] = Query(None),
+) -> User:
+    """SSE 용 사용자 확인 (브라우저 EventSource 는 헤더를 못 넣으므로 쿼리 토큰도 허용)
+
+    get_db 를 쓰면 스트림이 열려 있는 동안 세션과 풀 연결을 계속 잡고 있으므로
+    여기서 바로 닫고, 세션에서 떼어낸 사용자만 돌려준다.
+    """
+    db = SessionLocal()
+    try:
+        user = user_from_token(db, token or access_token)
+        db.expunge(user)
+        return user
+    finally:
+        db.close()
+
 async def get_current_active_user(
     current_user: User = Depends(get_current_user),
 ) -> User:
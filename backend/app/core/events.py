@@ -0,0 +1,187 @@
+"""업로드/처리/게시 상태 변경 이벤트 (SSE 스트림용)
+
+이벤트는 워커들이 공유하는 SQLite 파일(WAL)에 기록되고, 각 워커의 EventHub 가 새 행을
+짧은 주기로 읽어 자기 프로세스의 구독자들에게 나눠 준다. 이벤트 id 가 모든 워커에서
+같으므로 재연결한 클라이언트는 Last-Event-ID 이후의 이벤트를 어느 워커에서든 다시 받는다.
+"""
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import List, Optional, Set
+from app.core.config import settings
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    type TEXT NOT NULL,
+    user_id INTEGER,
+    content_id INTEGER,
+    data TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_events_user_id ON events (user_id, id);
+"""
+
+@dataclass
+class Event:
+    id: int
+    type: str
+    user_id: Optional[int]
+    content_id: Optional[int]
+    data: dict
+
+    def to_sse(self) -> str:
+        payload = json.dumps(
+            {"type": self.type, "content_id": self.content_id, **self.data},
+            ensure_ascii=False,
+            default=str,
+        )
+        return f"id: {self.id}\nevent: {self.type}\ndata: {payload}\n\n"
+
+class EventStore:
+    """워커 간 공유 이벤트 로그"""
+
+    def __init__(self, path: str, retention: int):
+        self.path = path
+        self.retention = retention
+        self._local = threading.local()
+        self._appended = 0
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            self._local.conn = conn
+        return conn
+
+    def append_many(self, events: List[tuple]):
+        """(type, user_id, content_id, data) 목록을 한 트랜잭션으로 기록"""
+        if not events:
+            return
+        now = time.time()
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany(
+                "INSERT INTO events (type, user_id, content_id, data, created_at) VALUES (?, ?, ?, ?, ?)",
+                [(type_, user_id, content_id, json.dumps(data, ensure_ascii=False, default=str), now)
+                 for type_, user_id, content_id, data in events]
+            )
+            self._appended += len(events)
+            # 가끔 오래된 이벤트 정리 (재연결 재전송 범위는 retention 개)
+            if self._appended >= 1000:
+                self._appended = 0
+                conn.execute(
+                    "DELETE FROM events WHERE id <= (SELECT MAX(id) FROM events) - ?", (self.retention,)
+                )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def read_after(self, last_id: int, user_id: Optional[int] = None, limit: int = 1000) -> List[Event]:
+        """last_id 이후 이벤트 (user_id 를 주면 그 사용자 것만)"""
+        if user_id is None:
+            rows = self._connection().execute(
+                "SELECT id, type, user_id, content_id, data FROM events WHERE id > ? ORDER BY id LIMIT ?",
+                (last_id, limit)
+            ).fetchall()
+        else:
+            rows = self._connection().execute(
+                "SELECT id, type, user_id, content_id, data FROM events "
+                "WHERE user_id = ? AND id > ? ORDER BY id LIMIT ?",
+                (user_id, last_id, limit)
+            ).fetchall()
+        return [Event(row[0], row[1], row[2], row[3], json.loads(row[4])) for row in rows]
+
+    def last_id(self) -> int:
+        (last_id,) = self._connection().execute("SELECT COALESCE(MAX(id), 0) FROM events").fetchone()
+        return last_id
+
+class Subscription:
+    def __init__(self, user_id: Optional[int], content_id: Optional[int], queue_size: int):
+        self.user_id = user_id  # None 이면 모든 사용자 (관리자)
+        self.content_id = content_id  # None 이면 모든 컨텐츠
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.overflowed = False
+
+    def accepts(self, event: Event) -> bool:
+        if self.user_id is not None and event.user_id != self.user_id:
+            return False
+        return self.content_id is None or event.content_id == self.content_id
+
+    def offer(self, event: Event):
+        if self.overflowed or not self.accepts(event):
+            return
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # 느린 클라이언트 때문에 메모리가 늘지 않도록 끊고, 재연결 시 로그에서 다시 받게 함
+            self.overflowed = True
+
+class EventHub:
+    """프로세스 내 구독자 관리 + 공유 로그 폴링"""
+
+    def __init__(self, store: EventStore):
+        self.store = store
+        self.subscriptions: Set[Subscription] = set()
+        self._poller: Optional[asyncio.Task] = None
+
+    async def subscribe(self, user_id: Optional[int], content_id: Optional[int] = None) -> Subscription:
+        """구독 등록. 반환 시점 이후 기록된 이벤트는 빠짐없이 큐에 들어온다"""
+        subscription = Subscription(user_id, content_id, settings.EVENT_QUEUE_SIZE)
+        self.subscriptions.add(subscription)
+        poller = self._poller
+        if poller is None or poller.done() or poller.get_loop() is not asyncio.get_running_loop():
+            # 폴링 시작 위치를 먼저 정해야 재전송(replay)과 사이에 빈틈이 생기지 않음
+            last_id = await asyncio.to_thread(self.store.last_id)
+            self._poller = asyncio.create_task(self._poll(last_id))
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        self.subscriptions.discard(subscription)
+
+    async def _poll(self, last_id: int):
+        # 구독자가 없으면 멈추고, 다음 구독 때 다시 시작
+        while self.subscriptions:
+            events = await asyncio.to_thread(self.store.read_after, last_id)
+            for event in events:
+                for subscription in list(self.subscriptions):
+                    subscription.offer(event)
+            if events:
+                last_id = events[-1].id
+            else:
+                await asyncio.sleep(settings.EVENT_POLL_INTERVAL)
+
+_store: Optional[EventStore] = None
+_hub: Optional[EventHub] = None
+
+def get_event_store() -> EventStore:
+    global _store
+    if _store is None:
+        _store = EventStore(settings.EVENT_DB_PATH, settings.EVENT_RETENTION)
+    return _store
+
+def get_event_hub() -> EventHub:
+    global _hub
+    if _hub is None:
+        _hub = EventHub(get_event_store())
+    return _hub
+
+def publish_event(type_: str, user_id: Optional[int], content_id: Optional[int] = None, **data):
+    """이벤트 발행 (요청 핸들러, 미디어 워커 스레드 어디서나 호출 가능)"""
+    get_event_store().append_many([(type_, user_id, content_id, data)])
+
+def publish_events(events: List[tuple]):
+    """(type, user_id, content_id, data) 여러 개를 한 번에 발행"""
+    get_event_store().append_many(events)
@@ -0,0 +1,26 @@
+from typing import Optional
+import httpx
+from app.core.config import settings
+
+# 워커 프로세스 전체가 공유하는 비동기 HTTP 클라이언트 (커넥션 풀 재사용)
+_client: Optional[httpx.AsyncClient] = None
+
+def get_http_client() -> httpx.AsyncClient:
+    """공유 AsyncClient 가져오기 (첫 호출 시 생성)"""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            timeout=httpx.Timeout(settings.HTTP_TIMEOUT, connect=settings.HTTP_CONNECT_TIMEOUT),
+            limits=httpx.Limits(
+                max_connections=settings.HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            ),
+        )
+    return _client
+
+async def close_http_client():
+    """애플리케이션 종료 시 커넥션 풀 정리"""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
@@ -0,0 +1,370 @@
+"""관리자용 요청 단위 프로파일링
+
+관리자 토큰으로 `X-Profile: 1` 헤더(또는 `?_profile=1`)를 붙인 요청 하나만 샘플링
+프로파일러로 실행하고, 그동안 실행된 SQL 과 소요 시간을 SQLAlchemy 이벤트로 모은다.
+결과는 speedscope(https://www.speedscope.app) 형식 파일로 PROFILE_DIR 에 최근
+PROFILE_MAX_FILES 개까지만 남기고, 응답의 X-Profile-Id 로 내려받을 id 를 알려 준다.
+
+플래그가 없는 요청은 헤더 확인만 하고 그대로 통과한다. 샘플러 스레드와 SQL 이벤트
+리스너는 프로파일 중인 요청이 있을 때만 붙는다. 같은 워커에서 동시에 처리 중인 다른
+요청의 스택은 샘플에 넣지 않는다.
+"""
+import contextvars
+import json
+import os
+import sys
+import threading
+import time
+import uuid
+from contextvars import Context
+from dataclasses import dataclass, field
+from datetime import datetime
+from types import FrameType
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs
+from fastapi import HTTPException
+from sqlalchemy import event
+from starlette.concurrency import run_in_threadpool
+from app.core.config import settings
+from app.database import SessionLocal, engine
+
+PROFILE_HEADER = b"x-profile"
+PROFILE_QUERY = "_profile"
+PROFILE_ID_HEADER = b"x-profile-id"
+SPEEDSCOPE_SUFFIX = ".speedscope.json"
+SUMMARY_SUFFIX = ".json"
+
+# 이 함수에서 멈춰 있는 스레드는 쉬는 중으로 보고 샘플에서 뺌
+_IDLE_FUNCTIONS = {"wait", "select", "poll"}
+
+_current_profile: contextvars.ContextVar[Optional["RequestProfile"]] = contextvars.ContextVar(
+    "current_profile", default=None
+)
+
+@dataclass
+class RequestProfile:
+    method: str
+    path: str
+    loop_thread: int
+    # 미들웨어 코루틴의 프레임. 이벤트 루프 스택에 이 프레임이 있을 때만 이 요청을 실행 중
+    root_frame: Optional[FrameType] = field(default=None, repr=False)
+    id: str = field(default_factory=lambda: uuid.uuid4().hex[:16])
+    started_at: float = field(default_factory=time.perf_counter)
+    created_at: datetime = field(default_factory=datetime.utcnow)
+    frames: Dict[Tuple[str, str, int], int] = field(default_factory=dict)
+    # 스레드 id -> (이름, [(직전 샘플 이후 시간, 프레임 index 목록)])
+    samples: Dict[int, Tuple[str, List[Tuple[float, List[int]]]]] = field(default_factory=dict)
+    queries: List[dict] = field(default_factory=list)
+    duration: float = 0.0
+    status_code: Optional[int] = None
+
+    def frame_index(self, code) -> int:
+        key = (getattr(code, "co_qualname", code.co_name), code.co_filename, code.co_firstlineno)
+        index = self.frames.get(key)
+        if index is None:
+            index = self.frames[key] = len(self.frames)
+        return index
+
+class _Sampler(threading.Thread):
+    """interval 마다 이 요청을 처리 중인 스레드의 스택만 찍는 샘플링 프로파일러"""
+
+    def __init__(self, profile: RequestProfile, interval: float, max_seconds: float):
+        super().__init__(name="request-profiler", daemon=True)
+        self.profile = profile
+        self.interval = interval
+        self.max_seconds = max_seconds
+        self._stop_event = threading.Event()
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+    def _include(self, thread_id: int, stack: List[FrameType]) -> bool:
+        """stack 은 안쪽 프레임부터"""
+        # 이벤트 루프는 여러 요청이 나눠 쓰므로 이 요청의 코루틴을 실행 중일 때만
+        if thread_id == self.profile.loop_thread:
+            return any(frame is self.profile.root_frame for frame in stack)
+        if stack[0].f_code.co_name in _IDLE_FUNCTIONS:
+            return False
+        # 스레드풀 작업은 요청의 컨텍스트를 복사해 context.run() 으로 실행되므로
+        # 바깥쪽 프레임에서 처음 보이는 Context 가 이 요청의 것인지 확인
+        for frame in reversed(stack):
+            for value in frame.f_locals.values():
+                if isinstance(value, Context):
+                    return value.get(_current_profile) is self.profile
+        return False
+
+    def run(self):
+        profile = self.profile
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        own_id = threading.get_ident()
+        previous = 0.0
+        while not self._stop_event.wait(self.interval):
+            elapsed = time.perf_counter() - profile.started_at
+            if elapsed > self.max_seconds:
+                break
+            # GIL 때문에 간격이 늘어질 수 있어 실제 경과 시간을 가중치로 사용
+            weight, previous = elapsed - previous, elapsed
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                frames = []
+                while frame is not None:
+                    frames.append(frame)
+                    frame = frame.f_back
+                if not self._include(thread_id, frames):
+                    continue
+                stack = [profile.frame_index(frame.f_code) for frame in reversed(frames)]
+                if thread_id not in profile.samples:
+                    if thread_id not in names:
+                        names = {thread.ident: thread.name for thread in threading.enumerate()}
+                    profile.samples[thread_id] = (names.get(thread_id, str(thread_id)), [])
+                profile.samples[thread_id][1].append((weight, stack))
+
+# SQL 이벤트 리스너는 프로파일 중인 요청이 있을 때만 등록
+_listener_lock = threading.Lock()
+_active_profiles = 0
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current_profile.get() is not None:
+        conn.info.setdefault("profile_query_start", []).append(time.perf_counter())
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    profile = _current_profile.get()
+    starts = conn.info.get("profile_query_start")
+    if profile is None or not starts:
+        return
+    started = starts.pop()
+    # 파라미터에는 비밀번호 등이 들어갈 수 있어 문장만 기록
+    profile.queries.append({
+        "statement": statement,
+        "start": started - profile.started_at,
+        "duration": time.perf_counter() - started,
+        "executemany": executemany,
+        "rows": cursor.rowcount,
+    })
+
+def _attach_listeners():
+    global _active_profiles
+    with _listener_lock:
+        if _active_profiles == 0:
+            event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+            event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+        _active_profiles += 1
+
+def _detach_listeners():
+    global _active_profiles
+    with _listener_lock:
+        _active_profiles -= 1
+        if _active_profiles == 0:
+            event.remove(engine, "before_cursor_execute", _before_cursor_execute)
+            event.remove(engine, "after_cursor_execute", _after_cursor_execute)
+
+def to_speedscope(profile: RequestProfile) -> dict:
+    """스레드별 샘플 프로파일 + SQL 타임라인(evented) 프로파일"""
+    frames = [{"name": name, "file": file, "line": line} for name, file, line in profile.frames]
+    profiles = []
+    for thread_id, (name, samples) in profile.samples.items():
+        if not samples:
+            continue
+        profiles.append({
+            "type": "sampled",
+            "name": f"{name} ({thread_id})",
+            "unit": "seconds",
+            "startValue": 0,
+            "endValue": profile.duration,
+            "samples": [stack for _, stack in samples],
+            "weights": [weight for weight, _ in samples],
+        })
+
+    if profile.queries:
+        events = []
+        sql_frames: Dict[str, int] = {}
+        queries = sorted(profile.queries, key=lambda q: q["start"])
+        for query, following in zip(queries, queries[1:] + [None]):
+            name = "SQL: " + " ".join(query["statement"].split())[:200]
+            index = sql_frames.get(name)
+            if index is None:
+                index = sql_frames[name] = len(frames)
+                frames.append({"name": name})
+            end = query["start"] + query["duration"]
+            if following is not None:
+                # 다른 스레드의 쿼리와 겹치면 speedscope 가 거부하므로 다음 쿼리 시작에서 자름
+                end = min(end, following["start"])
+            events.append({"type": "O", "frame": index, "at": query["start"]})
+            events.append({"type": "C", "frame": index, "at": end})
+        profiles.append({
+            "type": "evented",
+            "name": "SQL",
+            "unit": "seconds",
+            "startValue": 0,
+            "endValue": max(profile.duration, events[-1]["at"]),
+            "events": events,
+        })
+
+    return {
+        "$schema": "https://www.speedscope.app/file-format-schema.json",
+        "name": f"{profile.method} {profile.path}",
+        "exporter": "fitmate",
+        "shared": {"frames": frames},
+        "profiles": profiles,
+    }
+
+def summarize(profile: RequestProfile) -> dict:
+    return {
+        "id": profile.id,
+        "method": profile.method,
+        "path": profile.path,
+        "status_code": profile.status_code,
+        "created_at": profile.created_at.isoformat(),
+        "duration": profile.duration,
+        "samples": sum(len(samples) for _, samples in profile.samples.values()),
+        "sql_count": len(profile.queries),
+        "sql_time": sum(query["duration"] for query in profile.queries),
+        "queries": profile.queries,
+    }
+
+class ProfileStore:
+    """최근 프로파일 파일 (워커들이 같은 디렉터리를 공유, 오래된 것부터 삭제)"""
+
+    def __init__(self, directory: str, max_files: int):
+        self.directory = directory
+        self.max_files = max_files
+
+    def _path(self, profile_id: str, suffix: str) -> Optional[str]:
+        # id 는 16자리 hex 만 허용 (경로 조작 방지)
+        if len(profile_id) != 16 or any(c not in "0123456789abcdef" for c in profile_id):
+            return None
+        return os.path.join(self.directory, profile_id + suffix)
+
+    def save(self, profile: RequestProfile):
+        os.makedirs(self.directory, exist_ok=True)
+        for suffix, payload in ((SPEEDSCOPE_SUFFIX, to_speedscope(profile)), (SUMMARY_SUFFIX, summarize(profile))):
+            path = self._path(profile.id, suffix)
+            with open(path + ".tmp", "w", encoding="utf-8") as f:
+                json.dump(payload, f, ensure_ascii=False)
+            os.replace(path + ".tmp", path)
+        self._trim()
+
+    def _summary_paths(self) -> List[str]:
+        if not os.path.isdir(self.directory):
+            return []
+        with os.scandir(self.directory) as entries:
+            paths = [
+                entry for entry in entries
+                if entry.name.endswith(SUMMARY_SUFFIX) and not entry.name.endswith(SPEEDSCOPE_SUFFIX)
+            ]
+        paths.sort(key=lambda entry: entry.stat().st_mtime, reverse=True)
+        return [entry.path for entry in paths]
+
+    def _trim(self):
+        for path in self._summary_paths()[self.max_files:]:
+            profile_id = os.path.basename(path)[:-len(SUMMARY_SUFFIX)]
+            for suffix in (SUMMARY_SUFFIX, SPEEDSCOPE_SUFFIX):
+                try:
+                    os.remove(os.path.join(self.directory, profile_id + suffix))
+                except FileNotFoundError:
+                    pass
+
+    def list(self) -> List[dict]:
+        summaries = []
+        for path in self._summary_paths():
+            try:
+                with open(path, encoding="utf-8") as f:
+                    summary = json.load(f)
+            except (FileNotFoundError, ValueError):
+                continue  # 다른 워커가 방금 지움
+            summary.pop("queries", None)
+            summaries.append(summary)
+        return summaries
+
+    def get_summary(self, profile_id: str) -> Optional[dict]:
+        path = self._path(profile_id, SUMMARY_SUFFIX)
+        if path is None or not os.path.exists(path):
+            return None
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+
+    def speedscope_path(self, profile_id: str) -> Optional[str]:
+        path = self._path(profile_id, SPEEDSCOPE_SUFFIX)
+        if path is None or not os.path.exists(path):
+            return None
+        return path
+
+_store: Optional[ProfileStore] = None
+
+def get_profile_store() -> ProfileStore:
+    global _store
+    if _store is None:
+        _store = ProfileStore(settings.PROFILE_DIR, settings.PROFILE_MAX_FILES)
+    return _store
+
+def _profile_requested(scope) -> bool:
+    for name, value in scope["headers"]:
+        if name == PROFILE_HEADER:
+            return value not in (b"", b"0", b"false")
+    query = scope.get("query_string", b"")
+    if PROFILE_QUERY.encode() in query:
+        values = parse_qs(query.decode("latin-1")).get(PROFILE_QUERY, [])
+        return any(value not in ("", "0", "false") for value in values)
+    return False
+
+def _bearer_token(scope) -> Optional[str]:
+    for name, value in scope["headers"]:
+        if name == b"authorization":
+            value = value.decode("latin-1")
+            if value.lower().startswith("bearer "):
+                return value[7:]
+    return None
+
+def _is_admin(token: Optional[str]) -> bool:
+    from app.core.deps import user_from_token
+    from app.models.user import UserRole
+    db = SessionLocal()
+    try:
+        return user_from_token(db, token).role == UserRole.ADMIN
+    except HTTPException:
+        return False
+    finally:
+        db.close()
+
+class ProfilingMiddleware:
+    """X-Profile 플래그가 붙은 관리자 요청만 프로파일링하는 ASGI 미들웨어"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not _profile_requested(scope):
+            await self.app(scope, receive, send)
+            return
+        # 관리자가 아니면 플래그를 무시하고 평소처럼 처리
+        if not await run_in_threadpool(_is_admin, _bearer_token(scope)):
+            await self.app(scope, receive, send)
+            return
+
+        profile = RequestProfile(
+            method=scope["method"], path=scope["path"], loop_thread=threading.get_ident(),
+            root_frame=sys._getframe(),
+        )
+
+        async def send_with_profile_id(message):
+            if message["type"] == "http.response.start":
+                profile.status_code = message["status"]
+                message["headers"] = list(message.get("headers", [])) + [
+                    (PROFILE_ID_HEADER, profile.id.encode())
+                ]
+            await send(message)
+
+        sampler = _Sampler(profile, settings.PROFILE_SAMPLE_INTERVAL, settings.PROFILE_MAX_SECONDS)
+        token = _current_profile.set(profile)
+        _attach_listeners()
+        sampler.start()
+        try:
+            await self.app(scope, receive, send_with_profile_id)
+        finally:
+            sampler.stop()
+            _detach_listeners()
+            _current_profile.reset(token)
+            profile.duration = time.perf_counter() - profile.started_at
+            await run_in_threadpool(get_profile_store().save, profile)
@@ -0,0 +1,268 @@
+"""업로드/로그인 엔드포인트용 요청 제한 (admission control)
+
+여러 uvicorn 워커가 같은 SQLite 파일(WAL)을 공유해 상태를 맞춘다. 외부 서비스 없이
+`BEGIN IMMEDIATE` 트랜잭션으로 확인과 갱신을 원자적으로 처리한다.
+
+    @router.post("/upload", dependencies=[
+        Depends(TokenBucketLimit("upload", rate=0.5, capacity=5, key=KeyBy.USER)),
+        Depends(ConcurrencyLimit("media", max_concurrent=4)),
+    ])
+"""
+import enum
+from concurrent.futures import CancelledError
+import math
+import os
+import random
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Optional
+from fastapi import HTTPException, Request, status
+from jose import JWTError, jwt
+from app.core.config import settings
+from app.core.security import SECRET_KEY, ALGORITHM
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS token_buckets (
+    key TEXT PRIMARY KEY,
+    tokens REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS window_counters (
+    key TEXT NOT NULL,
+    window_start INTEGER NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (key, window_start)
+);
+CREATE TABLE IF NOT EXISTS concurrency_slots (
+    scope TEXT NOT NULL,
+    holder TEXT NOT NULL,
+    expires_at REAL NOT NULL,
+    PRIMARY KEY (scope, holder)
+);
+"""
+
+class RateLimitStore:
+    """워커 프로세스 간에 공유되는 SQLite 기반 카운터 저장소"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            self._local.conn = conn
+        return conn
+
+    def _transaction(self):
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        return conn
+
+    def take_token(self, key: str, rate: float, capacity: float, now: float) -> float:
+        """토큰 버킷에서 토큰 1개 사용. 성공하면 0, 실패하면 다음 토큰까지 남은 초"""
+        conn = self._transaction()
+        try:
+            row = conn.execute(
+                "SELECT tokens, updated_at FROM token_buckets WHERE key = ?", (key,)
+            ).fetchone()
+            tokens = capacity if row is None else min(capacity, row[0] + (now - row[1]) * rate)
+            wait = 0.0
+            if tokens >= 1:
+                tokens -= 1
+            else:
+                wait = (1 - tokens) / rate
+            conn.execute(
+                "INSERT OR REPLACE INTO token_buckets (key, tokens, updated_at) VALUES (?, ?, ?)",
+                (key, tokens, now)
+            )
+            # 오래 쓰이지 않은 버킷은 가끔 정리 (가득 찬 버킷과 같으므로 지워도 무방)
+            if random.random() < 0.001:
+                conn.execute(
+                    "DELETE FROM token_buckets WHERE updated_at < ?", (now - capacity / rate,)
+                )
+            conn.execute("COMMIT")
+            return wait
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def hit_window(self, key: str, limit: int, window: int, now: float) -> float:
+        """슬라이딩 윈도우(직전 고정 윈도우 가중 합산) 카운트. 성공하면 0, 실패하면 대기 초"""
+        current = int(now // window) * window
+        previous = current - window
+        conn = self._transaction()
+        try:
+            counts = dict(conn.execute(
+                "SELECT window_start, count FROM window_counters "
+                "WHERE key = ? AND window_start IN (?, ?)",
+                (key, previous, current)
+            ).fetchall())
+            weight = 1 - (now - current) / window
+            estimated = counts.get(previous, 0) * weight + counts.get(current, 0)
+            if estimated + 1 > limit:
+                conn.execute("COMMIT")
+                return float(current + window - now)
+            conn.execute(
+                "INSERT INTO window_counters (key, window_start, count) VALUES (?, ?, 1) "
+                "ON CONFLICT (key, window_start) DO UPDATE SET count = count + 1",
+                (key, current)
+            )
+            conn.execute(
+                "DELETE FROM window_counters WHERE key = ? AND window_start < ?", (key, previous)
+            )
+            conn.execute("COMMIT")
+            return 0.0
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def acquire_slot(self, scope: str, limit: int, lease: float, now: float) -> Optional[str]:
+        """동시 실행 슬롯 획득. 꽉 찼으면 None (죽은 워커의 슬롯은 lease 만료 후 회수)"""
+        conn = self._transaction()
+        try:
+            conn.execute(
+                "DELETE FROM concurrency_slots WHERE scope = ? AND expires_at < ?", (scope, now)
+            )
+            (in_use,) = conn.execute(
+                "SELECT COUNT(*) FROM concurrency_slots WHERE scope = ?", (scope,)
+            ).fetchone()
+            holder = None
+            if in_use < limit:
+                holder = uuid.uuid4().hex
+                conn.execute(
+                    "INSERT INTO concurrency_slots (scope, holder, expires_at) VALUES (?, ?, ?)",
+                    (scope, holder, now + lease)
+                )
+            conn.execute("COMMIT")
+            return holder
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def release_slot(self, scope: str, holder: str):
+        self._connection().execute(
+            "DELETE FROM concurrency_slots WHERE scope = ? AND holder = ?", (scope, holder)
+        )
+
+_store: Optional[RateLimitStore] = None
+
+def get_rate_limit_store() -> RateLimitStore:
+    global _store
+    if _store is None:
+        _store = RateLimitStore(settings.RATE_LIMIT_DB_PATH)
+    return _store
+
+class KeyBy(str, enum.Enum):
+    IP = "ip"
+    USER = "user"  # 토큰이 없거나 잘못되면 IP 로 대체
+
+def _client_ip(request: Request) -> str:
+    return request.client.host if request.client else "unknown"
+
+def _request_key(request: Request, scope: str, key_by: KeyBy) -> str:
+    if key_by == KeyBy.USER:
+        # DB 조회 없이 토큰의 sub 만 확인 (인증 자체는 get_current_user 가 담당)
+        authorization = request.headers.get("authorization", "")
+        if authorization.lower().startswith("bearer "):
+            try:
+                payload = jwt.decode(authorization[7:], SECRET_KEY, algorithms=[ALGORITHM])
+                if payload.get("sub"):
+                    return f"{scope}:user:{payload['sub']}"
+            except JWTError:
+                pass
+    return f"{scope}:ip:{_client_ip(request)}"
+
+def _reject(status_code: int, detail: str, retry_after: float):
+    raise HTTPException(
+        status_code=status_code,
+        detail=detail,
+        headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+    )
+
+class TokenBucketLimit:
+    """토큰 버킷 제한 - 초당 rate 개씩 채워지고 최대 capacity 개까지 버스트 허용"""
+
+    def __init__(self, scope: str, rate: float, capacity: int, key: KeyBy = KeyBy.IP):
+        self.scope = scope
+        self.rate = rate
+        self.capacity = capacity
+        self.key = key
+
+    def __call__(self, request: Request):
+        if not settings.RATE_LIMIT_ENABLED:
+            return
+        wait = get_rate_limit_store().take_token(
+            _request_key(request, self.scope, self.key), self.rate, self.capacity, time.time()
+        )
+        if wait:
+            _reject(status.HTTP_429_TOO_MANY_REQUESTS, "요청이 너무 많습니다", wait)
+
+class SlidingWindowLimit:
+    """슬라이딩 윈도우 제한 - window 초 동안 최대 limit 회"""
+
+    def __init__(self, scope: str, limit: int, window: int, key: KeyBy = KeyBy.IP):
+        self.scope = scope
+        self.limit = limit
+        self.window = window
+        self.key = key
+
+    def __call__(self, request: Request):
+        if not settings.RATE_LIMIT_ENABLED:
+            return
+        wait = get_rate_limit_store().hit_window(
+            _request_key(request, self.scope, self.key), self.limit, self.window, time.time()
+        )
+        if wait:
+            _reject(status.HTTP_429_TOO_MANY_REQUESTS, "요청이 너무 많습니다", wait)
+
+class ConcurrencyLimit:
+    """전체 워커 합산 동시 실행 수 제한 - 꽉 차면 기다리지 않고 바로 503"""
+
+    def __init__(self, scope: str, max_concurrent: int, lease: float = 600, retry_after: float = 5):
+        self.scope = scope
+        self.max_concurrent = max_concurrent
+        self.lease = lease
+        self.retry_after = retry_after
+
+    def __call__(self):
+        if not settings.RATE_LIMIT_ENABLED:
+            yield
+            return
+        store = get_rate_limit_store()
+        holder = store.acquire_slot(self.scope, self.max_concurrent, self.lease, time.time())
+        if holder is None:
+            _reject(status.HTTP_503_SERVICE_UNAVAILABLE, "서버가 바쁩니다. 잠시 후 다시 시도해주세요", self.retry_after)
+        try:
+            yield
+        finally:
+            store.release_slot(self.scope, holder)
+
+    @contextmanager
+    def hold(self, stop: threading.Event, poll: float = 1.0):
+        """백그라운드 작업용: 거절하지 않고 슬롯이 빌 때까지 기다렸다가 작업하는 동안 보유.
+        기다리는 중에 stop 이 설정되면 CancelledError"""
+        if not settings.RATE_LIMIT_ENABLED:
+            yield
+            return
+        store = get_rate_limit_store()
+        while True:
+            holder = store.acquire_slot(self.scope, self.max_concurrent, self.lease, time.time())
+            if holder is not None:
+                break
+            if stop.wait(poll):
+                raise CancelledError(f"{self.scope} 슬롯 대기 중 종료")
+        try:
+            yield
+        finally:
+            store.release_slot(self.scope, holder)
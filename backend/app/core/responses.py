@@ -0,0 +1,13 @@
+from typing import Any
+import orjson
+from fastapi.responses import JSONResponse, Response
+
+class ORJSONResponse(JSONResponse):
+    """orjson 으로 직렬화하는 기본 응답 클래스"""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+class RawJSONResponse(Response):
+    """이미 JSON 바이트로 직렬화된 본문을 그대로 보내는 응답"""
+    media_type = "application/json"
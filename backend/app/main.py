@@ -1,132 +1,72 @@
-from fastapi import FastAPI, Depends, HTTPException, status
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, APIRouter, Depends, HTTPException, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
+from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
-from passlib.context import CryptContext
-from datetime import datetime, timedelta
-from jose import JWTError, jwt
-from . import models, database
-from typing import Optional
+from datetime import timedelta
 from pydantic import BaseModel
-
-app = FastAPI()
-
-# CORS 설정
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+from app import database
+from app.core.config import settings
+from app.core.deps import get_current_user
+from app.core.http import close_http_client
+from app.core.profiling import ProfilingMiddleware
+from app.core.responses import ORJSONResponse
+from app.core.security import (
+    ACCESS_TOKEN_EXPIRE_MINUTES,
+    create_access_token,
+    get_password_hash,
+    verify_password,
 )
-
-# 비밀번호 해싱 설정
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
-# JWT 설정
-SECRET_KEY = "your-secret-key-here"
-ALGORITHM = "HS256"
-ACCESS_TOKEN_EXPIRE_MINUTES = 30
-
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
-
-# 데이터베이스 초기화
-models.Base.metadata.create_all(bind=database.engine)
+from app.models.user import User, UserRole
+from app.routers import analytics, auth, content, events, profiles, social
+from app.services import archive_service, engagement_service, media_worker
 
 class UserCreate(BaseModel):
     username: str
     password: str
     is_admin: bool = False
 
-# 초기 관리자 계정 생성
-def create_initial_user():
-    db = next(database.get_db())
-    # 이미 사용자가 있는지 확인
-    user = db.query(models.User).filter(models.User.username == "admin").first()
-    if not user:
-        hashed_password = pwd_context.hash("admin123")
-        user = models.User(username="admin", hashed_password=hashed_password, is_admin=True)
-        db.add(user)
-        db.commit()
-        db.refresh(user)
-    
-    # 테스트용 일반 사용자 계정 생성
-    test_user = db.query(models.User).filter(models.User.username == "user1").first()
-    if not test_user:
-        hashed_password = pwd_context.hash("user123")
-        test_user = models.User(username="user1", hashed_password=hashed_password, is_admin=False)
-        db.add(test_user)
-        db.commit()
-        db.refresh(test_user)
-
-# 애플리케이션 시작 시 초기 사용자 생성
-create_initial_user()
-
-def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
-    to_encode = data.copy()
-    if expires_delta:
-        expire = datetime.utcnow() + expires_delta
-    else:
-        expire = datetime.utcnow() + timedelta(minutes=15)
-    to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
-    return encoded_jwt
-
-async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(database.get_db)):
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        username: str = payload.get("sub")
-        if username is None:
-            raise credentials_exception
-    except JWTError:
-        raise credentials_exception
-    user = db.query(models.User).filter(models.User.username == username).first()
-    if user is None:
-        raise credentials_exception
-    return user
+# 웹 관리자(App.js)와 iOS 앱이 사용하는 기존 엔드포인트
+router = APIRouter()
 
-@app.post("/token")
+@router.post("/token", dependencies=auth.login_limits)
 async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(database.get_db)):
-    user = db.query(models.User).filter(models.User.username == form_data.username).first()
-    if not user or not pwd_context.verify(form_data.password, user.hashed_password):
+    user = db.query(User).filter(User.username == form_data.username).first()
+    if not user or not verify_password(form_data.password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
+    is_admin = user.role == UserRole.ADMIN
     access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
-        data={"sub": user.username, "is_admin": user.is_admin}, 
+        data={"sub": user.username, "is_admin": is_admin},
         expires_delta=access_token_expires
     )
     return {"access_token": access_token, "token_type": "bearer"}
 
-@app.post("/users/", response_model=dict)
+@router.post("/users/", response_model=dict)
 async def create_user(user: UserCreate, db: Session = Depends(database.get_db)):
-    db_user = db.query(models.User).filter(models.User.username == user.username).first()
+    db_user = db.query(User).filter(User.username == user.username).first()
     if db_user:
         raise HTTPException(status_code=400, detail="Username already registered")
-    hashed_password = pwd_context.hash(user.password)
-    db_user = models.User(
+    hashed_password = get_password_hash(user.password)
+    db_user = User(
         username=user.username,
         hashed_password=hashed_password,
-        is_admin=user.is_admin
+        role=UserRole.ADMIN if user.is_admin else UserRole.USER
     )
     db.add(db_user)
     db.commit()
     db.refresh(db_user)
     return {"message": "User created successfully"}
 
-@app.get("/api/dashboard/stats")
+@router.get("/api/dashboard/stats")
 async def get_dashboard_stats(
     startDate: str,
     endDate: str,
-    current_user: models.User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user)
 ):
     # 임시 데이터 반환
     return {
@@ -146,6 +86,74 @@ async def get_dashboard_stats(
         ]
     }
 
-@app.get("/")
+@router.get("/")
 async def root():
-    return {"message": "FitMatePlatform API에 오신 것을 환영합니다!"} 
\ No newline at end of file
+    return {"message": "FitMatePlatform API에 오신 것을 환영합니다!"}
+
+def init_database(run_migrations: bool = True, seed: bool = True):
+    """마이그레이션과 초기 계정 생성 (import 시점이 아닌 명시적 단계)"""
+    if run_migrations:
+        from app.migrations import run_migrations as migrate
+        migrate(database.engine)
+    if seed:
+        from app.seed import create_initial_users
+        db = database.SessionLocal()
+        try:
+            create_initial_users(db)
+        finally:
+            db.close()
+
+def create_app(
+    run_migrations: bool = None,
+    seed: bool = None,
+) -> FastAPI:
+    """FastAPI 애플리케이션 생성
+
+    DB 초기화는 lifespan 에서 한 번만 실행된다. 테스트나 `python -m app.cli` 로
+    초기화를 따로 관리하는 워커는 두 플래그를 False 로 넘기면 된다.
+    """
+    if run_migrations is None:
+        run_migrations = settings.RUN_MIGRATIONS_ON_STARTUP
+    if seed is None:
+        seed = settings.SEED_INITIAL_USERS
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        if run_migrations or seed:
+            init_database(run_migrations=run_migrations, seed=seed)
+        archive_service.start_sweeper()
+        yield
+        archive_service.stop_sweeper()
+        await close_http_client()
+        media_worker.shutdown(wait=False)
+        engagement_service.shutdown()
+
+    app = FastAPI(
+        title=settings.PROJECT_NAME,
+        version=settings.VERSION,
+        lifespan=lifespan,
+        default_response_class=ORJSONResponse,
+    )
+
+    # CORS 설정
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["*"],
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+        expose_headers=["X-Profile-Id"],
+    )
+    if settings.PROFILING_ENABLED:
+        app.add_middleware(ProfilingMiddleware)
+
+    app.include_router(router)
+    app.include_router(auth.router, prefix="/api/auth", tags=["auth"])
+    app.include_router(content.router, prefix="/api/content", tags=["content"])
+    app.include_router(social.router, prefix="/api/social", tags=["social"])
+    app.include_router(analytics.router, prefix="/api/analytics", tags=["analytics"])
+    app.include_router(events.router, prefix="/api/events", tags=["events"])
+    app.include_router(profiles.router, prefix="/api/profiles", tags=["profiles"])
+    return app
+
+app = create_app()
@@ -0,0 +1,217 @@
+import fcntl
+import glob
+import json
+import os
+from contextlib import contextmanager
+from typing import Callable, List, Optional, Tuple
+from datetime import datetime
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection, Engine
+from app.core.config import settings
+from app.database import Base, engine as default_engine
+import app.models  # noqa: F401  모든 모델을 메타데이터에 등록
+
+def _column_names(conn: Connection, table: str) -> set:
+    return {column["name"] for column in inspect(conn).get_columns(table)}
+
+def _add_user_role_columns(conn: Connection):
+    """예전 users 테이블(is_admin)을 email/role/is_active 스키마로 변환"""
+    columns = _column_names(conn, "users")
+    if "email" not in columns:
+        conn.execute(text("ALTER TABLE users ADD COLUMN email VARCHAR"))
+        conn.execute(text("CREATE UNIQUE INDEX IF NOT EXISTS ix_users_email ON users (email)"))
+    if "role" not in columns:
+        conn.execute(text("ALTER TABLE users ADD COLUMN role VARCHAR(5) DEFAULT 'USER'"))
+        if "is_admin" in columns:
+            conn.execute(text(
+                "UPDATE users SET role = CASE WHEN is_admin THEN 'ADMIN' ELSE 'USER' END"
+            ))
+    if "is_active" not in columns:
+        conn.execute(text("ALTER TABLE users ADD COLUMN is_active BOOLEAN DEFAULT 1"))
+
+def _add_content_approval_columns(conn: Connection):
+    """contents 에 승인 상태 컬럼과 (status, created_at) 인덱스 추가"""
+    columns = _column_names(conn, "contents")
+    if "status" not in columns:
+        conn.execute(text("ALTER TABLE contents ADD COLUMN status VARCHAR(8) NOT NULL DEFAULT 'PENDING'"))
+        # 이미 소셜에 올라간 컨텐츠는 승인된 것으로 간주
+        conn.execute(text("UPDATE contents SET status = 'APPROVED' WHERE is_uploaded"))
+    if "reviewed_by" not in columns:
+        conn.execute(text("ALTER TABLE contents ADD COLUMN reviewed_by INTEGER REFERENCES users (id)"))
+    if "reviewed_at" not in columns:
+        conn.execute(text("ALTER TABLE contents ADD COLUMN reviewed_at DATETIME"))
+    conn.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_contents_status_created_at ON contents (status, created_at)"
+    ))
+
+def _add_content_hls_path(conn: Connection):
+    if "hls_path" not in _column_names(conn, "contents"):
+        conn.execute(text("ALTER TABLE contents ADD COLUMN hls_path VARCHAR"))
+
+_LEGACY_PUBLICATION_STATES = {
+    "queued": "QUEUED", "pending": "QUEUED",
+    "uploading": "UPLOADING", "in_progress": "UPLOADING",
+    "posted": "POSTED", "uploaded": "POSTED", "success": "POSTED", "done": "POSTED",
+    "failed": "FAILED", "error": "FAILED",
+}
+
+def _parse_legacy_datetime(value) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(str(value).replace("Z", "+00:00")).replace(tzinfo=None)
+    except ValueError:
+        return None
+
+def _legacy_int(value, default: int) -> int:
+    """예전 JSON 의 숫자 값 ("", "n/a", "3" 등). 숫자가 아니면 default"""
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return default
+
+def _legacy_text(value) -> Optional[str]:
+    if value is None or value == "":
+        return None
+    return value if isinstance(value, str) else json.dumps(value, ensure_ascii=False)
+
+def _legacy_publication_row(content_id: int, platform: str, value, is_uploaded: bool) -> Optional[dict]:
+    """upload_status JSON 의 플랫폼 항목 하나를 content_publications 행으로 변환"""
+    detail = value if isinstance(value, dict) else {"state": value}
+    raw_state = str(detail.get("state") or detail.get("status") or "").lower()
+    state = _LEGACY_PUBLICATION_STATES.get(raw_state, "POSTED" if is_uploaded else None)
+    if state is None:
+        return None
+    # 잘못된 값 하나 때문에 마이그레이션 전체가 실패하지 않도록 숫자/문자열은 방어적으로 변환
+    attempts = _legacy_int(detail.get("attempts"), 0)
+    return {
+        "content_id": content_id,
+        "platform": platform,
+        "state": state,
+        "attempts": attempts if attempts > 0 else (0 if state == "QUEUED" else 1),
+        "last_error": _legacy_text(detail.get("error") or detail.get("last_error")),
+        "posted_at": _parse_legacy_datetime(detail.get("posted_at")),
+        "external_id": _legacy_text(detail.get("external_id") or detail.get("post_id") or detail.get("id")),
+        "updated_at": datetime.utcnow(),
+    }
+
+def _backfill_content_publications(conn: Connection):
+    """Content.upload_status JSON 을 content_publications 로 이전 (테이블은 create_all 이 생성)"""
+    rows = []
+    result = conn.execute(text(
+        "SELECT id, upload_status, is_uploaded FROM contents WHERE upload_status IS NOT NULL"
+    ))
+    for content_id, upload_status, is_uploaded in result:
+        try:
+            status = json.loads(upload_status) if isinstance(upload_status, str) else upload_status
+        except ValueError:
+            continue
+        if not isinstance(status, dict):
+            continue
+        for platform, value in status.items():
+            row = _legacy_publication_row(content_id, platform, value, bool(is_uploaded))
+            if row is not None:
+                rows.append(row)
+    if rows:
+        # executemany 한 번으로 일괄 삽입
+        conn.execute(text(
+            "INSERT OR IGNORE INTO content_publications "
+            "(content_id, platform, state, attempts, last_error, posted_at, external_id, updated_at) "
+            "VALUES (:content_id, :platform, :state, :attempts, :last_error, :posted_at, :external_id, :updated_at)"
+        ), rows)
+
+def _add_content_preview_key(conn: Connection):
+    if "preview_key" not in _column_names(conn, "contents"):
+        conn.execute(text("ALTER TABLE contents ADD COLUMN preview_key VARCHAR"))
+
+def _add_content_archive_columns(conn: Connection):
+    """원본 경로/마지막 조회 시각 추가. 원본 경로는 업로드 폴더의 _watermarked 파일 옆에서 찾음"""
+    columns = _column_names(conn, "contents")
+    if "original_path" not in columns:
+        conn.execute(text("ALTER TABLE contents ADD COLUMN original_path VARCHAR"))
+    if "last_accessed_at" not in columns:
+        conn.execute(text("ALTER TABLE contents ADD COLUMN last_accessed_at DATETIME"))
+
+    upload_dir = os.path.realpath(settings.UPLOAD_DIR)
+    rows = []
+    result = conn.execute(text(
+        "SELECT id, file_path FROM contents WHERE original_path IS NULL AND file_path LIKE '%\\_watermarked%' ESCAPE '\\'"
+    ))
+    for content_id, file_path in result:
+        base, name = os.path.split(file_path)
+        directory = os.path.realpath(base)
+        if directory != upload_dir and not directory.startswith(upload_dir + os.sep):
+            continue
+        # 비디오는 확장자가 바뀔 수 있어 (.mov -> _watermarked.mp4) 같은 이름의 파일을 찾음
+        stem = name.split("_watermarked")[0]
+        for candidate in sorted(glob.glob(os.path.join(glob.escape(base), glob.escape(stem) + ".*"))):
+            if "_watermarked" not in os.path.basename(candidate):
+                rows.append({"id": content_id, "original_path": candidate})
+                break
+    if rows:
+        conn.execute(text("UPDATE contents SET original_path = :original_path WHERE id = :id"), rows)
+
+def _add_content_archived_at(conn: Connection):
+    if "archived_at" not in _column_names(conn, "contents"):
+        conn.execute(text("ALTER TABLE contents ADD COLUMN archived_at DATETIME"))
+
+def _clear_imported_github_paths(conn: Connection):
+    """가져온 컨텐츠에 라이브러리 상대 경로가 github_path 로 들어가 있던 것을 비움"""
+    conn.execute(text(
+        "UPDATE contents SET github_path = NULL WHERE id IN ("
+        "SELECT content_id FROM library_import_manifest "
+        "WHERE content_id IS NOT NULL AND path = contents.github_path)"
+    ))
+
+def _add_archived_file_sha256(conn: Connection):
+    if "sha256" not in _column_names(conn, "archived_files"):
+        conn.execute(text("ALTER TABLE archived_files ADD COLUMN sha256 VARCHAR"))
+
+# (이름, 함수) 순서대로 한 번씩만 적용된다. 각 함수는 새로 만든 DB에서도 안전해야 한다.
+MIGRATIONS: List[Tuple[str, Callable[[Connection], None]]] = [
+    ("0001_user_role_columns", _add_user_role_columns),
+    ("0002_content_approval_status", _add_content_approval_columns),
+    ("0003_content_hls_path", _add_content_hls_path),
+    ("0004_backfill_content_publications", _backfill_content_publications),
+    ("0005_content_preview_key", _add_content_preview_key),
+    ("0006_content_archive_columns", _add_content_archive_columns),
+    ("0007_content_archived_at", _add_content_archived_at),
+    ("0008_clear_imported_github_paths", _clear_imported_github_paths),
+    ("0009_archived_file_sha256", _add_archived_file_sha256),
+]
+
+@contextmanager
+def init_lock():
+    """여러 워커/CLI 가 동시에 초기화하지 않도록 파일 잠금 (앞 프로세스가 끝날 때까지 대기)"""
+    with open(settings.INIT_LOCK_PATH, "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+def run_migrations(engine: Engine = default_engine) -> List[str]:
+    """테이블 생성 후 아직 적용되지 않은 마이그레이션 실행"""
+    with init_lock():
+        return _run_migrations(engine)
+
+def _run_migrations(engine: Engine) -> List[str]:
+    Base.metadata.create_all(bind=engine)
+
+    applied = []
+    with engine.begin() as conn:
+        conn.execute(text(
+            "CREATE TABLE IF NOT EXISTS schema_migrations "
+            "(name VARCHAR PRIMARY KEY, applied_at DATETIME)"
+        ))
+        done = {row[0] for row in conn.execute(text("SELECT name FROM schema_migrations"))}
+        for name, migrate in MIGRATIONS:
+            if name in done:
+                continue
+            migrate(conn)
+            conn.execute(
+                text("INSERT OR IGNORE INTO schema_migrations (name, applied_at) VALUES (:name, :applied_at)"),
+                {"name": name, "applied_at": datetime.utcnow()}
+            )
+            applied.append(name)
+    return applied
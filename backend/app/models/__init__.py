@@ -0,0 +1,7 @@
+from app.database import Base
+from app.models.user import User, UserRole
+from app.models.content import Content, ContentType, MediaType, ApprovalStatus
+from app.models.publication import ContentPublication, PublicationState
+from app.models.library import LibraryImportEntry
+from app.models.engagement import ContentLike, ContentComment, ContentEngagement
+from app.models.archive import ArchiveBundle, ArchivedFile
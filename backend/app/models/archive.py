@@ -0,0 +1,31 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index
+from app.database import Base
+from datetime import datetime
+
+class ArchiveBundle(Base):
+    """오래된 미디어를 모아 둔 zip 묶음 (ARCHIVE_DIR 아래)"""
+    __tablename__ = "archive_bundles"
+
+    id = Column(Integer, primary_key=True, index=True)
+    path = Column(String, nullable=False, unique=True)
+    file_count = Column(Integer, nullable=False)
+    total_size = Column(Integer, nullable=False)  # 원본 파일 크기 합
+    stored_size = Column(Integer, nullable=False)  # 묶음 파일 크기
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+class ArchivedFile(Base):
+    """원래 경로 -> 묶음 안의 항목 (경로로 바로 찾아 하나만 꺼낼 수 있도록)"""
+    __tablename__ = "archived_files"
+
+    path = Column(String, primary_key=True)  # Content.file_path / original_path 와 같은 값
+    bundle_id = Column(Integer, ForeignKey("archive_bundles.id", ondelete="CASCADE"), nullable=False)
+    member = Column(String, nullable=False)  # zip 항목 이름
+    size = Column(Integer, nullable=False)
+    sha256 = Column(String, nullable=True)  # 꺼낸 사본이 묶음과 같은지 확인용 (없으면 다시 묶음)
+    content_id = Column(Integer, ForeignKey("contents.id", ondelete="SET NULL"), nullable=True)
+    archived_at = Column(DateTime, default=datetime.utcnow)
+    restored_at = Column(DateTime, nullable=True)  # 마지막으로 꺼낸 시각 (다시 쓸 수 있는 사본이 있을 수 있음)
+
+    __table_args__ = (
+        Index("ix_archived_files_bundle", "bundle_id"),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Enum, Boolean, JSON
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Enum, Boolean, JSON, Index
 from sqlalchemy.orm import relationship
 from app.database import Base
 import enum
@@ -18,6 +18,17 @@ class MediaType(str, enum.Enum):
     CAROUSEL = "carousel"
     STORY = "story"
 
+class ApprovalStatus(str, enum.Enum):
+    PENDING = "pending"
+    APPROVED = "approved"
+    REJECTED = "rejected"
+
+# 승인 상태 전이 규칙: 목표 상태 -> 허용되는 현재 상태
+APPROVAL_TRANSITIONS = {
+    ApprovalStatus.APPROVED: (ApprovalStatus.PENDING, ApprovalStatus.REJECTED),
+    ApprovalStatus.REJECTED: (ApprovalStatus.PENDING,),
+}
+
 class Content(Base):
     __tablename__ = "contents"
 
@@ -28,9 +39,25 @@ class Content(Base):
     title = Column(String)
     description = Column(String)
     file_path = Column(String)
+    original_path = Column(String, nullable=True)  # 워터마크 전 원본 (UPLOAD_DIR 에 있을 때만)
     github_path = Column(String)
+    hls_path = Column(String, nullable=True)  # HLS_DIR 기준 master.m3u8 경로 (패키징 완료 후)
+    preview_key = Column(String, nullable=True)  # PREVIEW_DIR 아래 포스터/스프라이트 디렉터리 (파일 해시)
     created_at = Column(DateTime, default=datetime.utcnow)
     is_uploaded = Column(Boolean, default=False)
-    upload_status = Column(JSON)  # 각 소셜 미디어별 업로드 상태
+    upload_status = Column(JSON)  # (더 이상 쓰지 않음) content_publications 로 이전됨
+    status = Column(Enum(ApprovalStatus), default=ApprovalStatus.PENDING, nullable=False)
+    reviewed_by = Column(Integer, ForeignKey("users.id"), nullable=True)
+    reviewed_at = Column(DateTime, nullable=True)
+    last_accessed_at = Column(DateTime, nullable=True)  # 파일 조회 시각 (아카이브 정책용, 대략적인 값)
+    archived_at = Column(DateTime, nullable=True)  # 아카이브 정리에서 처리한 시각 (파일을 다시 꺼내면 비움)
+    
+    # 승인 대기열 조회/상태별 집계를 인덱스만으로 처리
+    __table_args__ = (
+        Index("ix_contents_status_created_at", "status", "created_at"),
+    )
     
-    user = relationship("User", back_populates="contents") 
\ No newline at end of file
+    user = relationship("User", back_populates="contents", foreign_keys=[user_id])
+    publications = relationship(
+        "ContentPublication", back_populates="content", cascade="all, delete-orphan", passive_deletes=True
+    ) 
\ No newline at end of file
@@ -0,0 +1,14 @@
+from sqlalchemy import Column, Integer, String, DateTime, Float, ForeignKey
+from app.database import Base
+from datetime import datetime
+
+class LibraryImportEntry(Base):
+    """기존 라이브러리(카테고리 폴더, contents.json) 가져오기 매니페스트 - 파일당 1행"""
+    __tablename__ = "library_import_manifest"
+
+    path = Column(String, primary_key=True)  # 라이브러리 루트 기준 상대 경로
+    size = Column(Integer, nullable=False)
+    mtime = Column(Float, nullable=False)
+    sha256 = Column(String, nullable=False)
+    content_id = Column(Integer, ForeignKey("contents.id", ondelete="SET NULL"), nullable=True)
+    imported_at = Column(DateTime, default=datetime.utcnow)
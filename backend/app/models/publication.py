@@ -0,0 +1,35 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Enum, Index, UniqueConstraint
+from sqlalchemy.orm import relationship
+from app.database import Base
+import enum
+from datetime import datetime
+
+class PublicationState(str, enum.Enum):
+    QUEUED = "queued"
+    UPLOADING = "uploading"
+    POSTED = "posted"
+    FAILED = "failed"
+
+class ContentPublication(Base):
+    """컨텐츠의 소셜 미디어 플랫폼별 게시 상태 (예전 Content.upload_status JSON 대체)"""
+    __tablename__ = "content_publications"
+
+    id = Column(Integer, primary_key=True, index=True)
+    content_id = Column(Integer, ForeignKey("contents.id", ondelete="CASCADE"), nullable=False)
+    platform = Column(String, nullable=False)
+    state = Column(Enum(PublicationState), default=PublicationState.QUEUED, nullable=False)
+    attempts = Column(Integer, default=0, nullable=False)
+    last_error = Column(String, nullable=True)
+    posted_at = Column(DateTime, nullable=True)
+    external_id = Column(String, nullable=True)  # 플랫폼에서 발급한 게시물 id
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __table_args__ = (
+        # 컨텐츠별 상태 조회 (content_id 가 앞이라 단독 조회에도 사용)
+        UniqueConstraint("content_id", "platform", name="uq_content_publications_content_platform"),
+        # "이번 주 인스타그램에서 실패한 게시물" 같은 플랫폼/상태별 조회
+        Index("ix_content_publications_platform_state_updated", "platform", "state", "updated_at"),
+        Index("ix_content_publications_state_content", "state", "content_id"),
+    )
+
+    content = relationship("Content", back_populates="publications")
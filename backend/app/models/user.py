@@ -1,4 +1,5 @@
 from sqlalchemy import Boolean, Column, Integer, String, Enum
+from sqlalchemy.orm import relationship
 from app.database import Base
 import enum
 
@@ -14,4 +15,6 @@ class User(Base):
     username = Column(String, unique=True, index=True)
     hashed_password = Column(String)
     role = Column(Enum(UserRole), default=UserRole.USER)
-    is_active = Column(Boolean, default=True) 
\ No newline at end of file
+    is_active = Column(Boolean, default=True)
+
+    contents = relationship("Content", back_populates="user", foreign_keys="Content.user_id")
@@ -3,13 +3,35 @@ from sqlalchemy.orm import Session
 from sqlalchemy import func
 from app.database import get_db
 from app.models.content import Content, ContentType
+from app.models.publication import ContentPublication, PublicationState
 from app.models.user import User, UserRole
 from app.core.deps import get_current_user
 from datetime import datetime, timedelta
-from typing import List, Dict
+from typing import List, Dict, Optional
 
 router = APIRouter()
 
+def _publication_summary(publication: ContentPublication) -> dict:
+    return {
+        'platform': publication.platform,
+        'state': publication.state,
+        'attempts': publication.attempts,
+        'last_error': publication.last_error,
+        'posted_at': publication.posted_at,
+        'external_id': publication.external_id,
+    }
+
+def _publications_by_content(db: Session, content_ids: List[int]) -> Dict[int, List[dict]]:
+    """컨텐츠 id 목록의 플랫폼별 상태를 한 번의 인덱스 조회로 가져오기"""
+    result = {content_id: [] for content_id in content_ids}
+    for start in range(0, len(content_ids), 500):
+        chunk = content_ids[start:start + 500]
+        for publication in db.query(ContentPublication).filter(
+            ContentPublication.content_id.in_(chunk)
+        ):
+            result[publication.content_id].append(_publication_summary(publication))
+    return result
+
 @router.get("/summary")
 def get_analytics_summary(
     start_date: datetime,
@@ -34,32 +56,47 @@ def get_analytics_summary(
     ).group_by(Content.content_type).all()
     
     # 업로드 성공/실패 수
+    uploaded_counts = dict(db.query(
+        Content.is_uploaded,
+        func.count(Content.id)
+    ).filter(
+        Content.created_at.between(start_date, end_date)
+    ).group_by(Content.is_uploaded).all())
     upload_stats = {
-        'success': db.query(Content).filter(
-            Content.created_at.between(start_date, end_date),
-            Content.is_uploaded == True
-        ).count(),
-        'failed': db.query(Content).filter(
-            Content.created_at.between(start_date, end_date),
-            Content.is_uploaded == False
-        ).count()
+        'success': uploaded_counts.get(True, 0),
+        'failed': total_contents - uploaded_counts.get(True, 0)
     }
     
-    # 실패한 컨텐츠 상세 정보
-    failed_contents = db.query(Content).filter(
-        Content.created_at.between(start_date, end_date),
-        Content.is_uploaded == False
-    ).all()
+    # 플랫폼/상태별 게시 수
+    platform_stats = {}
+    for platform, state, count in db.query(
+        ContentPublication.platform,
+        ContentPublication.state,
+        func.count(ContentPublication.id)
+    ).join(Content, Content.id == ContentPublication.content_id).filter(
+        Content.created_at.between(start_date, end_date)
+    ).group_by(ContentPublication.platform, ContentPublication.state):
+        platform_stats.setdefault(platform, {})[state.value] = count
+    
+    # 게시에 실패한 컨텐츠 상세 정보
+    failed_rows = db.query(ContentPublication, Content.title, Content.content_type, Content.created_at).join(
+        Content, Content.id == ContentPublication.content_id
+    ).filter(
+        ContentPublication.state == PublicationState.FAILED,
+        Content.created_at.between(start_date, end_date)
+    ).order_by(ContentPublication.content_id).all()
     
-    failed_details = []
-    for content in failed_contents:
-        failed_details.append({
-            'id': content.id,
-            'title': content.title,
-            'content_type': content.content_type,
-            'created_at': content.created_at,
-            'upload_status': content.upload_status
+    failed_by_content = {}
+    for publication, title, content_type, created_at in failed_rows:
+        detail = failed_by_content.setdefault(publication.content_id, {
+            'id': publication.content_id,
+            'title': title,
+            'content_type': content_type,
+            'created_at': created_at,
+            'publications': []
         })
+        detail['publications'].append(_publication_summary(publication))
+    failed_details = list(failed_by_content.values())
     
     return {
         'period': {
@@ -69,6 +106,7 @@ def get_analytics_summary(
         'total_contents': total_contents,
         'content_type_counts': dict(content_type_counts),
         'upload_stats': upload_stats,
+        'platform_stats': platform_stats,
         'failed_contents': failed_details
     }
 
@@ -126,6 +164,7 @@ def get_content_type_analytics(
     ).all()
     
     success_rate = len([c for c in contents if c.is_uploaded]) / len(contents) if contents else 0
+    publications = _publications_by_content(db, [c.id for c in contents])
     
     return {
         'content_type': content_type,
@@ -140,6 +179,42 @@ def get_content_type_analytics(
             'title': c.title,
             'created_at': c.created_at,
             'is_uploaded': c.is_uploaded,
-            'upload_status': c.upload_status
+            'publications': publications[c.id]
         } for c in contents]
+    }
+
+@router.get("/publications")
+def get_publications(
+    platform: str,
+    state: PublicationState = PublicationState.FAILED,
+    days: int = 7,
+    limit: int = 100,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """플랫폼/상태별 게시 목록 (예: 이번 주 인스타그램 실패 건)"""
+    if current_user.role != UserRole.ADMIN:
+        raise HTTPException(status_code=403, detail="관리자만 접근할 수 있습니다")
+    
+    since = datetime.utcnow() - timedelta(days=days)
+    
+    # (platform, state, updated_at) 인덱스 범위 조회
+    rows = db.query(ContentPublication, Content.title).join(
+        Content, Content.id == ContentPublication.content_id
+    ).filter(
+        ContentPublication.platform == platform,
+        ContentPublication.state == state,
+        ContentPublication.updated_at >= since
+    ).order_by(ContentPublication.updated_at.desc()).limit(min(limit, 1000)).all()
+    
+    return {
+        'platform': platform,
+        'state': state,
+        'since': since,
+        'publications': [{
+            'content_id': publication.content_id,
+            'title': title,
+            'updated_at': publication.updated_at,
+            **_publication_summary(publication)
+        } for publication, title in rows]
     } 
\ No newline at end of file
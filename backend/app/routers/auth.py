@@ -6,10 +6,21 @@ from app.models.user import User, UserRole
 from app.schemas.auth import Token, UserCreate, UserResponse
 from app.core.security import create_access_token, get_password_hash, verify_password
 from app.core.deps import get_current_user
+from app.core.config import settings
+from app.core.rate_limit import ConcurrencyLimit, SlidingWindowLimit
 
 router = APIRouter()
 
-@router.post("/signup", response_model=UserResponse)
+# bcrypt 가 들어가는 엔드포인트 공통 제한 (main.py 의 /token 도 사용)
+password_hash_limit = Depends(ConcurrencyLimit(
+    "password_hash", settings.PASSWORD_HASH_MAX_CONCURRENCY, lease=30, retry_after=1
+))
+login_limits = [
+    Depends(SlidingWindowLimit("login", settings.LOGIN_RATE_LIMIT, settings.LOGIN_RATE_WINDOW)),
+    password_hash_limit,
+]
+
+@router.post("/signup", response_model=UserResponse, dependencies=[password_hash_limit])
 def create_user(user: UserCreate, db: Session = Depends(get_db)):
     db_user = db.query(User).filter(User.email == user.email).first()
     if db_user:
@@ -27,7 +38,7 @@ def create_user(user: UserCreate, db: Session = Depends(get_db)):
     db.refresh(db_user)
     return db_user
 
-@router.post("/login", response_model=Token)
+@router.post("/login", response_model=Token, dependencies=login_limits)
 def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
     user = db.query(User).filter(User.email == form_data.username).first()
     if not user or not verify_password(form_data.password, user.hashed_password):
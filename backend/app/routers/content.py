@@ -1,18 +1,76 @@
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
+from fastapi.responses import FileResponse
+from starlette.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
+from sqlalchemy import func, insert, update
 from typing import List
+from datetime import datetime
 from app.database import get_db
-from app.models.content import Content, ContentType, MediaType
+from app.models.content import Content, ContentType, MediaType, ApprovalStatus, APPROVAL_TRANSITIONS
+from app.models.publication import ContentPublication, PublicationState
+from app.models.engagement import ContentComment, ContentEngagement
 from app.models.user import User, UserRole
 from app.core.deps import get_current_user
-from app.schemas.content import ContentCreate, ContentResponse
-from app.services.github_service import GitHubService
-from app.services.media_service import MediaService
+from app.core.config import settings
+from app.core.events import publish_event, publish_events
+from app.core.responses import RawJSONResponse
+from app.core.rate_limit import ConcurrencyLimit, KeyBy, TokenBucketLimit
+from app.schemas.content import (
+    ContentResponse,
+    content_list_adapter,
+    PendingQueueResponse,
+    ApprovalBatchRequest,
+    ApprovalBatchResponse,
+    LikeResponse,
+    CommentCreate,
+    CommentResponse,
+)
+from app.services.archive_service import ArchiveService, remove_bundles
+from app.services.engagement_service import get_engagement_buffer
+from app.services.github_service import get_github_service
+from app.services.media_service import ImageTooLargeError, MediaService, is_upload_path
+from app.services.hls_service import package_content_hls, remove_hls
+from app.services.preview_service import generate_content_preview, remove_preview
+from app.services import media_worker
 import os
 
 router = APIRouter()
 
-@router.post("/upload", response_model=ContentResponse)
+# 카운터 행이 아직 없는 컨텐츠는 0
+ENGAGEMENT_COLUMNS = {
+    "likes_count": func.coalesce(ContentEngagement.likes_count, 0).label("likes_count"),
+    "comments_count": func.coalesce(ContentEngagement.comments_count, 0).label("comments_count"),
+}
+CONTENT_RESPONSE_COLUMNS = [
+    ENGAGEMENT_COLUMNS[name] if name in ENGAGEMENT_COLUMNS else getattr(Content, name)
+    for name in ContentResponse.model_fields
+]
+
+def content_response_query(db: Session):
+    """ContentResponse 필드만 조회하는 쿼리 (카운터 테이블 LEFT JOIN)"""
+    return db.query(*CONTENT_RESPONSE_COLUMNS).select_from(Content).outerjoin(
+        ContentEngagement, ContentEngagement.content_id == Content.id
+    )
+
+def _apply_pending_engagement(items: List[ContentResponse]):
+    """저장된 카운터에 이 워커의 미반영 증감을 더함"""
+    deltas = get_engagement_buffer().pending_deltas()
+    if not deltas:
+        return
+    for item in items:
+        delta = deltas.get(item.id)
+        if delta:
+            item.likes_count = max(0, item.likes_count + delta[0])
+            item.comments_count += delta[1]
+
+upload_limits = [
+    Depends(TokenBucketLimit(
+        "upload", settings.UPLOAD_RATE_PER_MINUTE / 60, settings.UPLOAD_BURST, key=KeyBy.USER
+    )),
+    Depends(ConcurrencyLimit("media", settings.MEDIA_MAX_CONCURRENCY)),
+]
+
+@router.post("/upload", response_model=ContentResponse, dependencies=upload_limits)
 async def upload_content(
     content_type: ContentType,
     title: str,
@@ -28,7 +86,12 @@ async def upload_content(
     # 워터마크 추가
     if file.content_type.startswith('image/'):
         media_type = MediaType.IMAGE
-        watermarked_path = media_service.add_watermark(file_path)
+        # 메모리 예산을 기다리는 동안 이벤트 루프를 막지 않도록 스레드에서 실행
+        try:
+            watermarked_path = await run_in_threadpool(media_service.add_watermark, file_path)
+        except ImageTooLargeError:
+            os.remove(file_path)
+            raise HTTPException(status_code=413, detail="이미지 해상도가 너무 큽니다")
     elif file.content_type.startswith('video/'):
         media_type = MediaType.VIDEO
         watermarked_path = media_service.add_video_watermark(file_path)
@@ -37,7 +100,7 @@ async def upload_content(
         watermarked_path = file_path
 
     # GitHub에 저장
-    github_service = GitHubService()
+    github_service = get_github_service()
     github_path = github_service.upload_to_github(watermarked_path, content_type)
 
     # DB에 저장
@@ -48,11 +111,23 @@ async def upload_content(
         title=title,
         description=description,
         file_path=watermarked_path,
+        original_path=file_path if file_path != watermarked_path else None,
         github_path=github_path
     )
     db.add(content)
     db.commit()
     db.refresh(content)
+
+    # 미리보기와 스트리밍용 HLS 렌디션은 응답과 별도로 미디어 워커에서 생성
+    processing = []
+    if media_type == MediaType.VIDEO:
+        media_worker.submit(generate_content_preview, content.id, watermarked_path, current_user.id)
+        media_worker.submit(package_content_hls, content.id, watermarked_path, current_user.id)
+        processing = ["preview", "hls"]
+    publish_event(
+        "content.created", current_user.id, content.id,
+        status=content.status.value, media_type=media_type.value, processing=processing
+    )
     
     return content
 
@@ -62,7 +137,8 @@ def list_contents(
     current_user: User = Depends(get_current_user),
     content_type: ContentType = None
 ):
-    query = db.query(Content)
+    # ORM 객체 대신 응답에 필요한 컬럼만 튜플로 조회해서 바로 JSON 바이트로 직렬화
+    query = content_response_query(db)
     
     if current_user.role != UserRole.ADMIN:
         query = query.filter(Content.user_id == current_user.id)
@@ -70,7 +146,139 @@ def list_contents(
     if content_type:
         query = query.filter(Content.content_type == content_type)
     
-    return query.all()
+    items = content_list_adapter.validate_python(query.all(), from_attributes=True)
+    _apply_pending_engagement(items)
+    return RawJSONResponse(content_list_adapter.dump_json(items))
+
+# SQLite 바인드 변수 제한을 넘지 않도록 IN 목록을 나눠서 실행
+APPROVAL_CHUNK_SIZE = 500
+MAX_APPROVAL_BATCH = 5000
+
+def _require_admin(current_user: User):
+    if current_user.role != UserRole.ADMIN:
+        raise HTTPException(status_code=403, detail="관리자만 접근할 수 있습니다")
+
+@router.get("/pending", response_model=PendingQueueResponse)
+def get_pending_queue(
+    limit: int = 50,
+    offset: int = 0,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    _require_admin(current_user)
+
+    # (status, created_at) 인덱스로 집계와 정렬을 처리
+    counts = {status.value: 0 for status in ApprovalStatus}
+    for status, count in db.query(Content.status, func.count()).group_by(Content.status):
+        counts[status.value] = count
+
+    items = db.query(Content).filter(
+        Content.status == ApprovalStatus.PENDING
+    ).order_by(Content.created_at).offset(offset).limit(min(limit, 200)).all()
+
+    return {"counts": counts, "items": items}
+
+@router.post("/approve/batch", response_model=ApprovalBatchResponse)
+def approve_batch(
+    request: ApprovalBatchRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    _require_admin(current_user)
+
+    ids = list(dict.fromkeys(request.ids))
+    if len(ids) > MAX_APPROVAL_BATCH:
+        raise HTTPException(status_code=400, detail=f"한 번에 최대 {MAX_APPROVAL_BATCH}개까지 처리할 수 있습니다")
+
+    target = ApprovalStatus.APPROVED if request.action == "approve" else ApprovalStatus.REJECTED
+    now = datetime.utcnow()
+    values = {
+        Content.status: target,
+        Content.reviewed_by: current_user.id,
+        Content.reviewed_at: now,
+    }
+    publish = target == ApprovalStatus.APPROVED and request.publish
+
+    # 하나의 트랜잭션 안에서 UPDATE ... WHERE id IN (...) AND status IN (...) RETURNING
+    # 실제로 바뀐 행만 updated 에 들어감 (그 사이 다른 관리자가 처리한 행은 skipped)
+    owners = {}
+    for start in range(0, len(ids), APPROVAL_CHUNK_SIZE):
+        chunk = ids[start:start + APPROVAL_CHUNK_SIZE]
+        result = db.execute(
+            update(Content)
+            .where(Content.id.in_(chunk), Content.status.in_(APPROVAL_TRANSITIONS[target]))
+            .values(values)
+            .returning(Content.id, Content.user_id)
+            .execution_options(synchronize_session=False)
+        )
+        owners.update(result.all())
+    updated = [content_id for content_id in ids if content_id in owners]
+
+    if publish and updated:
+        # 이미 대기열에 있는 (content_id, platform) 은 그대로 둠
+        queued = {
+            (row.content_id, row.platform) for start in range(0, len(updated), APPROVAL_CHUNK_SIZE)
+            for row in db.query(ContentPublication.content_id, ContentPublication.platform).filter(
+                ContentPublication.content_id.in_(updated[start:start + APPROVAL_CHUNK_SIZE])
+            )
+        }
+        publication_rows = [
+            {"content_id": content_id, "platform": platform, "state": PublicationState.QUEUED,
+             "attempts": 0, "updated_at": now}
+            for content_id in updated for platform in settings.PUBLISH_PLATFORMS
+            if (content_id, platform) not in queued
+        ]
+        if publication_rows:
+            db.execute(insert(ContentPublication), publication_rows)
+    db.commit()
+
+    events = [("content.reviewed", owners[content_id], content_id, {"status": target.value}) for content_id in updated]
+    if publish and updated:
+        events.extend(
+            ("publication.updated", owners[row["content_id"]], row["content_id"],
+             {"platform": row["platform"], "state": row["state"].value, "attempts": 0})
+            for row in publication_rows
+        )
+    publish_events(events)
+
+    return {"updated": updated, "skipped": [i for i in ids if i not in owners]}
+
+HLS_MEDIA_TYPES = {
+    ".m3u8": "application/vnd.apple.mpegurl",
+    ".ts": "video/mp2t",
+}
+
+PREVIEW_MEDIA_TYPES = {
+    ".jpg": "image/jpeg",
+    ".vtt": "text/vtt",
+}
+
+def _immutable_file_response(root_dir: str, key: str, file_path: str, media_types: dict) -> FileResponse:
+    """key 아래 파일을 오래 캐시 가능한 응답으로 제공 (디렉터리 밖 경로는 거부)"""
+    extension = os.path.splitext(file_path)[1]
+    root = os.path.realpath(root_dir)
+    path = os.path.realpath(os.path.join(root, key, file_path))
+    if extension not in media_types or not path.startswith(root + os.sep) or not os.path.isfile(path):
+        raise HTTPException(status_code=404, detail="파일을 찾을 수 없습니다")
+    return FileResponse(
+        path,
+        media_type=media_types[extension],
+        headers={"Cache-Control": "public, max-age=31536000, immutable"},
+    )
+
+@router.get("/hls/{key}/{file_path:path}")
+def get_hls_file(key: str, file_path: str):
+    """HLS 플레이리스트/세그먼트 제공
+
+    경로의 key 는 패키징마다 새로 만드는 난수라서 내용이 바뀌지 않는다. 그래서 인증 없이
+    CDN/브라우저가 오래 캐시하도록 허용한다.
+    """
+    return _immutable_file_response(settings.HLS_DIR, key, file_path, HLS_MEDIA_TYPES)
+
+@router.get("/preview/{key}/{file_name}")
+def get_preview_file(key: str, file_name: str):
+    """포스터/스프라이트/WebVTT 제공 (key 가 파일 내용 해시라서 내용이 바뀌지 않음)"""
+    return _immutable_file_response(settings.PREVIEW_DIR, key, file_name, PREVIEW_MEDIA_TYPES)
 
 @router.get("/{content_id}", response_model=ContentResponse)
 def get_content(
@@ -85,8 +293,102 @@ def get_content(
     if current_user.role != UserRole.ADMIN and content.user_id != current_user.id:
         raise HTTPException(status_code=403, detail="접근 권한이 없습니다")
     
+    response = ContentResponse.model_validate(content)
+    response.likes_count, response.comments_count = get_engagement_buffer().counts(db, [content.id])[content.id]
+    return response
+
+@router.get("/{content_id}/file")
+def get_content_file(
+    content_id: int,
+    original: bool = False,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """컨텐츠 파일 (아카이브로 옮겨졌으면 처음 요청 때 꺼내 놓음). 원본은 관리자만"""
+    content = db.query(Content).filter(Content.id == content_id).first()
+    if not content:
+        raise HTTPException(status_code=404, detail="컨텐츠를 찾을 수 없습니다")
+    
+    if current_user.role != UserRole.ADMIN and (original or content.user_id != current_user.id):
+        raise HTTPException(status_code=403, detail="접근 권한이 없습니다")
+    
+    path = content.original_path if original else content.file_path
+    if not path:
+        raise HTTPException(status_code=404, detail="파일을 찾을 수 없습니다")
+    try:
+        path = ArchiveService(db).restore(path)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="파일을 찾을 수 없습니다")
+    
+    # 아카이브 정책용 조회 시각 (매 요청마다 쓰지 않도록 간격을 둠)
+    now = datetime.utcnow()
+    if content.last_accessed_at is None or (
+        now - content.last_accessed_at
+    ).total_seconds() > settings.ARCHIVE_ACCESS_TOUCH_INTERVAL:
+        content.last_accessed_at = now
+        db.commit()
+    
+    return FileResponse(path, filename=os.path.basename(path))
+
+def _get_engageable_content(db: Session, content_id: int, current_user: User):
+    """좋아요/댓글을 달 수 있는 컨텐츠 확인 (승인된 컨텐츠 또는 본인 컨텐츠)"""
+    content = db.query(Content.id, Content.user_id, Content.status).filter(Content.id == content_id).first()
+    if not content:
+        raise HTTPException(status_code=404, detail="컨텐츠를 찾을 수 없습니다")
+    if (
+        content.status != ApprovalStatus.APPROVED
+        and current_user.role != UserRole.ADMIN
+        and content.user_id != current_user.id
+    ):
+        raise HTTPException(status_code=403, detail="접근 권한이 없습니다")
     return content
 
+def _like_response(db: Session, content_id: int, current_user: User, liked: bool) -> dict:
+    buffer = get_engagement_buffer()
+    _get_engageable_content(db, content_id, current_user)
+    # 같은 요청을 반복해도 한 번만 반영됨
+    buffer.set_like(content_id, current_user.id, liked)
+    return {"liked": liked, "likes_count": buffer.likes_count(db, content_id)}
+
+@router.post("/{content_id}/like", response_model=LikeResponse)
+def like_content(
+    content_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    return _like_response(db, content_id, current_user, True)
+
+@router.delete("/{content_id}/like", response_model=LikeResponse)
+def unlike_content(
+    content_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    return _like_response(db, content_id, current_user, False)
+
+@router.get("/{content_id}/comments", response_model=List[CommentResponse])
+def list_comments(
+    content_id: int,
+    limit: int = 50,
+    offset: int = 0,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    _get_engageable_content(db, content_id, current_user)
+    return db.query(ContentComment).filter(
+        ContentComment.content_id == content_id
+    ).order_by(ContentComment.created_at).offset(offset).limit(min(limit, 200)).all()
+
+@router.post("/{content_id}/comments", response_model=CommentResponse)
+def create_comment(
+    content_id: int,
+    comment: CommentCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    _get_engageable_content(db, content_id, current_user)
+    return get_engagement_buffer().add_comment(db, content_id, current_user.id, comment.body)
+
 @router.delete("/{content_id}")
 def delete_content(
     content_id: int,
@@ -100,15 +402,33 @@ def delete_content(
     if current_user.role != UserRole.ADMIN and content.user_id != current_user.id:
         raise HTTPException(status_code=403, detail="접근 권한이 없습니다")
     
-    # 파일 삭제
-    if os.path.exists(content.file_path):
-        os.remove(content.file_path)
+    # 파일 삭제 (아카이브로 옮겨진 파일은 색인에서 빼고, 비게 된 묶음은 커밋 후 삭제)
+    paths = [path for path in (content.file_path, content.original_path) if path]
+    for path in paths:
+        if is_upload_path(path) and os.path.exists(path):
+            os.remove(path)
+    empty_bundles = ArchiveService(db).forget(paths)
+    
+    # GitHub에서 삭제 (라이브러리에서 가져온 컨텐츠는 올린 파일이 없음)
+    if content.github_path:
+        github_service = get_github_service()
+        github_service.delete_from_github(content.github_path)
     
-    # GitHub에서 삭제
-    github_service = GitHubService()
-    github_service.delete_from_github(content.github_path)
+    # HLS 는 컨텐츠마다 따로, 미리보기는 같은 파일(해시)을 쓰는 컨텐츠끼리 공유
+    hls_path = content.hls_path
+    preview_key = content.preview_key
+    if preview_key and db.query(Content.id).filter(
+        Content.preview_key == preview_key, Content.id != content.id
+    ).first() is not None:
+        preview_key = None
     
+    get_engagement_buffer().discard_content(db, content.id)
     db.delete(content)
     db.commit()
+    remove_bundles(empty_bundles)
+    if hls_path:
+        remove_hls(hls_path)
+    if preview_key:
+        remove_preview(preview_key)
     
     return {"message": "컨텐츠가 삭제되었습니다"} 
\ No newline at end of file
@@ -0,0 +1,73 @@
+import asyncio
+from typing import Optional
+from fastapi import APIRouter, Depends, Header, Request
+from fastapi.responses import StreamingResponse
+from app.core.config import settings
+from app.core.deps import get_stream_user
+from app.core.events import Subscription, get_event_hub, get_event_store
+from app.models.user import User, UserRole
+
+router = APIRouter()
+
+REPLAY_PAGE_SIZE = 1000
+
+async def _event_stream(request: Request, subscription: Subscription, last_event_id: Optional[int]):
+    hub = get_event_hub()
+    sent_id = last_event_id or 0
+    try:
+        yield f"retry: {settings.EVENT_RETRY_MS}\n\n"
+
+        # 재연결이면 놓친 이벤트부터 다시 보냄 (구독을 먼저 등록했으므로 빈틈 없음)
+        if last_event_id is not None:
+            store = get_event_store()
+            while True:
+                events = await asyncio.to_thread(
+                    store.read_after, sent_id, subscription.user_id, REPLAY_PAGE_SIZE
+                )
+                for event in events:
+                    if subscription.accepts(event):
+                        yield event.to_sse()
+                if events:
+                    sent_id = events[-1].id
+                if len(events) < REPLAY_PAGE_SIZE:
+                    break
+
+        while True:
+            if subscription.overflowed and subscription.queue.empty():
+                # 너무 느린 클라이언트 - 끊으면 Last-Event-ID 로 재연결해서 이어 받음
+                break
+            try:
+                event = await asyncio.wait_for(
+                    subscription.queue.get(), timeout=settings.EVENT_HEARTBEAT_SECONDS
+                )
+            except asyncio.TimeoutError:
+                if await request.is_disconnected():
+                    break
+                # 프록시가 유휴 연결을 끊지 않도록 주석 줄 전송
+                yield ": ping\n\n"
+                continue
+            if event.id <= sent_id:
+                continue
+            sent_id = event.id
+            yield event.to_sse()
+    finally:
+        hub.unsubscribe(subscription)
+
+@router.get("/stream")
+async def stream_events(
+    request: Request,
+    content_id: Optional[int] = None,
+    last_event_id: Optional[int] = Header(None),
+    current_user: User = Depends(get_stream_user),
+):
+    """업로드 처리/승인/게시 상태 변경을 SSE 로 전달 (/social/status 폴링 대체)
+
+    관리자는 모든 컨텐츠, 일반 사용자는 자기 컨텐츠 이벤트만 받는다.
+    """
+    user_id = None if current_user.role == UserRole.ADMIN else current_user.id
+    subscription = await get_event_hub().subscribe(user_id, content_id)
+    return StreamingResponse(
+        _event_stream(request, subscription, last_event_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -0,0 +1,35 @@
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import FileResponse
+from app.core.deps import get_current_user
+from app.core.profiling import get_profile_store
+from app.models.user import User, UserRole
+
+router = APIRouter()
+
+def _require_admin(current_user: User):
+    if current_user.role != UserRole.ADMIN:
+        raise HTTPException(status_code=403, detail="관리자만 접근할 수 있습니다")
+
+@router.get("")
+def list_profiles(current_user: User = Depends(get_current_user)):
+    """최근 프로파일 목록 (X-Profile: 1 로 실행한 요청)"""
+    _require_admin(current_user)
+    return get_profile_store().list()
+
+@router.get("/{profile_id}")
+def get_profile(profile_id: str, current_user: User = Depends(get_current_user)):
+    """프로파일 요약과 실행된 SQL 목록"""
+    _require_admin(current_user)
+    summary = get_profile_store().get_summary(profile_id)
+    if summary is None:
+        raise HTTPException(status_code=404, detail="프로파일을 찾을 수 없습니다")
+    return summary
+
+@router.get("/{profile_id}/speedscope")
+def download_profile(profile_id: str, current_user: User = Depends(get_current_user)):
+    """speedscope 파일 다운로드 (https://www.speedscope.app 에서 열기)"""
+    _require_admin(current_user)
+    path = get_profile_store().speedscope_path(profile_id)
+    if path is None:
+        raise HTTPException(status_code=404, detail="프로파일을 찾을 수 없습니다")
+    return FileResponse(path, media_type="application/json", filename=f"{profile_id}.speedscope.json")
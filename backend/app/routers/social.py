@@ -2,6 +2,7 @@ from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
 from sqlalchemy.orm import Session
 from app.database import get_db
 from app.models.content import Content, ContentType
+from app.models.publication import ContentPublication
 from app.models.user import User, UserRole
 from app.core.deps import get_current_user
 from app.services.social_service import SocialService
@@ -76,11 +77,24 @@ def get_upload_status(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    content = db.query(Content).filter(Content.id == content_id).first()
-    if not content:
+    # 권한 확인에 필요한 user_id 만 조회
+    owner = db.query(Content.user_id).filter(Content.id == content_id).first()
+    if not owner:
         raise HTTPException(status_code=404, detail="컨텐츠를 찾을 수 없습니다")
 
-    if current_user.role != UserRole.ADMIN and content.user_id != current_user.id:
+    if current_user.role != UserRole.ADMIN and owner.user_id != current_user.id:
         raise HTTPException(status_code=403, detail="접근 권한이 없습니다")
 
-    return content.upload_status 
\ No newline at end of file
+    publications = db.query(ContentPublication).filter(
+        ContentPublication.content_id == content_id
+    ).all()
+    return {
+        publication.platform: {
+            "state": publication.state,
+            "attempts": publication.attempts,
+            "last_error": publication.last_error,
+            "posted_at": publication.posted_at,
+            "external_id": publication.external_id,
+        }
+        for publication in publications
+    } 
\ No newline at end of file
@@ -1,27 +1,86 @@
-from pydantic import BaseModel
-from typing import Optional, List
+from pydantic import BaseModel, Field, TypeAdapter, computed_field
+from typing import Optional, List, Dict, Literal
 from datetime import datetime
+from app.models.content import ContentType, MediaType, ApprovalStatus
+
+# main.py 에서 content 라우터를 /api/content 에 마운트
+PREVIEW_URL_PREFIX = "/api/content/preview"
 
 class ContentBase(BaseModel):
     title: str
     description: Optional[str] = None
-    content_type: str  # video, image, text 등
-    tags: Optional[List[str]] = []
-    is_public: bool = True
+    content_type: ContentType
 
 class ContentCreate(ContentBase):
-    file_url: Optional[str] = None
-    thumbnail_url: Optional[str] = None
+    pass
 
-class ContentResponse(ContentBase):
+class ContentResponse(BaseModel):
+    # contents 테이블 컬럼 + content_engagement 카운터 (목록 API 는 이 필드 이름으로 컬럼만 골라 조회)
     id: int
-    file_url: str
-    thumbnail_url: Optional[str] = None
-    created_at: datetime
-    updated_at: datetime
-    author_id: int
+    user_id: Optional[int] = None
+    content_type: Optional[ContentType] = None
+    media_type: Optional[MediaType] = None
+    title: Optional[str] = None
+    description: Optional[str] = None
+    file_path: Optional[str] = None
+    github_path: Optional[str] = None
+    hls_path: Optional[str] = None  # /api/content/hls/{hls_path}
+    preview_key: Optional[str] = None
+    status: ApprovalStatus = ApprovalStatus.PENDING
+    is_uploaded: Optional[bool] = None
+    created_at: Optional[datetime] = None
+    reviewed_at: Optional[datetime] = None
     likes_count: int = 0
     comments_count: int = 0
     
     class Config:
-        from_attributes = True 
\ No newline at end of file
+        from_attributes = True
+
+    def _preview_url(self, file_name: str) -> Optional[str]:
+        if not self.preview_key:
+            return None
+        return f"{PREVIEW_URL_PREFIX}/{self.preview_key}/{file_name}"
+
+    @computed_field
+    @property
+    def poster_url(self) -> Optional[str]:
+        return self._preview_url("poster.jpg")
+
+    @computed_field
+    @property
+    def sprite_vtt_url(self) -> Optional[str]:
+        # 스프라이트 이미지는 VTT 안의 상대 경로로 참조
+        return self._preview_url("sprite.vtt")
+
+# 목록 응답용으로 한 번만 만들어 두는 검증/직렬화기
+content_list_adapter = TypeAdapter(List[ContentResponse])
+
+class LikeResponse(BaseModel):
+    liked: bool
+    likes_count: int
+
+class CommentCreate(BaseModel):
+    body: str = Field(..., min_length=1, max_length=1000)
+
+class CommentResponse(BaseModel):
+    id: int
+    content_id: int
+    user_id: int
+    body: str
+    created_at: datetime
+    
+    class Config:
+        from_attributes = True
+
+class PendingQueueResponse(BaseModel):
+    counts: Dict[str, int]  # 승인 상태별 개수
+    items: List[ContentResponse]
+
+class ApprovalBatchRequest(BaseModel):
+    ids: List[int]
+    action: Literal["approve", "reject"]
+    publish: bool = False  # 승인된 컨텐츠를 content_publications 대기열에 등록
+
+class ApprovalBatchResponse(BaseModel):
+    updated: List[int]
+    skipped: List[int]  # 없거나 상태 전이가 허용되지 않는 id
@@ -0,0 +1,33 @@
+from sqlalchemy.orm import Session
+from app.core.security import get_password_hash
+from app.migrations import init_lock
+from app.models.user import User, UserRole
+
+INITIAL_USERS = [
+    # (username, email, password, role)
+    ("admin", "admin@fitmate.com", "admin123", UserRole.ADMIN),
+    ("user1", "user@fitmate.com", "user123", UserRole.USER),
+]
+
+def create_initial_users(db: Session) -> int:
+    """초기 관리자/테스트 계정 생성 (이미 있으면 건너뜀)"""
+    with init_lock():
+        return _create_initial_users(db)
+
+def _create_initial_users(db: Session) -> int:
+    created = 0
+    for username, email, password, role in INITIAL_USERS:
+        user = db.query(User).filter(User.username == username).first()
+        if user:
+            if not user.email:
+                user.email = email
+            continue
+        db.add(User(
+            username=username,
+            email=email,
+            hashed_password=get_password_hash(password),
+            role=role
+        ))
+        created += 1
+    db.commit()
+    return created
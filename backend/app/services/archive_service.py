@@ -0,0 +1,316 @@
+"""오래된 미디어 아카이브
+
+UPLOAD_DIR 에는 업로드 원본과 _watermarked 사본이 계속 쌓인다. 오래됐거나 게시가 끝났고
+한동안 조회되지 않은 컨텐츠의 파일을 ARCHIVE_DIR 의 zip 묶음으로 옮기고 원래 파일은 지운다.
+zip 은 항목마다 따로 압축되고 중앙 디렉터리가 있어서 파일 하나만 바로 꺼낼 수 있다.
+archived_files 테이블이 원래 경로 -> (묶음, 항목) 색인이다.
+
+    python -m app.cli archive [--dry-run]
+
+파일이 다시 필요해지면 restore() 가 원래 경로에 꺼내 놓는다. 꺼낸 사본은 묶음에도 그대로
+남아 있으므로 다음 정리 때 내용(sha256)이 같으면 다시 묶지 않고 지우기만 한다.
+정리한 컨텐츠는 archived_at 으로 표시해서 다음 정리가 ARCHIVE_SWEEP_BATCH 씩 앞으로 나아가게 한다.
+"""
+import fcntl
+import hashlib
+import logging
+import os
+import shutil
+import threading
+import uuid
+import zipfile
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import List, Optional
+from sqlalchemy import and_, exists, func, or_
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.database import SessionLocal
+from app.models.archive import ArchiveBundle, ArchivedFile
+from app.models.content import Content
+from app.models.publication import ContentPublication, PublicationState
+
+logger = logging.getLogger(__name__)
+
+# 이미 압축된 형식은 다시 압축해도 거의 줄지 않으므로 그대로 저장
+STORED_EXTENSIONS = {".jpg", ".jpeg", ".png", ".webp", ".heic", ".gif", ".mp4", ".mov", ".m4v"}
+
+@dataclass
+class SweepResult:
+    contents: int = 0
+    archived: int = 0  # 새로 묶은 파일 수
+    released: int = 0  # 이미 묶음에 있어 원래 파일만 지운 수
+    bundles: int = 0
+    freed_bytes: int = 0
+
+def _is_under(path: str, root: str) -> bool:
+    path = os.path.realpath(path)
+    root = os.path.realpath(root)
+    return path == root or path.startswith(root + os.sep)
+
+def _sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def _compress_type(path: str) -> int:
+    if os.path.splitext(path)[1].lower() in STORED_EXTENSIONS:
+        return zipfile.ZIP_STORED
+    return zipfile.ZIP_DEFLATED
+
+class ArchiveService:
+    def __init__(self, db: Session):
+        self.db = db
+        self.archive_dir = settings.ARCHIVE_DIR
+
+    def candidates(self, now: datetime, limit: int) -> List[Content]:
+        """정책에 맞는 컨텐츠 (오래됐거나 게시 완료 + 최근 조회 없음). 이미 처리한 컨텐츠는 제외"""
+        published = or_(
+            Content.is_uploaded.is_(True),
+            exists().where(and_(
+                ContentPublication.content_id == Content.id,
+                ContentPublication.state == PublicationState.POSTED,
+            )),
+        )
+        return self.db.query(Content).filter(
+            Content.archived_at.is_(None),
+            or_(
+                Content.created_at < now - timedelta(days=settings.ARCHIVE_MIN_AGE_DAYS),
+                and_(published, Content.created_at < now - timedelta(days=settings.ARCHIVE_PUBLISHED_MIN_AGE_DAYS)),
+            ),
+            or_(
+                Content.last_accessed_at.is_(None),
+                Content.last_accessed_at < now - timedelta(days=settings.ARCHIVE_IDLE_DAYS),
+            ),
+        ).order_by(Content.created_at).limit(limit).all()
+
+    def _loose_files(self, contents: List[Content]) -> List[tuple]:
+        """(content_id, 경로, 크기) - UPLOAD_DIR 아래에 실제로 남아 있는 파일만"""
+        files = []
+        for content in contents:
+            for path in dict.fromkeys(p for p in (content.file_path, content.original_path) if p):
+                if _is_under(path, settings.UPLOAD_DIR) and os.path.isfile(path):
+                    files.append((content.id, path, os.path.getsize(path)))
+        return files
+
+    def sweep(self, now: Optional[datetime] = None, dry_run: bool = False) -> SweepResult:
+        now = now or datetime.utcnow()
+        result = SweepResult()
+        contents = self.candidates(now, settings.ARCHIVE_SWEEP_BATCH)
+        result.contents = len(contents)
+        files = self._loose_files(contents)
+
+        archived = {
+            row.path: (row.size, row.sha256)
+            for row in self.db.query(ArchivedFile.path, ArchivedFile.size, ArchivedFile.sha256).filter(
+                ArchivedFile.path.in_([path for _, path, _ in files])
+            )
+        } if files else {}
+        # 전에 꺼냈던 사본 - 묶음의 내용과 같으면 지우기만 함. 크기가 같아도 내용이 바뀌었거나
+        # (꺼낸 뒤 다시 쓰기, 다시 가져오기 등) 해시가 없는 예전 색인이면 새로 묶고 색인을 덮어씀
+        released, pending = [], []
+        for content_id, path, size in files:
+            bundled_size, bundled_sha256 = archived.get(path, (None, None))
+            if bundled_size == size and bundled_sha256 is not None and _sha256(path) == bundled_sha256:
+                released.append((content_id, path, size))
+            else:
+                pending.append((content_id, path, size))
+        if dry_run:
+            result.released = len(released)
+            result.archived = len(pending)
+            result.freed_bytes = sum(size for _, _, size in released + pending)
+            return result
+
+        for content_id, path, size in released:
+            os.remove(path)
+            result.released += 1
+            result.freed_bytes += size
+        if released:
+            self.db.query(ArchivedFile).filter(ArchivedFile.path.in_([path for _, path, _ in released])).update(
+                {ArchivedFile.restored_at: None}, synchronize_session=False
+            )
+
+        # ARCHIVE_BUNDLE_MAX_BYTES 단위로 나눠서 묶음 생성
+        batch, batch_size = [], 0
+        for item in pending + [None]:
+            if item is not None and (not batch or batch_size + item[2] <= settings.ARCHIVE_BUNDLE_MAX_BYTES):
+                batch.append(item)
+                batch_size += item[2]
+                continue
+            if batch:
+                self._write_bundle(batch, now)
+                result.bundles += 1
+                result.archived += len(batch)
+                result.freed_bytes += batch_size
+            batch, batch_size = ([item], item[2]) if item is not None else ([], 0)
+
+        # 남은 파일이 없는 컨텐츠도 표시해야 다음 정리가 같은 컨텐츠에 머물지 않고 넘어감
+        self.db.query(Content).filter(Content.id.in_([content.id for content in contents])).update(
+            {Content.archived_at: now}, synchronize_session=False
+        )
+        self.db.commit()
+        return result
+
+    def _write_bundle(self, files: List[tuple], now: datetime):
+        """묶음을 만들고 검증한 뒤 색인을 커밋하고 나서야 원래 파일을 지움"""
+        os.makedirs(self.archive_dir, exist_ok=True)
+        name = f"{now:%Y%m%d}-{uuid.uuid4().hex[:12]}.zip"
+        path = os.path.join(self.archive_dir, name)
+        temp_path = path + ".tmp"
+        members = []
+        try:
+            with zipfile.ZipFile(temp_path, "w", allowZip64=True) as bundle:
+                for content_id, file_path, size in files:
+                    member = f"{content_id}/{os.path.basename(file_path)}"
+                    info = zipfile.ZipInfo.from_file(file_path, member)
+                    info.compress_type = _compress_type(file_path)
+                    # 묶으면서 해시도 계산 (파일을 한 번만 읽음)
+                    digest = hashlib.sha256()
+                    with open(file_path, "rb") as source, bundle.open(info, "w", force_zip64=True) as target:
+                        for chunk in iter(lambda: source.read(1024 * 1024), b""):
+                            digest.update(chunk)
+                            target.write(chunk)
+                    members.append((content_id, file_path, size, member, digest.hexdigest()))
+            with open(temp_path, "rb") as f:
+                os.fsync(f.fileno())
+            with zipfile.ZipFile(temp_path) as bundle:
+                broken = bundle.testzip()
+            if broken is not None:
+                raise RuntimeError(f"아카이브 검증 실패: {broken}")
+            os.replace(temp_path, path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+        record = ArchiveBundle(
+            path=path,
+            file_count=len(members),
+            total_size=sum(size for _, _, size, _, _ in members),
+            stored_size=os.path.getsize(path),
+            created_at=now,
+        )
+        self.db.add(record)
+        self.db.flush()
+        for content_id, file_path, size, member, sha256 in members:
+            self.db.merge(ArchivedFile(
+                path=file_path, bundle_id=record.id, member=member, size=size, sha256=sha256,
+                content_id=content_id, archived_at=now, restored_at=None,
+            ))
+        self.db.commit()
+
+        for _, file_path, _, _, _ in members:
+            try:
+                os.remove(file_path)
+            except FileNotFoundError:
+                pass
+
+    def restore(self, path: str) -> str:
+        """원래 경로에 파일이 없으면 묶음에서 꺼내 놓고 경로 반환"""
+        if os.path.exists(path):
+            return path
+        row = self.db.query(
+            ArchivedFile.member, ArchivedFile.content_id, ArchiveBundle.path.label("bundle_path")
+        ).join(
+            ArchiveBundle, ArchiveBundle.id == ArchivedFile.bundle_id
+        ).filter(ArchivedFile.path == path).first()
+        if row is None:
+            raise FileNotFoundError(path)
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # 같은 파일을 동시에 꺼내도 각자 임시 파일에 쓰고 원자적으로 교체
+        temp_path = f"{path}.{uuid.uuid4().hex[:8]}.restoring"
+        try:
+            with zipfile.ZipFile(row.bundle_path) as bundle, bundle.open(row.member) as source, \
+                    open(temp_path, "wb") as target:
+                shutil.copyfileobj(source, target, 1024 * 1024)
+            os.replace(temp_path, path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        self.db.query(ArchivedFile).filter(ArchivedFile.path == path).update(
+            {ArchivedFile.restored_at: datetime.utcnow()}, synchronize_session=False
+        )
+        # 꺼낸 사본은 다시 한동안 조회되지 않으면 정리 대상
+        if row.content_id is not None:
+            self.db.query(Content).filter(Content.id == row.content_id).update(
+                {Content.archived_at: None}, synchronize_session=False
+            )
+        self.db.commit()
+        return path
+
+    def forget(self, paths: List[str]) -> List[str]:
+        """삭제되는 컨텐츠의 색인 제거. 비게 된 묶음 경로 반환 (커밋 후 remove_bundles 로 삭제)"""
+        paths = [path for path in paths if path]
+        if not paths:
+            return []
+        bundle_ids = {
+            row.bundle_id for row in self.db.query(ArchivedFile.bundle_id).filter(ArchivedFile.path.in_(paths))
+        }
+        if not bundle_ids:
+            return []
+        self.db.query(ArchivedFile).filter(ArchivedFile.path.in_(paths)).delete(synchronize_session=False)
+        remaining = dict(self.db.query(ArchivedFile.bundle_id, func.count()).filter(
+            ArchivedFile.bundle_id.in_(bundle_ids)
+        ).group_by(ArchivedFile.bundle_id).all())
+        empty = [bundle_id for bundle_id in bundle_ids if not remaining.get(bundle_id)]
+        if not empty:
+            return []
+        bundle_paths = [row.path for row in self.db.query(ArchiveBundle.path).filter(ArchiveBundle.id.in_(empty))]
+        self.db.query(ArchiveBundle).filter(ArchiveBundle.id.in_(empty)).delete(synchronize_session=False)
+        return bundle_paths
+
+def remove_bundles(bundle_paths: List[str]):
+    for path in bundle_paths:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+def run_sweep(dry_run: bool = False) -> Optional[SweepResult]:
+    """다른 워커/CLI 가 정리 중이면 건너뜀 (None 반환)"""
+    os.makedirs(settings.ARCHIVE_DIR, exist_ok=True)
+    with open(os.path.join(settings.ARCHIVE_DIR, ".sweep.lock"), "w") as lock:
+        try:
+            fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            return None
+        db = SessionLocal()
+        try:
+            return ArchiveService(db).sweep(dry_run=dry_run)
+        finally:
+            db.close()
+
+_stop = threading.Event()
+_thread: Optional[threading.Thread] = None
+
+def _sweep_loop():
+    while not _stop.wait(settings.ARCHIVE_SWEEP_INTERVAL):
+        try:
+            result = run_sweep()
+            if result is not None and (result.archived or result.released):
+                logger.info(
+                    "아카이브 정리: 묶음 %d, 새로 묶은 파일 %d, 지운 사본 %d, %d bytes",
+                    result.bundles, result.archived, result.released, result.freed_bytes
+                )
+        except Exception:
+            logger.exception("아카이브 정리 실패")
+
+def start_sweeper():
+    """ARCHIVE_SWEEP_INTERVAL 마다 정리 (0 이면 시작하지 않음)"""
+    global _thread
+    if settings.ARCHIVE_SWEEP_INTERVAL <= 0 or (_thread is not None and _thread.is_alive()):
+        return
+    _stop.clear()
+    _thread = threading.Thread(target=_sweep_loop, name="archive-sweeper", daemon=True)
+    _thread.start()
+
+def stop_sweeper():
+    global _thread
+    _stop.set()
+    _thread = None
@@ -0,0 +1,327 @@
+"""좋아요/댓글 수 write-behind 카운터
+
+탭마다 카운터 행을 UPDATE 하면 모든 요청이 SQLite 의 단일 쓰기 잠금에서 줄을 선다.
+대신 워커별 메모리 버퍼에 모았다가 ENGAGEMENT_FLUSH_INTERVAL 마다(또는 대기 건수가
+ENGAGEMENT_MAX_PENDING 을 넘으면 바로) 한 트랜잭션으로 반영한다.
+
+- 좋아요는 (content_id, user_id) 별 최종 상태만 남기므로 연타/재시도해도 한 번만 반영된다.
+- 반영할 때 content_likes 의 INSERT/DELETE ... RETURNING 결과로 실제 증감을 계산하므로
+  여러 워커가 같은 사용자를 동시에 처리해도 카운터가 어긋나지 않는다.
+- 탭 응답은 DB 를 조회하지 않고 메모리 상태로 답한다. 저장된 상태를 모르는 (캐시에 없는)
+  조합은 탭이 상태를 바꾼다고 가정해서 수를 추정하고, 반영이 끝나면 실제 값으로 맞춰진다.
+  컨텐츠별 저장된 좋아요 수는 반영 결과로 갱신하고, 없거나 한 주기보다 오래되면 다시 읽는다.
+- 조회는 저장된 값 + 이 워커의 미반영 증감이다. 다른 워커의 증감은 최대 한 주기
+  (기본 1초) 늦게 보이고, 프로세스가 비정상 종료되면 그 주기 동안의 탭은 사라질 수 있다.
+"""
+import logging
+import threading
+import time
+from collections import Counter, OrderedDict
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import delete, select, tuple_
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.database import SessionLocal
+from app.models.content import Content
+from app.models.engagement import ContentComment, ContentEngagement, ContentLike
+
+logger = logging.getLogger(__name__)
+
+# SQLite 바인드 변수 제한(999) 안에서 한 문장으로 처리할 행 수
+WRITE_CHUNK_SIZE = 300
+
+LikeKey = Tuple[int, int]  # (content_id, user_id)
+# (기준 상태, 원하는 상태, 기준이 확인된 값인지) - 확인된 기준과 원하는 상태가 같아지면 항목을 지움
+LikeEntry = Tuple[bool, bool, bool]
+
+def _chunks(items: List, size: int) -> Iterable[List]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+def _add_delta(counter: Counter, content_id: int, delta: int):
+    counter[content_id] += delta
+    if not counter[content_id]:
+        del counter[content_id]
+
+class EngagementBuffer:
+    """워커 프로세스별 좋아요/댓글 증감 버퍼"""
+
+    def __init__(self, session_factory=SessionLocal):
+        self.session_factory = session_factory
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._likes: Dict[LikeKey, LikeEntry] = {}
+        self._like_deltas: Counter = Counter()  # content_id -> 미반영 좋아요 증감 (추정 포함)
+        self._comments: Counter = Counter()
+        # 반영 중인 묶음 (커밋 전까지 조회와 기준 상태 판단에 포함)
+        self._flushing_likes: Dict[LikeKey, LikeEntry] = {}
+        self._flushing_like_deltas: Counter = Counter()
+        self._flushing_comments: Counter = Counter()
+        # 최근에 확인한 저장 상태와 컨텐츠별 저장된 좋아요 수 (수, 확인 시각)
+        self._states: "OrderedDict[LikeKey, bool]" = OrderedDict()
+        self._like_totals: "OrderedDict[int, Tuple[int, float]]" = OrderedDict()
+        self._flushes = 0
+        self._wake = threading.Event()
+        self._stopping = False
+        self._thread: Optional[threading.Thread] = None
+
+    def _ensure_started(self):
+        if self._thread is None or not self._thread.is_alive():
+            with self._lock:
+                if self._thread is None or not self._thread.is_alive():
+                    self._stopping = False
+                    self._thread = threading.Thread(
+                        target=self._run, name="engagement-flush", daemon=True
+                    )
+                    self._thread.start()
+
+    def _run(self):
+        while not self._stopping:
+            self._wake.wait(settings.ENGAGEMENT_FLUSH_INTERVAL)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("좋아요/댓글 수 반영 실패")
+
+    def stop(self):
+        """남은 증감을 반영하고 반영 스레드 종료 (애플리케이션 종료 시)"""
+        self._stopping = True
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.flush()
+
+    @staticmethod
+    def _remember(cache: OrderedDict, key, value):
+        cache[key] = value
+        cache.move_to_end(key)
+        if len(cache) > settings.ENGAGEMENT_STATE_CACHE_SIZE:
+            cache.popitem(last=False)
+
+    def set_like(self, content_id: int, user_id: int, liked: bool) -> bool:
+        """좋아요/취소 요청 (DB 조회 없음). 상태가 바뀌면 True (같은 요청을 반복하면 False)"""
+        key = (content_id, user_id)
+        with self._lock:
+            entry = self._likes.get(key)
+            if entry is None:
+                flushing = self._flushing_likes.get(key)
+                if flushing is not None:
+                    # 반영 중인 상태가 곧 저장된 상태 (실패하면 _restore 가 합침)
+                    entry = (flushing[1], flushing[1], True)
+                elif key in self._states:
+                    entry = (self._states[key], self._states[key], True)
+                else:
+                    # 모르는 조합은 이번 탭이 상태를 바꾼다고 가정 (반영 결과가 실제 값)
+                    entry = (not liked, not liked, False)
+            baseline, current, confirmed = entry
+            if current == liked:
+                return False
+            _add_delta(self._like_deltas, content_id, 1 if liked else -1)
+            if liked == baseline and confirmed:
+                self._likes.pop(key, None)
+            else:
+                self._likes[key] = (baseline, liked, confirmed)
+            pending = len(self._likes)
+        self._ensure_started()
+        if pending >= settings.ENGAGEMENT_MAX_PENDING:
+            self._wake.set()
+        return True
+
+    def likes_count(self, db: Session, content_id: int) -> int:
+        """탭 응답용 좋아요 수 - 캐시된 저장 값 (한 주기까지) + 미반영 증감"""
+        with self._lock:
+            cached = self._like_totals.get(content_id)
+            if cached is not None and time.monotonic() - cached[1] < settings.ENGAGEMENT_FLUSH_INTERVAL:
+                return max(0, cached[0] + self._pending_likes(content_id))
+            flushes = self._flushes
+            flushing = bool(self._flushing_likes or self._flushing_comments)
+        row = db.query(ContentEngagement.likes_count).filter(ContentEngagement.content_id == content_id).first()
+        persisted = row.likes_count if row else 0
+        with self._lock:
+            # 조회하는 동안 반영이 끝났으면 그 결과가 캐시에 있음
+            if self._flushes != flushes and content_id in self._like_totals:
+                persisted = self._like_totals[content_id][0]
+            elif not flushing and self._flushes == flushes:
+                self._remember(self._like_totals, content_id, (persisted, time.monotonic()))
+            return max(0, persisted + self._pending_likes(content_id))
+
+    def _pending_likes(self, content_id: int) -> int:
+        return self._like_deltas.get(content_id, 0) + self._flushing_like_deltas.get(content_id, 0)
+
+    def add_comment(self, db: Session, content_id: int, user_id: int, body: str) -> ContentComment:
+        """댓글 저장 (댓글 자체는 바로 저장하고 댓글 수만 나중에 반영)"""
+        comment = ContentComment(content_id=content_id, user_id=user_id, body=body)
+        db.add(comment)
+        db.commit()
+        db.refresh(comment)
+        with self._lock:
+            self._comments[content_id] += 1
+        self._ensure_started()
+        return comment
+
+    def pending_deltas(self) -> Dict[int, List[int]]:
+        """content_id -> [좋아요 증감, 댓글 증감] (아직 반영되지 않은 것만)"""
+        deltas: Dict[int, List[int]] = {}
+        with self._lock:
+            for likes in (self._flushing_like_deltas, self._like_deltas):
+                for content_id, count in likes.items():
+                    deltas.setdefault(content_id, [0, 0])[0] += count
+            for comments in (self._flushing_comments, self._comments):
+                for content_id, count in comments.items():
+                    deltas.setdefault(content_id, [0, 0])[1] += count
+        return deltas
+
+    def counts(self, db: Session, content_ids: List[int]) -> Dict[int, Tuple[int, int]]:
+        """content_id -> (좋아요 수, 댓글 수) - 저장된 값 + 미반영 증감"""
+        persisted = {content_id: (0, 0) for content_id in content_ids}
+        for chunk in _chunks(content_ids, WRITE_CHUNK_SIZE):
+            for row in db.query(
+                ContentEngagement.content_id, ContentEngagement.likes_count, ContentEngagement.comments_count
+            ).filter(ContentEngagement.content_id.in_(chunk)):
+                persisted[row.content_id] = (row.likes_count, row.comments_count)
+        deltas = self.pending_deltas()
+        return {
+            content_id: (
+                max(0, likes + deltas.get(content_id, (0, 0))[0]),
+                comments + deltas.get(content_id, (0, 0))[1],
+            )
+            for content_id, (likes, comments) in persisted.items()
+        }
+
+    def flush(self) -> int:
+        """버퍼를 한 트랜잭션으로 반영. 반영한 좋아요 상태 변경 수 반환"""
+        with self._flush_lock:
+            with self._lock:
+                if not self._likes and not self._comments:
+                    return 0
+                likes, self._likes = self._likes, {}
+                comments, self._comments = self._comments, Counter()
+                # discard_content 가 반영 중인 항목을 지울 수 있도록 복사본을 둠
+                self._flushing_likes, self._flushing_comments = dict(likes), Counter(comments)
+                self._flushing_like_deltas, self._like_deltas = self._like_deltas, Counter()
+            try:
+                totals = self._write(likes, comments)
+            except Exception:
+                with self._lock:
+                    self._restore()
+                    self._clear_flushing()
+                raise
+            with self._lock:
+                now = time.monotonic()
+                for key, (_, liked, _) in self._flushing_likes.items():
+                    self._remember(self._states, key, liked)
+                flushed = {key[0] for key in self._flushing_likes} | set(self._flushing_comments)
+                for content_id, likes_count in totals.items():
+                    if content_id in flushed:
+                        self._remember(self._like_totals, content_id, (likes_count, now))
+                self._flushes += 1
+                self._clear_flushing()
+            return len(likes)
+
+    def _clear_flushing(self):
+        self._flushing_likes, self._flushing_like_deltas, self._flushing_comments = {}, Counter(), Counter()
+
+    def _restore(self):
+        """반영 실패 시 다음 주기에 다시 시도하도록 되돌림 (그 사이 새 요청이 우선)"""
+        for key, (baseline, liked, confirmed) in self._flushing_likes.items():
+            entry = self._likes.get(key)
+            if entry is not None:
+                liked = entry[1]
+            if baseline == liked and confirmed:
+                self._likes.pop(key, None)
+            else:
+                self._likes[key] = (baseline, liked, confirmed)
+        # 새 요청의 증감은 반영 중 상태를 기준으로 계산했으므로 그대로 더하면 됨
+        for content_id, count in self._flushing_like_deltas.items():
+            _add_delta(self._like_deltas, content_id, count)
+        self._comments.update(self._flushing_comments)
+
+    def _write(self, likes: Dict[LikeKey, LikeEntry], comments: Counter) -> Dict[int, int]:
+        """반영 후 content_id -> 저장된 좋아요 수 (이번에 카운터가 바뀐 컨텐츠만)"""
+        now = datetime.utcnow()
+        added = [key for key, (_, liked, _) in likes.items() if liked]
+        removed = [key for key, (_, liked, _) in likes.items() if not liked]
+        like_deltas: Counter = Counter()
+        totals: Dict[int, int] = {}
+
+        db = self.session_factory()
+        try:
+            # RETURNING 에는 실제로 추가/삭제된 행만 나오므로 이미 반영된 좋아요는 세지 않음
+            for chunk in _chunks(added, WRITE_CHUNK_SIZE):
+                statement = sqlite_insert(ContentLike).values([
+                    {"content_id": content_id, "user_id": user_id, "created_at": now}
+                    for content_id, user_id in chunk
+                ]).on_conflict_do_nothing().returning(ContentLike.content_id)
+                for (content_id,) in db.execute(statement):
+                    like_deltas[content_id] += 1
+            for chunk in _chunks(removed, WRITE_CHUNK_SIZE):
+                statement = delete(ContentLike).where(
+                    tuple_(ContentLike.content_id, ContentLike.user_id).in_(chunk)
+                ).returning(ContentLike.content_id)
+                for (content_id,) in db.execute(statement):
+                    like_deltas[content_id] -= 1
+
+            rows = [
+                {"content_id": content_id, "likes_count": like_deltas[content_id],
+                 "comments_count": comments[content_id], "updated_at": now}
+                for content_id in set(like_deltas) | set(comments)
+                if like_deltas[content_id] or comments[content_id]
+            ]
+            if rows:
+                statement = sqlite_insert(ContentEngagement)
+                statement = statement.on_conflict_do_update(
+                    index_elements=[ContentEngagement.content_id],
+                    set_={
+                        "likes_count": ContentEngagement.likes_count + statement.excluded.likes_count,
+                        "comments_count": ContentEngagement.comments_count + statement.excluded.comments_count,
+                        "updated_at": statement.excluded.updated_at,
+                    },
+                ).returning(ContentEngagement.content_id, ContentEngagement.likes_count)
+                totals = dict(db.execute(statement, rows).all())
+
+            # 이 트랜잭션이 쓰기 잠금을 잡은 뒤에 확인하므로 그 사이 삭제된 컨텐츠를 놓치지 않음.
+            # 삭제된 컨텐츠에 다시 들어간 좋아요/카운터는 지움
+            touched = sorted({content_id for content_id, _ in likes} | set(comments))
+            existing = set()
+            for chunk in _chunks(touched, WRITE_CHUNK_SIZE):
+                existing.update(db.execute(select(Content.id).where(Content.id.in_(chunk))).scalars())
+            gone = [content_id for content_id in touched if content_id not in existing]
+            for chunk in _chunks(gone, WRITE_CHUNK_SIZE):
+                for model in (ContentLike, ContentEngagement):
+                    db.execute(delete(model).where(model.content_id.in_(chunk)))
+            db.commit()
+        finally:
+            db.close()
+        return {content_id: count for content_id, count in totals.items() if content_id in existing}
+
+    def discard_content(self, db: Session, content_id: int):
+        """컨텐츠 삭제 시 좋아요/댓글/카운터와 미반영 증감 정리 (커밋은 호출한 쪽에서)"""
+        with self._lock:
+            # 반영 중인 묶음에서도 빼서 반영이 끝난 뒤 되살리거나 캐시에 남기지 않게 함
+            for likes in (self._likes, self._flushing_likes):
+                for key in [key for key in likes if key[0] == content_id]:
+                    del likes[key]
+            for counter in (self._like_deltas, self._flushing_like_deltas, self._comments, self._flushing_comments):
+                counter.pop(content_id, None)
+            for key in [key for key in self._states if key[0] == content_id]:
+                del self._states[key]
+            self._like_totals.pop(content_id, None)
+        for model in (ContentLike, ContentComment, ContentEngagement):
+            db.query(model).filter(model.content_id == content_id).delete(synchronize_session=False)
+
+_buffer: Optional[EngagementBuffer] = None
+
+def get_engagement_buffer() -> EngagementBuffer:
+    global _buffer
+    if _buffer is None:
+        _buffer = EngagementBuffer()
+    return _buffer
+
+def shutdown():
+    """애플리케이션 종료 시 남은 증감 반영"""
+    if _buffer is not None:
+        _buffer.stop()
@@ -0,0 +1,71 @@
+import re
+import subprocess
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import List, Optional
+from app.core.config import settings
+
+_STREAM_SIZE = re.compile(r"Stream #\S+.*Video: .*?, (\d{2,5})x(\d{2,5})")
+_DURATION = re.compile(r"Duration: (\d+):(\d+):(\d+(?:\.\d+)?)")
+_FPS = re.compile(r"Stream #\S+.*Video: .*?, ([\d.]+) fps")
+_AUDIO = re.compile(r"Stream #\S+.*Audio: ")
+# 휴대폰 세로 영상은 가로로 저장하고 회전 정보만 붙어 있음 (ffmpeg 는 기본으로 회전해서 디코딩)
+_ROTATION = re.compile(r"rotation of (-?[\d.]+) degrees|rotate\s*:\s*(-?\d+)")
+
+@dataclass
+class VideoInfo:
+    width: int
+    height: int
+    duration: float
+    fps: float
+    has_audio: bool
+
+@lru_cache()
+def ffmpeg_binary() -> str:
+    """설정값 -> moviepy 가 함께 설치하는 imageio-ffmpeg 바이너리 -> PATH 의 ffmpeg 순"""
+    if settings.FFMPEG_BINARY:
+        return settings.FFMPEG_BINARY
+    try:
+        import imageio_ffmpeg
+        return imageio_ffmpeg.get_ffmpeg_exe()
+    except Exception:
+        return "ffmpeg"
+
+def run_ffmpeg(args: List[str], timeout: Optional[float] = None):
+    """ffmpeg 실행. 실패하면 stderr 마지막 부분을 담아 예외 발생"""
+    result = subprocess.run(
+        [ffmpeg_binary(), "-hide_banner", "-nostdin", "-y", *args],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        timeout=timeout,
+    )
+    if result.returncode != 0:
+        raise Exception(f"ffmpeg 실패: {result.stderr.decode(errors='replace')[-2000:]}")
+
+def probe_video(path: str) -> VideoInfo:
+    """ffprobe 없이 `ffmpeg -i` 출력에서 해상도(회전 반영)/길이/프레임레이트 확인"""
+    result = subprocess.run(
+        [ffmpeg_binary(), "-hide_banner", "-nostdin", "-i", path],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+    )
+    output = result.stderr.decode(errors="replace")
+    size = _STREAM_SIZE.search(output)
+    if not size:
+        raise Exception(f"비디오 정보를 읽을 수 없습니다: {path}")
+    duration = _DURATION.search(output)
+    fps = _FPS.search(output)
+    width, height = int(size.group(1)), int(size.group(2))
+    rotation = _ROTATION.search(output)
+    if rotation and round(float(rotation.group(1) or rotation.group(2))) % 180 == 90:
+        width, height = height, width
+    return VideoInfo(
+        width=width,
+        height=height,
+        duration=(
+            int(duration.group(1)) * 3600 + int(duration.group(2)) * 60 + float(duration.group(3))
+            if duration else 0.0
+        ),
+        fps=float(fps.group(1)) if fps else 30.0,
+        has_audio=bool(_AUDIO.search(output)),
+    )
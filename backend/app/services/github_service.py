@@ -1,12 +1,179 @@
+import json
+import logging
 import os
-from github import Github
+import tempfile
+import threading
+import time
+from functools import lru_cache
+from typing import Dict, Optional
+from urllib.parse import quote
 from app.core.config import settings
 from app.models.content import ContentType
 
+logger = logging.getLogger(__name__)
+
+class GitHubTreeCache:
+    """브랜치 전체 트리(경로 -> sha) 캐시
+
+    재귀 트리 조회 한 번으로 모든 파일의 sha 와 다운로드 URL 을 알 수 있다. TTL 이 지나면
+    ETag 로 조건부 요청을 보내고 (304 응답은 rate limit 에 포함되지 않음), 스냅샷을 디스크에
+    저장해서 재시작해도 처음부터 다시 받지 않는다.
+    """
+
+    def __init__(self, repo: str, ref: str, token: str, snapshot_path: Optional[str], ttl: float):
+        self.repo = repo
+        self.ref = ref
+        self.token = token
+        self.snapshot_path = snapshot_path
+        self.ttl = ttl
+        self.files: Dict[str, str] = {}  # 파일 경로 -> blob sha
+        self.directories = set()
+        self.etag: Optional[str] = None
+        self.truncated = False
+        self._checked_at = float("-inf")
+        self._miss_checked_at = float("-inf")
+        self._lock = threading.Lock()
+        self._session = None
+        self._load_snapshot()
+
+    def _load_snapshot(self):
+        if not self.snapshot_path or not os.path.exists(self.snapshot_path):
+            return
+        try:
+            with open(self.snapshot_path, encoding="utf-8") as f:
+                snapshot = json.load(f)
+        except (OSError, ValueError):
+            return
+        if snapshot.get("repo") != self.repo or snapshot.get("ref") != self.ref:
+            return
+        self.files = snapshot["files"]
+        self.directories = set(snapshot["directories"])
+        self.etag = snapshot.get("etag")
+        self.truncated = snapshot.get("truncated", False)
+        # 스냅샷은 바로 쓰되, 첫 조회 때 ETag 로 최신인지 확인
+
+    def _save_snapshot(self):
+        """스냅샷 저장. 캐시일 뿐이므로 실패해도 로그만 남김 (GitHub 쓰기는 이미 끝난 뒤일 수 있음)"""
+        if not self.snapshot_path:
+            return
+        temp_path = None
+        try:
+            directory = os.path.dirname(self.snapshot_path) or "."
+            os.makedirs(directory, exist_ok=True)
+            # 워커들이 같은 스냅샷을 쓰므로 임시 파일 이름은 호출마다 다르게
+            fd, temp_path = tempfile.mkstemp(
+                dir=directory, prefix=os.path.basename(self.snapshot_path) + ".", suffix=".tmp"
+            )
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({
+                    "repo": self.repo,
+                    "ref": self.ref,
+                    "etag": self.etag,
+                    "truncated": self.truncated,
+                    "files": self.files,
+                    "directories": sorted(self.directories),
+                }, f, ensure_ascii=False)
+            os.replace(temp_path, self.snapshot_path)
+        except Exception as e:
+            logger.warning("GitHub 트리 스냅샷 저장 실패 (%s): %s", self.snapshot_path, e)
+            if temp_path is not None:
+                try:
+                    os.remove(temp_path)
+                except OSError:
+                    pass
+
+    def _get_session(self):
+        if self._session is None:
+            import requests
+            self._session = requests.Session()
+            self._session.headers.update({
+                "Authorization": f"Bearer {self.token}",
+                "Accept": "application/vnd.github+json",
+            })
+        return self._session
+
+    def _refresh(self):
+        headers = {"If-None-Match": self.etag} if self.etag else {}
+        response = self._get_session().get(
+            f"{settings.GITHUB_API_URL}/repos/{self.repo}/git/trees/{quote(self.ref, safe='')}",
+            params={"recursive": "1"},
+            headers=headers,
+            timeout=settings.HTTP_TIMEOUT,
+        )
+        self._checked_at = time.monotonic()
+        if response.status_code == 304:
+            return
+        response.raise_for_status()
+        tree = response.json()
+        self.files = {item["path"]: item["sha"] for item in tree["tree"] if item["type"] == "blob"}
+        self.directories = {item["path"] for item in tree["tree"] if item["type"] == "tree"}
+        self.etag = response.headers.get("ETag")
+        self.truncated = tree.get("truncated", False)
+        if self.truncated:
+            logger.warning("GitHub 트리가 잘렸습니다 (%s@%s). 없는 경로는 개별 조회합니다", self.repo, self.ref)
+        self._save_snapshot()
+
+    def ensure_fresh(self, force: bool = False) -> bool:
+        """TTL 이 지났으면 다시 확인. 실제로 요청을 보냈으면 True"""
+        with self._lock:
+            if force or time.monotonic() - self._checked_at >= self.ttl:
+                self._refresh()
+                return True
+            return False
+
+    def get_sha(self, path: str) -> Optional[str]:
+        refreshed = self.ensure_fresh()
+        if path not in self.files and not refreshed:
+            # 다른 곳에서 방금 추가된 파일일 수 있으므로 확인 (변경 없으면 304).
+            # 없는 경로 조회가 잦아도 이렇게 앞당겨 확인하는 것은 TTL 당 한 번만
+            with self._lock:
+                now = time.monotonic()
+                if now - self._miss_checked_at < self.ttl:
+                    return None
+                self._miss_checked_at = now
+            self.ensure_fresh(force=True)
+        return self.files.get(path)
+
+    def has_directory(self, path: str) -> bool:
+        self.ensure_fresh()
+        return path in self.directories
+
+    def download_url(self, path: str) -> str:
+        """공개 저장소용 raw URL (토큰이 없으므로 비공개 저장소에서는 쓸 수 없음)"""
+        return f"{settings.GITHUB_RAW_URL}/{self.repo}/{quote(self.ref)}/{quote(path)}"
+
+    def record_write(self, path: str, sha: Optional[str]):
+        """우리가 직접 만든/지운 파일을 캐시에 반영 (sha 가 None 이면 삭제)"""
+        with self._lock:
+            if sha is None:
+                self.files.pop(path, None)
+            else:
+                self.files[path] = sha
+                parent = os.path.dirname(path)
+                while parent:
+                    self.directories.add(parent)
+                    parent = os.path.dirname(parent)
+            # 캐시는 이미 최신이므로 ETag 는 그대로 둠. 다음 TTL 확인 때 달라진 트리를 한 번 받음
+            self._save_snapshot()
+
 class GitHubService:
     def __init__(self):
-        self.github = Github(settings.GITHUB_TOKEN)
-        self.repo = self.github.get_repo(settings.GITHUB_REPO)
+        self._repo = None
+        self.tree = GitHubTreeCache(
+            repo=settings.GITHUB_REPO,
+            ref=settings.GITHUB_BRANCH,
+            token=settings.GITHUB_TOKEN,
+            snapshot_path=settings.GITHUB_TREE_CACHE_PATH,
+            ttl=settings.GITHUB_TREE_TTL,
+        )
+
+    @property
+    def repo(self):
+        # PyGithub 로드와 저장소 조회(API 호출)는 첫 사용 시점에 한 번만
+        if self._repo is None:
+            from github import Github
+            self._repo = Github(settings.GITHUB_TOKEN).get_repo(settings.GITHUB_REPO)
+        return self._repo
         
     def _get_directory_path(self, content_type: ContentType) -> str:
         base_path = "contents"
@@ -27,23 +194,25 @@ class GitHubService:
             content = file.read()
         
         try:
-            # 디렉토리가 없으면 생성
-            try:
-                self.repo.get_contents(directory)
-            except:
-                self.repo.create_file(
+            # 디렉토리가 없으면 생성 (존재 여부는 트리 캐시로 확인)
+            if not self.tree.has_directory(directory):
+                created = self.repo.create_file(
                     f"{directory}/.gitkeep",
                     "Initialize directory",
-                    ""
+                    "",
+                    branch=settings.GITHUB_BRANCH
                 )
+                self.tree.record_write(f"{directory}/.gitkeep", created["content"].sha)
             
             # 파일 업로드
             github_path = f"{directory}/{file_name}"
-            self.repo.create_file(
+            created = self.repo.create_file(
                 github_path,
                 f"Upload {file_name}",
-                content
+                content,
+                branch=settings.GITHUB_BRANCH
             )
+            self.tree.record_write(github_path, created["content"].sha)
             
             return github_path
             
@@ -52,18 +221,34 @@ class GitHubService:
             
     def delete_from_github(self, github_path: str):
         try:
-            file = self.repo.get_contents(github_path)
+            sha = self.tree.get_sha(github_path)
+            if sha is None:
+                sha = self.repo.get_contents(github_path, ref=settings.GITHUB_BRANCH).sha
             self.repo.delete_file(
                 github_path,
                 f"Delete {os.path.basename(github_path)}",
-                file.sha
+                sha,
+                branch=settings.GITHUB_BRANCH
             )
+            self.tree.record_write(github_path, None)
         except Exception as e:
             raise Exception(f"GitHub 삭제 실패: {str(e)}")
             
     def get_file_url(self, github_path: str) -> str:
         try:
-            file = self.repo.get_contents(github_path)
+            # 비공개 저장소는 API 가 주는 (토큰이 붙은) download_url 을 그대로 사용
+            if not self.repo.private:
+                if self.tree.get_sha(github_path) is not None:
+                    return self.tree.download_url(github_path)
+                if not self.tree.truncated:
+                    raise Exception(f"{github_path} 파일이 없습니다")
+            # 비공개 저장소나 트리가 잘린 대형 저장소에서는 개별 조회
+            file = self.repo.get_contents(github_path, ref=settings.GITHUB_BRANCH)
             return file.download_url
         except Exception as e:
-            raise Exception(f"GitHub 파일 URL 조회 실패: {str(e)}") 
\ No newline at end of file
+            raise Exception(f"GitHub 파일 URL 조회 실패: {str(e)}")
+
+@lru_cache()
+def get_github_service() -> GitHubService:
+    """프로세스 단위로 공유하는 GitHubService"""
+    return GitHubService()
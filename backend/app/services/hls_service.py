@@ -0,0 +1,113 @@
+import os
+import shutil
+import uuid
+from typing import List, Tuple
+from app.core.config import settings
+from app.core.events import publish_event
+from app.database import SessionLocal
+from app.models.content import Content
+from app.services.ffmpeg_utils import VideoInfo, probe_video, run_ffmpeg
+
+class HLSService:
+    """워터마크된 MP4 를 여러 비트레이트의 HLS 스트림으로 패키징"""
+
+    def __init__(self):
+        self.hls_dir = settings.HLS_DIR
+        self.segment_seconds = settings.HLS_SEGMENT_SECONDS
+        self.renditions = settings.HLS_RENDITIONS
+
+    def _renditions_for(self, info: VideoInfo) -> List[dict]:
+        # 원본보다 큰 해상도로 업스케일하지 않음 (가장 낮은 화질 하나는 항상 생성)
+        # 화질 이름(720p 등)은 짧은 변 기준이므로 세로 영상도 짧은 변으로 비교
+        renditions = sorted(self.renditions, key=lambda r: r["height"])
+        usable = [r for r in renditions if r["height"] <= min(info.width, info.height)]
+        return usable or renditions[:1]
+
+    @staticmethod
+    def _output_size(rendition: dict, info: VideoInfo) -> Tuple[int, int]:
+        """짧은 변을 렌디션 높이에 맞춘 (너비, 높이). 긴 변은 비율대로 짝수로 맞춤"""
+        short_edge = min(rendition["height"], info.width, info.height)
+        long_edge = int(round(max(info.width, info.height) * short_edge / min(info.width, info.height) / 2)) * 2
+        if info.width >= info.height:
+            return long_edge, short_edge
+        return short_edge, long_edge
+
+    def _encode_rendition(self, video_path: str, output_dir: str, rendition: dict, info: VideoInfo):
+        os.makedirs(output_dir, exist_ok=True)
+        video_kbps = rendition["video_kbps"]
+        width, height = self._output_size(rendition, info)
+        args = [
+            "-i", video_path,
+            "-map", "0:v:0", "-map", "0:a:0?",
+            "-vf", f"scale={width}:{height}",
+            "-c:v", "libx264", "-preset", "veryfast", "-profile:v", "main", "-pix_fmt", "yuv420p",
+            "-b:v", f"{video_kbps}k",
+            "-maxrate", f"{int(video_kbps * 1.07)}k",
+            "-bufsize", f"{int(video_kbps * 1.5)}k",
+            # 모든 화질의 세그먼트 경계를 맞춰야 플레이어가 화질을 자연스럽게 전환
+            "-force_key_frames", f"expr:gte(t,n_forced*{self.segment_seconds})",
+            "-sc_threshold", "0",
+            "-c:a", "aac", "-b:a", f"{rendition['audio_kbps']}k", "-ac", "2",
+            "-f", "hls",
+            "-hls_time", str(self.segment_seconds),
+            "-hls_playlist_type", "vod",
+            "-hls_segment_filename", os.path.join(output_dir, "seg_%05d.ts"),
+            os.path.join(output_dir, "index.m3u8"),
+        ]
+        run_ffmpeg(args)
+
+    def package(self, video_path: str, key: str) -> str:
+        """HLS 렌디션과 master.m3u8 생성 후 HLS_DIR 기준 master 경로 반환"""
+        info = probe_video(video_path)
+        output_root = os.path.join(self.hls_dir, key)
+        # 완성된 뒤에만 보이도록 임시 디렉터리에서 만들고 교체
+        work_root = f"{output_root}.tmp"
+        shutil.rmtree(work_root, ignore_errors=True)
+
+        lines = ["#EXTM3U", "#EXT-X-VERSION:3"]
+        try:
+            for rendition in self._renditions_for(info):
+                self._encode_rendition(
+                    video_path, os.path.join(work_root, rendition["name"]), rendition, info
+                )
+                width, height = self._output_size(rendition, info)
+                audio_kbps = rendition["audio_kbps"] if info.has_audio else 0
+                bandwidth = int((rendition["video_kbps"] * 1.07 + audio_kbps) * 1000)
+                lines.append(
+                    f"#EXT-X-STREAM-INF:BANDWIDTH={bandwidth},RESOLUTION={width}x{height}"
+                )
+                lines.append(f"{rendition['name']}/index.m3u8")
+
+            with open(os.path.join(work_root, "master.m3u8"), "w") as f:
+                f.write("\n".join(lines) + "\n")
+        except Exception:
+            shutil.rmtree(work_root, ignore_errors=True)
+            raise
+
+        shutil.rmtree(output_root, ignore_errors=True)
+        os.replace(work_root, output_root)
+        return f"{key}/master.m3u8"
+
+def remove_hls(hls_path: str):
+    """컨텐츠 삭제 시 HLS 디렉터리 삭제 (hls_path 는 "<key>/master.m3u8")"""
+    key = hls_path.split("/")[0]
+    if key and key not in (".", ".."):
+        shutil.rmtree(os.path.join(settings.HLS_DIR, key), ignore_errors=True)
+
+def package_content_hls(content_id: int, video_path: str, user_id: int):
+    """미디어 워커에서 실행: HLS 패키징 후 Content.hls_path 기록"""
+    # 추측할 수 없는 경로로 만들어 세그먼트 URL 을 인증 없이 오래 캐시할 수 있게 함
+    try:
+        hls_path = HLSService().package(video_path, uuid.uuid4().hex)
+    except Exception as e:
+        publish_event("content.processing_failed", user_id, content_id, job="hls", error=str(e))
+        raise
+    db = SessionLocal()
+    try:
+        db.query(Content).filter(Content.id == content_id).update(
+            {Content.hls_path: hls_path}, synchronize_session=False
+        )
+        db.commit()
+    finally:
+        db.close()
+    publish_event("content.hls_ready", user_id, content_id, hls_path=hls_path)
@@ -0,0 +1,301 @@
+"""기존 컨텐츠 라이브러리 가져오기
+
+저장소 루트의 카테고리 폴더(감성인터뷰, 감성적일상나눔 ...)와 contents.json + contents/ 를
+DB 에 넣는다. 파일별 (경로, 크기, mtime, sha256) 매니페스트를 남겨서 다시 실행하면
+바뀐 파일만 처리한다.
+
+    python -m app.cli import-library --root .. --workers 4
+"""
+import hashlib
+import json
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import insert, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.models.content import Content, ContentType, MediaType, ApprovalStatus
+from app.models.library import LibraryImportEntry
+from app.models.user import User, UserRole
+from app.services.media_service import MediaService
+
+logger = logging.getLogger(__name__)
+
+# 폴더 이름은 ContentType 값에서 '_' 를 뺀 것 (예: 감성적_일상_나눔 -> 감성적일상나눔)
+CATEGORY_FOLDERS = {content_type.value.replace("_", ""): content_type for content_type in ContentType}
+LEGACY_DIR = "contents"
+LEGACY_INDEX = "contents.json"
+# contents.json 의 category(운동, 식단 ...)는 ContentType 과 대응되지 않아 기본값 사용
+LEGACY_DEFAULT_TYPE = ContentType.DAILY
+
+IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".heic", ".webp", ".gif"}
+VIDEO_EXTENSIONS = {".mp4", ".mov", ".m4v"}
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+@dataclass
+class LibraryFile:
+    path: str  # 라이브러리 루트 기준 상대 경로 (매니페스트 키)
+    absolute_path: str
+    size: int
+    mtime: float
+    content_type: ContentType
+    media_type: MediaType
+    created_at: datetime
+    status: ApprovalStatus = ApprovalStatus.APPROVED
+    sha256: Optional[str] = None
+    file_path: Optional[str] = None  # DB 에 저장할 경로 (워터마크 결과)
+
+@dataclass
+class ImportResult:
+    scanned: int = 0
+    unchanged: int = 0
+    created: int = 0
+    updated: int = 0
+    errors: List[Tuple[str, str]] = field(default_factory=list)
+
+def _media_type(path: str) -> Optional[MediaType]:
+    extension = os.path.splitext(path)[1].lower()
+    if extension in IMAGE_EXTENSIONS:
+        return MediaType.IMAGE
+    if extension in VIDEO_EXTENSIONS:
+        return MediaType.VIDEO
+    return None
+
+def _parse_created_at(value: Optional[str], fallback: float) -> datetime:
+    if value:
+        try:
+            return datetime.fromisoformat(value.replace("Z", "+00:00")).replace(tzinfo=None)
+        except ValueError:
+            pass
+    return datetime.utcfromtimestamp(fallback)
+
+def _sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def _watermark(path: str, media_type: MediaType, output_dir: str) -> str:
+    """워커 프로세스에서 실행되는 워터마크 작업"""
+    media_service = MediaService()
+    if media_type == MediaType.VIDEO:
+        return media_service.add_video_watermark(path, output_dir=output_dir)
+    return media_service.add_watermark(path, output_dir=output_dir)
+
+class LibraryImporter:
+    def __init__(
+        self,
+        db: Session,
+        root: str,
+        workers: int = 4,
+        batch_size: int = 500,
+        watermark: bool = True,
+    ):
+        self.db = db
+        self.root = os.path.abspath(root)
+        self.workers = workers
+        self.batch_size = batch_size
+        self.watermark = watermark
+        self.output_dir = os.path.join(settings.UPLOAD_DIR, "library")
+
+    def _legacy_index(self) -> Dict[str, dict]:
+        index_path = os.path.join(self.root, LEGACY_INDEX)
+        if not os.path.exists(index_path):
+            return {}
+        with open(index_path, encoding="utf-8") as f:
+            entries = json.load(f).get("contents", [])
+        return {os.path.normpath(entry["path"]): entry for entry in entries if entry.get("path")}
+
+    def _walk(self, directory: str, content_type: ContentType, legacy: Dict[str, dict]) -> List[LibraryFile]:
+        """폴더 하나를 재귀적으로 훑어 stat 정보 수집 (스레드에서 실행)"""
+        files = []
+        stack = [os.path.join(self.root, directory)]
+        while stack:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                        continue
+                    media_type = _media_type(entry.name)
+                    if media_type is None or "_watermarked" in entry.name:
+                        continue
+                    stat = entry.stat()
+                    path = os.path.relpath(entry.path, self.root)
+                    meta = legacy.get(os.path.normpath(path), {})
+                    files.append(LibraryFile(
+                        path=path,
+                        absolute_path=entry.path,
+                        size=stat.st_size,
+                        mtime=stat.st_mtime,
+                        content_type=content_type,
+                        media_type=media_type,
+                        created_at=_parse_created_at(meta.get("createdAt"), stat.st_mtime),
+                        status=(
+                            ApprovalStatus.PENDING if meta.get("status") == "pending"
+                            else ApprovalStatus.APPROVED
+                        ),
+                    ))
+        return files
+
+    def scan(self) -> List[LibraryFile]:
+        """카테고리 폴더들을 병렬로 훑기"""
+        legacy = self._legacy_index()
+        directories = [
+            (folder, content_type) for folder, content_type in CATEGORY_FOLDERS.items()
+            if os.path.isdir(os.path.join(self.root, folder))
+        ]
+        if os.path.isdir(os.path.join(self.root, LEGACY_DIR)):
+            directories.append((LEGACY_DIR, LEGACY_DEFAULT_TYPE))
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            results = executor.map(lambda d: self._walk(d[0], d[1], legacy), directories)
+            return [library_file for files in results for library_file in files]
+
+    def _owner_id(self) -> int:
+        owner = self.db.query(User.id).filter(User.role == UserRole.ADMIN).order_by(User.id).first()
+        if owner is None:
+            raise Exception("가져온 컨텐츠의 소유자로 쓸 관리자 계정이 없습니다 (python -m app.cli seed)")
+        return owner.id
+
+    def _apply_watermarks(
+        self, files: List[LibraryFile], result: ImportResult, executor: Optional[ProcessPoolExecutor]
+    ) -> List[LibraryFile]:
+        if executor is None:
+            for library_file in files:
+                library_file.file_path = library_file.absolute_path
+            return files
+
+        futures = [
+            (library_file, executor.submit(
+                _watermark, library_file.absolute_path, library_file.media_type,
+                os.path.join(self.output_dir, os.path.dirname(library_file.path))
+            ))
+            for library_file in files
+        ]
+        done = []
+        for library_file, future in futures:
+            try:
+                library_file.file_path = future.result()
+                done.append(library_file)
+            except Exception as e:
+                # 실패한 파일은 매니페스트에 남지 않으므로 다음 실행 때 다시 시도
+                result.errors.append((library_file.path, str(e)))
+        return done
+
+    def _save_batch(self, owner_id: int, manifest: Dict[str, tuple], batch: List[LibraryFile], result: ImportResult):
+        """한 트랜잭션에서 컨텐츠 INSERT/UPDATE 와 매니페스트 UPSERT 를 일괄 처리"""
+        new_files = [f for f in batch if manifest.get(f.path, (None,) * 4)[3] is None]
+        changed_files = [f for f in batch if manifest.get(f.path, (None,) * 4)[3] is not None]
+        content_ids = {f.path: manifest[f.path][3] for f in changed_files}
+
+        if new_files:
+            rows = self.db.execute(
+                insert(Content).returning(Content.id, sort_by_parameter_order=True),
+                [{
+                    "user_id": owner_id,
+                    "content_type": f.content_type,
+                    "media_type": f.media_type,
+                    "title": os.path.splitext(os.path.basename(f.path))[0],
+                    "description": None,
+                    "file_path": f.file_path,
+                    # 라이브러리 경로는 앱이 올린 GitHub 파일이 아니므로 비워 둠 (삭제 시 GitHub 를 건드리지 않음)
+                    "github_path": None,
+                    "created_at": f.created_at,
+                    "is_uploaded": False,
+                    "status": f.status,
+                } for f in new_files]
+            ).all()
+            for library_file, row in zip(new_files, rows):
+                content_ids[library_file.path] = row.id
+        if changed_files:
+            self.db.execute(update(Content), [
+                {"id": content_ids[f.path], "file_path": f.file_path, "hls_path": None, "archived_at": None}
+                for f in changed_files
+            ])
+
+        self._upsert_manifest([{
+            "path": f.path,
+            "size": f.size,
+            "mtime": f.mtime,
+            "sha256": f.sha256,
+            "content_id": content_ids[f.path],
+            "imported_at": datetime.utcnow(),
+        } for f in batch])
+        self.db.commit()
+        result.created += len(new_files)
+        result.updated += len(changed_files)
+
+    def _upsert_manifest(self, rows: List[dict]):
+        if not rows:
+            return
+        statement = sqlite_insert(LibraryImportEntry)
+        statement = statement.on_conflict_do_update(
+            index_elements=[LibraryImportEntry.path],
+            set_={
+                "size": statement.excluded.size,
+                "mtime": statement.excluded.mtime,
+                "sha256": statement.excluded.sha256,
+                "content_id": statement.excluded.content_id,
+                "imported_at": statement.excluded.imported_at,
+            },
+        )
+        self.db.execute(statement, rows)
+
+    def run(self) -> ImportResult:
+        result = ImportResult()
+        manifest = {
+            entry.path: (entry.size, entry.mtime, entry.sha256, entry.content_id)
+            for entry in self.db.query(
+                LibraryImportEntry.path, LibraryImportEntry.size, LibraryImportEntry.mtime,
+                LibraryImportEntry.sha256, LibraryImportEntry.content_id
+            )
+        }
+
+        files = self.scan()
+        result.scanned = len(files)
+
+        # 크기와 mtime 이 같으면 해시도 계산하지 않음
+        candidates = [
+            f for f in files
+            if f.path not in manifest or manifest[f.path][:2] != (f.size, f.mtime)
+        ]
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            for library_file, sha256 in zip(candidates, executor.map(lambda f: _sha256(f.absolute_path), candidates)):
+                library_file.sha256 = sha256
+
+        # 내용이 같은데 mtime 만 바뀐 파일은 매니페스트만 갱신
+        touched = [
+            f for f in candidates
+            if f.path in manifest and manifest[f.path][2] == f.sha256 and manifest[f.path][3] is not None
+        ]
+        touched_paths = {f.path for f in touched}
+        changed = [f for f in candidates if f.path not in touched_paths]
+        result.unchanged = len(files) - len(changed)
+        self._upsert_manifest([{
+            "path": f.path, "size": f.size, "mtime": f.mtime, "sha256": f.sha256,
+            "content_id": manifest[f.path][3], "imported_at": datetime.utcnow(),
+        } for f in touched])
+        self.db.commit()
+
+        if not changed:
+            return result
+
+        owner_id = self._owner_id()
+        # 워터마크는 CPU 작업이라 프로세스 풀에서 처리
+        executor = ProcessPoolExecutor(max_workers=self.workers) if self.watermark else None
+        try:
+            for start in range(0, len(changed), self.batch_size):
+                batch = self._apply_watermarks(changed[start:start + self.batch_size], result, executor)
+                if batch:
+                    self._save_batch(owner_id, manifest, batch, result)
+                logger.info("가져오기 진행: %d/%d", min(start + self.batch_size, len(changed)), len(changed))
+        finally:
+            if executor is not None:
+                executor.shutdown()
+        return result
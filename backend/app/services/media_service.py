@@ -1,10 +1,68 @@
+import math
 import os
-from PIL import Image, ImageDraw, ImageFont
-from moviepy.editor import VideoFileClip, TextClip, CompositeVideoClip
+import threading
+from collections import deque
+from contextlib import contextmanager
+from typing import Optional, Tuple
 from fastapi import UploadFile
 import uuid
 from app.core.config import settings
 
+# 디코딩된 픽셀 하나의 바이트 수 (Pillow 는 RGB 등 다채널 모드를 픽셀당 4바이트로 저장)
+MODE_BYTES = {"1": 1, "L": 1, "P": 1, "I;16": 2}
+
+class ImageTooLargeError(ValueError):
+    """헤더 기준 픽셀 수가 IMAGE_MAX_PIXELS 를 넘는 이미지"""
+
+class MemoryBudget:
+    """프로세스당 이미지 메모리 예산. 넘으면 실패하지 않고 앞 작업이 끝날 때까지 순서대로 대기"""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.in_use = 0
+        self._condition = threading.Condition()
+        self._waiting = deque()
+
+    @contextmanager
+    def reserve(self, size: int):
+        # 예산보다 큰 작업은 다른 작업이 모두 끝난 뒤 혼자 실행
+        size = min(size, self.limit)
+        ticket = object()
+        with self._condition:
+            self._waiting.append(ticket)
+            while self._waiting[0] is not ticket or (self.in_use and self.in_use + size > self.limit):
+                self._condition.wait()
+            self._waiting.popleft()
+            self.in_use += size
+            self._condition.notify_all()
+        try:
+            yield
+        finally:
+            with self._condition:
+                self.in_use -= size
+                self._condition.notify_all()
+
+_image_budget: Optional[MemoryBudget] = None
+
+def get_image_budget() -> MemoryBudget:
+    global _image_budget
+    if _image_budget is None:
+        _image_budget = MemoryBudget(settings.IMAGE_MEMORY_BUDGET_MB * 1024 * 1024)
+    return _image_budget
+
+def is_upload_path(path: str) -> bool:
+    """UPLOAD_DIR 아래 파일인지 (가져온 라이브러리 원본처럼 앱이 관리하지 않는 파일은 지우지 않도록)"""
+    root = os.path.realpath(settings.UPLOAD_DIR)
+    return os.path.realpath(path).startswith(root + os.sep)
+
+def _fit(size: Tuple[int, int], max_dimension: int) -> Tuple[int, int]:
+    """긴 변이 max_dimension 을 넘지 않는 크기 (0 이면 그대로)"""
+    width, height = size
+    if not max_dimension or max(width, height) <= max_dimension:
+        return size
+    scale = max_dimension / max(width, height)
+    return max(1, round(width * scale)), max(1, round(height * scale))
+
 class MediaService:
     def __init__(self):
         self.upload_dir = settings.UPLOAD_DIR
@@ -27,45 +85,98 @@ class MediaService:
             
         return file_path
         
-    def add_watermark(self, image_path: str) -> str:
-        # 이미지 열기
-        image = Image.open(image_path)
+    def _output_path(self, source_path: str, suffix: str, output_dir: Optional[str]) -> str:
+        # 기본은 원본 옆에 저장, output_dir 이 있으면 그 아래에 저장
+        base = os.path.splitext(source_path)[0]
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+            base = os.path.join(output_dir, os.path.basename(base))
+        return f"{base}_watermarked{suffix}"
+
+    def add_watermark(self, image_path: str, output_dir: Optional[str] = None) -> str:
+        # PIL은 실제 이미지 처리 시점에 로드
+        from PIL import Image
+        
+        # 이미지 열기 (아직 헤더만 읽은 상태). Image.MAX_IMAGE_PIXELS 는 프로세스 전역이라 바꾸지 않고
+        # 헤더 크기를 직접 확인함. Pillow 기본 한도의 두 배를 넘으면 여기서 이미 예외
+        try:
+            image = Image.open(image_path)
+        except Image.DecompressionBombError as e:
+            raise ImageTooLargeError(str(e)) from e
+        try:
+            if image.width * image.height > settings.IMAGE_MAX_PIXELS:
+                raise ImageTooLargeError(f"이미지가 너무 큽니다: {image.width}x{image.height}")
+            
+            # 축소를 켰고 (WATERMARK_MAX_DIMENSION) 출력이 더 작을 때만 JPEG 를 1/2~1/8 크기로 디코딩
+            target = _fit(image.size, settings.WATERMARK_MAX_DIMENSION)
+            if target != image.size:
+                image.draft(image.mode, target)
+            
+            has_alpha = image.mode in ("RGBA", "LA", "PA") or "transparency" in image.info
+            mode = "RGBA" if has_alpha else "RGB"
+            
+            # 디코딩 + 모드 변환 + 축소(가로 방향 중간 결과 포함)가 동시에 메모리에 있을 수 있음
+            pixels = image.width * image.height
+            estimate = pixels * MODE_BYTES.get(image.mode, 4)
+            if image.mode != mode:
+                estimate += pixels * 4
+            if target != image.size:
+                estimate += (target[0] * image.height + target[0] * target[1]) * 4
+            
+            with get_image_budget().reserve(estimate):
+                image.load()
+                if image.mode != mode:
+                    converted = image.convert(mode)
+                    image.close()
+                    image = converted
+                if image.size != target:
+                    resized = image.resize(target, Image.Resampling.LANCZOS, reducing_gap=3.0)
+                    image.close()
+                    image = resized
+                
+                # 워터마크는 텍스트가 그려지는 영역에만 합성
+                self._draw_watermark(image)
+                
+                # 저장
+                output_path = self._output_path(image_path, ".png", output_dir)
+                image.save(output_path)
+        finally:
+            image.close()
         
-        # 워터마크용 레이어 생성
-        watermark = Image.new('RGBA', image.size, (0,0,0,0))
-        draw = ImageDraw.Draw(watermark)
+        return output_path
+    
+    def _draw_watermark(self, image):
+        from PIL import Image, ImageDraw, ImageFont
         
         # 폰트 설정
         font_size = 12
         font = ImageFont.truetype(self.font_path, font_size)
         
-        # 텍스트 크기 계산
-        text_width = draw.textlength(self.watermark_text, font=font)
-        text_height = font_size
-        
-        # 대각선으로 텍스트 그리기
+        # 텍스트 크기만 한 레이어에 회색으로 그린 뒤 대각선으로 회전
+        left, top, right, bottom = font.getbbox(self.watermark_text)
+        layer = Image.new('RGBA', (max(1, math.ceil(right)), max(1, math.ceil(bottom))), (0,0,0,0))
+        ImageDraw.Draw(layer).text((0, 0), self.watermark_text, font=font, fill=(128,128,128,128))
         angle = -45
-        text_position = (
-            (image.width - text_width) // 2,
-            (image.height - text_height) // 2
-        )
-        
-        # 회색으로 텍스트 그리기
-        draw.text(text_position, self.watermark_text, font=font, fill=(128,128,128,128))
-        
-        # 워터마크 회전
-        rotated_watermark = watermark.rotate(angle, expand=True)
-        
-        # 워터마크 합성
-        watermarked = Image.alpha_composite(image.convert('RGBA'), rotated_watermark)
-        
-        # 저장
-        output_path = f"{os.path.splitext(image_path)[0]}_watermarked.png"
-        watermarked.save(output_path)
-        
-        return output_path
-        
-    def add_video_watermark(self, video_path: str) -> str:
+        layer = layer.rotate(angle, expand=True)
+        
+        # 이미지 가운데에 배치 (이미지보다 크면 잘라냄)
+        x = (image.width - layer.width) // 2
+        y = (image.height - layer.height) // 2
+        source = (max(0, -x), max(0, -y), min(layer.width, image.width - x), min(layer.height, image.height - y))
+        if source[0] >= source[2] or source[1] >= source[3]:
+            return
+        dest = (max(0, x), max(0, y))
+        if image.mode == 'RGBA':
+            image.alpha_composite(layer, dest=dest, source=source)
+        else:
+            # 불투명한 배경 위 알파 합성과 같음
+            region = layer.crop(source)
+            image.paste(region, dest, mask=region)
+        
+    def add_video_watermark(self, video_path: str, output_dir: Optional[str] = None) -> str:
+        # moviepy는 import 만으로 수 초가 걸리므로 실제 사용 시점에 로드
+        from moviepy.editor import VideoFileClip, TextClip, CompositeVideoClip
+
         # 비디오 로드
         video = VideoFileClip(video_path)
         
@@ -84,7 +195,7 @@ class MediaService:
         final = CompositeVideoClip([video, watermark])
         
         # 저장
-        output_path = f"{os.path.splitext(video_path)[0]}_watermarked.mp4"
+        output_path = self._output_path(video_path, ".mp4", output_dir)
         final.write_videofile(output_path)
         
         return output_path 
\ No newline at end of file
@@ -0,0 +1,52 @@
+"""요청과 분리된 미디어 후처리 작업 (HLS 패키징 등)
+
+ffmpeg 는 별도 프로세스로 돌기 때문에 스레드 풀로 충분하다. 워커 수로 프로세스당
+동시 인코딩 수를 제한하고, 작업마다 업로드 요청과 같은 "media" 슬롯을 잡아서 전체 워커
+합산 동시 작업 수(MEDIA_MAX_CONCURRENCY)도 지킨다. 슬롯이 없으면 빌 때까지 기다린다.
+"""
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Optional
+from app.core.config import settings
+from app.core.rate_limit import ConcurrencyLimit
+
+logger = logging.getLogger(__name__)
+
+_executor: Optional[ThreadPoolExecutor] = None
+_stop = threading.Event()
+_media_limit = ConcurrencyLimit("media", settings.MEDIA_MAX_CONCURRENCY, lease=settings.MEDIA_JOB_LEASE)
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        _stop.clear()
+        _executor = ThreadPoolExecutor(
+            max_workers=settings.MEDIA_WORKERS, thread_name_prefix="media-worker"
+        )
+    return _executor
+
+def _log_failure(future: Future):
+    if future.cancelled():
+        return
+    error = future.exception()
+    if error is not None:
+        logger.error("미디어 작업 실패: %s", error)
+
+def _run(fn: Callable, args, kwargs):
+    with _media_limit.hold(_stop):
+        return fn(*args, **kwargs)
+
+def submit(fn: Callable, *args, **kwargs) -> Future:
+    """미디어 작업 등록 (실행은 media 슬롯을 잡은 뒤)"""
+    future = _get_executor().submit(_run, fn, args, kwargs)
+    future.add_done_callback(_log_failure)
+    return future
+
+def shutdown(wait: bool = True):
+    """애플리케이션 종료 시 진행 중인 작업 정리"""
+    global _executor
+    _stop.set()
+    if _executor is not None:
+        _executor.shutdown(wait=wait, cancel_futures=True)
+        _executor = None
@@ -0,0 +1,130 @@
+import hashlib
+import math
+import os
+import shutil
+import uuid
+from app.core.config import settings
+from app.core.events import publish_event
+from app.database import SessionLocal
+from app.models.content import Content
+from app.services.ffmpeg_utils import probe_video, run_ffmpeg
+
+POSTER_FILE = "poster.jpg"
+SPRITE_FILE = "sprite.jpg"
+SPRITE_VTT_FILE = "sprite.vtt"
+
+def file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def _vtt_time(seconds: float) -> str:
+    hours, remainder = divmod(seconds, 3600)
+    minutes, seconds = divmod(remainder, 60)
+    return f"{int(hours):02d}:{int(minutes):02d}:{seconds:06.3f}"
+
+class PreviewService:
+    """비디오 포스터 프레임과 스크러빙용 스프라이트(+WebVTT) 생성
+
+    키프레임만 디코딩(-skip_frame nokey)하고 입력 단계에서 탐색(-ss 를 -i 앞에)하므로
+    전체 디코딩 없이 긴 영상도 빠르게 처리한다. 결과는 파일 내용 해시로 캐시한다.
+    """
+
+    def __init__(self):
+        self.preview_dir = settings.PREVIEW_DIR
+        self.thumb_width = settings.PREVIEW_THUMB_WIDTH
+        self.columns = settings.PREVIEW_SPRITE_COLUMNS
+        self.max_tiles = settings.PREVIEW_SPRITE_MAX_TILES
+        self.min_interval = settings.PREVIEW_SPRITE_MIN_INTERVAL
+
+    def _poster(self, video_path: str, duration: float, output_path: str):
+        # 너무 앞쪽(검은 화면/타이틀)을 피해서 10% 지점 근처 키프레임
+        seek = min(duration * 0.1, 30.0)
+        args = ["-ss", f"{seek:.3f}", "-i", video_path, "-frames:v", "1", "-q:v", "3", output_path]
+        run_ffmpeg(["-skip_frame", "nokey", *args])
+        if not os.path.exists(output_path):
+            # 탐색 지점 뒤에 키프레임이 없으면 ffmpeg 는 성공으로 끝나지만 아무것도 쓰지 않음.
+            # 이때는 키프레임만 고르지 않고 탐색 지점까지 디코딩 (최대 30초)
+            run_ffmpeg(args)
+        if not os.path.exists(output_path):
+            raise Exception(f"포스터 프레임을 추출하지 못했습니다: {video_path}")
+
+    def _sprite(self, video_path: str, info, output_dir: str):
+        interval = max(self.min_interval, info.duration / self.max_tiles)
+        tiles = max(1, math.ceil(info.duration / interval))
+        rows = math.ceil(tiles / self.columns)
+        thumb_height = int(round(self.thumb_width * info.height / info.width / 2)) * 2
+
+        # 키프레임만 디코딩한 뒤 fps 필터로 interval 마다 한 장씩 (키프레임 간격이 더 길면
+        # 직전 키프레임을 반복) 골라 한 장의 격자 이미지로 합침. 마지막 키프레임 뒤 구간도
+        # 채우도록 축소한 마지막 프레임을 tpad 로 늘려 줌
+        run_ffmpeg([
+            "-skip_frame", "nokey", "-i", video_path,
+            "-an",
+            "-vf", f"scale={self.thumb_width}:{thumb_height},"
+                   f"tpad=stop_mode=clone:stop_duration={interval * tiles:.3f},"
+                   f"fps=1/{interval:.3f},tile={self.columns}x{rows}",
+            "-frames:v", "1", "-q:v", "4",
+            os.path.join(output_dir, SPRITE_FILE),
+        ])
+
+        cues = ["WEBVTT", ""]
+        for index in range(tiles):
+            start = index * interval
+            end = min((index + 1) * interval, info.duration)
+            x = (index % self.columns) * self.thumb_width
+            y = (index // self.columns) * thumb_height
+            cues.append(f"{_vtt_time(start)} --> {_vtt_time(end)}")
+            cues.append(f"{SPRITE_FILE}#xywh={x},{y},{self.thumb_width},{thumb_height}")
+            cues.append("")
+        with open(os.path.join(output_dir, SPRITE_VTT_FILE), "w") as f:
+            f.write("\n".join(cues))
+
+    def generate(self, video_path: str) -> str:
+        """미리보기 생성 후 캐시 키(파일 해시) 반환. 이미 있으면 그대로 재사용"""
+        key = file_sha256(video_path)
+        output_dir = os.path.join(self.preview_dir, key)
+        if all(os.path.exists(os.path.join(output_dir, name)) for name in (POSTER_FILE, SPRITE_VTT_FILE)):
+            return key
+
+        info = probe_video(video_path)
+        work_dir = f"{output_dir}.{uuid.uuid4().hex}.tmp"
+        os.makedirs(work_dir)
+        try:
+            self._poster(video_path, info.duration, os.path.join(work_dir, POSTER_FILE))
+            self._sprite(video_path, info, work_dir)
+            if os.path.exists(os.path.join(output_dir, POSTER_FILE)):
+                # 다른 워커가 같은 파일을 먼저 처리함
+                shutil.rmtree(work_dir)
+            else:
+                # 포스터 없이 남은 이전 결과는 새로 만든 것으로 교체
+                shutil.rmtree(output_dir, ignore_errors=True)
+                os.replace(work_dir, output_dir)
+        except Exception:
+            shutil.rmtree(work_dir, ignore_errors=True)
+            raise
+        return key
+
+def remove_preview(key: str):
+    """미리보기 디렉터리 삭제 (같은 파일을 쓰는 다른 컨텐츠가 없을 때만 호출)"""
+    if key and os.path.basename(key) == key and key not in (".", ".."):
+        shutil.rmtree(os.path.join(settings.PREVIEW_DIR, key), ignore_errors=True)
+
+def generate_content_preview(content_id: int, video_path: str, user_id: int):
+    """미디어 워커에서 실행: 미리보기 생성 후 Content.preview_key 기록"""
+    try:
+        key = PreviewService().generate(video_path)
+    except Exception as e:
+        publish_event("content.processing_failed", user_id, content_id, job="preview", error=str(e))
+        raise
+    db = SessionLocal()
+    try:
+        db.query(Content).filter(Content.id == content_id).update(
+            {Content.preview_key: key}, synchronize_session=False
+        )
+        db.commit()
+    finally:
+        db.close()
+    publish_event("content.preview_ready", user_id, content_id, preview_key=key)
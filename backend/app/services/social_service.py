@@ -1,35 +1,134 @@
-from typing import Optional
+import asyncio
+import hashlib
+import re
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
 from fastapi import HTTPException
-import requests
+import httpx
+from jose import JWTError, jwt
 from app.core.config import settings
+from app.core.http import get_http_client
+
+_MAX_AGE_PATTERN = re.compile(r"max-age=(\d+)")
+# 모르는 kid 로 인한 강제 갱신의 최소 간격 (위조 토큰으로 JWKS 요청이 폭주하지 않도록)
+_FORCED_REFRESH_INTERVAL = 30.0
+
+class GoogleJWKSCache:
+    """Google 공개키(JWKS) 캐시 - Cache-Control max-age 만큼 보관"""
+
+    def __init__(self):
+        self._keys: Dict[str, dict] = {}
+        self._expires_at = 0.0
+        self._refreshed_at = float("-inf")
+        self._lock = asyncio.Lock()
+
+    def _max_age(self, response: httpx.Response) -> int:
+        match = _MAX_AGE_PATTERN.search(response.headers.get("cache-control", ""))
+        return int(match.group(1)) if match else settings.GOOGLE_JWKS_DEFAULT_MAX_AGE
+
+    async def _refresh(self):
+        response = await get_http_client().get(settings.GOOGLE_JWKS_URL)
+        response.raise_for_status()
+        try:
+            keys = {key["kid"]: key for key in response.json().get("keys", [])}
+        except (ValueError, AttributeError, KeyError, TypeError) as e:
+            # HTML 오류 페이지 등 JSON 이 아니거나 형식이 다른 응답
+            raise ValueError(f"Invalid Google JWKS response: {e}") from e
+        self._keys = keys
+        self._refreshed_at = time.monotonic()
+        self._expires_at = self._refreshed_at + self._max_age(response)
+
+    def _needs_refresh(self, kid: str) -> bool:
+        now = time.monotonic()
+        if now >= self._expires_at:
+            return True
+        return kid not in self._keys and now - self._refreshed_at >= _FORCED_REFRESH_INTERVAL
+
+    async def get_key(self, kid: str) -> Optional[dict]:
+        """kid 에 해당하는 키 반환. 만료됐거나 모르는 kid 면 한 번 갱신 (키 교체 대응)"""
+        if not self._needs_refresh(kid):
+            return self._keys.get(kid)
+        async with self._lock:
+            # 대기하는 동안 다른 요청이 이미 갱신했을 수 있음
+            if self._needs_refresh(kid):
+                await self._refresh()
+        return self._keys.get(kid)
+
+class TTLCache:
+    """크기 제한이 있는 단순 TTL 캐시"""
+
+    def __init__(self, ttl: float, max_size: int):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._items: "OrderedDict[str, Tuple[float, dict]]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[dict]:
+        item = self._items.get(key)
+        if item is None:
+            return None
+        expires_at, value = item
+        if time.monotonic() >= expires_at:
+            del self._items[key]
+            return None
+        return value
+
+    def set(self, key: str, value: dict):
+        self._items[key] = (time.monotonic() + self.ttl, value)
+        self._items.move_to_end(key)
+        while len(self._items) > self.max_size:
+            self._items.popitem(last=False)
+
+google_jwks_cache = GoogleJWKSCache()
+kakao_token_cache = TTLCache(settings.KAKAO_TOKEN_CACHE_TTL, settings.KAKAO_TOKEN_CACHE_SIZE)
 
 class SocialService:
     """소셜 로그인 서비스"""
-    
+
     @staticmethod
     async def verify_google_token(token: str) -> dict:
-        """Google OAuth 토큰 검증"""
+        """Google id_token 검증 (캐시된 JWKS로 로컬 RS256 검증)"""
         try:
-            google_response = requests.get(
-                f"https://www.googleapis.com/oauth2/v3/tokeninfo?id_token={token}"
+            header = jwt.get_unverified_header(token)
+            key = await google_jwks_cache.get_key(header.get("kid"))
+            if key is None:
+                raise HTTPException(status_code=400, detail="Invalid Google token")
+            claims = jwt.decode(
+                token,
+                key,
+                algorithms=["RS256"],
+                audience=settings.GOOGLE_CLIENT_ID,
+                options={"verify_aud": settings.GOOGLE_CLIENT_ID is not None},
             )
-            if google_response.status_code != 200:
+            if claims.get("iss") not in settings.GOOGLE_ISSUERS:
                 raise HTTPException(status_code=400, detail="Invalid Google token")
-            return google_response.json()
-        except Exception as e:
+            return claims
+        except HTTPException:
+            raise
+        except (JWTError, httpx.HTTPError, ValueError) as e:
             raise HTTPException(status_code=400, detail=str(e))
-    
+
     @staticmethod
     async def verify_kakao_token(token: str) -> dict:
-        """Kakao OAuth 토큰 검증"""
+        """Kakao OAuth 토큰 검증 (검증 결과를 짧게 캐시)"""
+        cache_key = hashlib.sha256(token.encode()).hexdigest()
+        cached = kakao_token_cache.get(cache_key)
+        if cached is not None:
+            return cached
         try:
             headers = {"Authorization": f"Bearer {token}"}
-            kakao_response = requests.get(
-                "https://kapi.kakao.com/v2/user/me",
+            kakao_response = await get_http_client().get(
+                settings.KAKAO_USER_INFO_URL,
                 headers=headers
             )
             if kakao_response.status_code != 200:
                 raise HTTPException(status_code=400, detail="Invalid Kakao token")
-            return kakao_response.json()
-        except Exception as e:
+            user_info = kakao_response.json()
+            if not isinstance(user_info, dict):
+                raise ValueError("Invalid Kakao user info response")
+        except HTTPException:
+            raise
+        except (httpx.HTTPError, ValueError) as e:
             raise HTTPException(status_code=400, detail=str(e))
+        kakao_token_cache.set(cache_key, user_info)
+        return user_info
@@ -0,0 +1,188 @@
+"""좋아요 처리량 벤치마크 (탭마다 바로 쓰기 vs write-behind 버퍼)
+
+    cd backend
+    python benchmarks/engagement_benchmark.py --processes 4 --likes 20000
+
+여러 워커 프로세스가 같은 SQLite 파일에 좋아요를 보내는 상황을 흉내낸다 (기본은 앱과 같은 rollback journal).
+같은 (컨텐츠, 사용자) 조합이 반복되고 일부는 취소되므로 중복 제거도 함께 확인한다.
+
+1) direct: 탭마다 INSERT OR IGNORE + 카운터 UPDATE 를 한 트랜잭션으로 커밋
+2) buffered: EngagementBuffer.set_like + likes_count (현재 /api/content/{id}/like)
+
+마지막에 content_engagement.likes_count 가 content_likes 행 수와 같은지 검사한다.
+"""
+import argparse
+import multiprocessing
+import os
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, event, insert, text
+from sqlalchemy.orm import sessionmaker
+from app.core.config import settings
+from app.models import Base, Content, ContentType, MediaType, ApprovalStatus
+from app.services.engagement_service import EngagementBuffer
+
+WAL = "--wal" in sys.argv
+
+def build_engine(path: str):
+    # app.database 와 같은 기본 설정 (rollback journal), --wal 이면 WAL
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False, "timeout": 30})
+    if WAL:
+        @event.listens_for(engine, "connect")
+        def _wal(dbapi_connection, _):
+            dbapi_connection.execute("PRAGMA journal_mode=WAL")
+
+    return engine
+
+def prepare(path: str, contents: int):
+    engine = build_engine(path)
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(insert(Content), [{
+            "user_id": 1,
+            "content_type": ContentType.DAILY,
+            "media_type": MediaType.IMAGE,
+            "title": f"운동 루틴 {i}",
+            "created_at": datetime(2024, 3, 19),
+            "status": ApprovalStatus.APPROVED,
+        } for i in range(contents)])
+    engine.dispose()
+
+def workload(seed: int, likes: int, contents: int, users: int):
+    # 인기 컨텐츠에 몰리도록 앞쪽 컨텐츠를 더 자주 선택
+    rng = random.Random(seed)
+    return [
+        (min(int(rng.expovariate(5 / contents)), contents - 1) + 1, rng.randrange(1, users + 1), rng.random() > 0.1)
+        for _ in range(likes)
+    ]
+
+def direct_worker(path: str, ops, barrier, results):
+    engine = build_engine(path)
+    latencies = []
+    with engine.connect() as conn:
+        barrier.wait()
+        started_at = time.time()
+        for content_id, user_id, liked in ops:
+            started = time.perf_counter()
+            with conn.begin():
+                if liked:
+                    changed = conn.execute(text(
+                        "INSERT OR IGNORE INTO content_likes (content_id, user_id, created_at) VALUES (:c, :u, :t)"
+                    ), {"c": content_id, "u": user_id, "t": datetime.utcnow()}).rowcount
+                else:
+                    changed = -conn.execute(text(
+                        "DELETE FROM content_likes WHERE content_id = :c AND user_id = :u"
+                    ), {"c": content_id, "u": user_id}).rowcount
+                if changed:
+                    conn.execute(text(
+                        "INSERT INTO content_engagement (content_id, likes_count, comments_count, updated_at) "
+                        "VALUES (:c, :d, 0, :t) ON CONFLICT (content_id) "
+                        "DO UPDATE SET likes_count = likes_count + :d, updated_at = :t"
+                    ), {"c": content_id, "d": changed, "t": datetime.utcnow()})
+            latencies.append(time.perf_counter() - started)
+    results.put((started_at, time.time(), latencies))
+    engine.dispose()
+
+def buffered_worker(path: str, ops, barrier, results):
+    engine = build_engine(path)
+    session_factory = sessionmaker(bind=engine)
+    buffer = EngagementBuffer(session_factory=session_factory)
+    latencies = []
+    db = session_factory()
+    barrier.wait()
+    started_at = time.time()
+    for content_id, user_id, liked in ops:
+        started = time.perf_counter()
+        # /api/content/{id}/like 와 같이 상태 변경 + 응답용 좋아요 수
+        buffer.set_like(content_id, user_id, liked)
+        buffer.likes_count(db, content_id)
+        # 요청마다 세션을 닫는 것처럼 읽기 트랜잭션을 끝냄
+        db.rollback()
+        latencies.append(time.perf_counter() - started)
+    db.close()
+    # 마지막 반영까지 포함해서 측정
+    buffer.stop()
+    results.put((started_at, time.time(), latencies))
+    engine.dispose()
+
+def run(mode: str, args) -> dict:
+    directory = tempfile.mkdtemp(prefix="engagement-bench-", dir=args.dir)
+    path = os.path.join(directory, "bench.db")
+    try:
+        prepare(path, args.contents)
+        per_process = args.likes // args.processes
+        target = direct_worker if mode == "direct" else buffered_worker
+        results = multiprocessing.Queue()
+        barrier = multiprocessing.Barrier(args.processes)
+        processes = [
+            multiprocessing.Process(
+                target=target,
+                args=(path, workload(seed, per_process, args.contents, args.users), barrier, results),
+            )
+            for seed in range(args.processes)
+        ]
+        for process in processes:
+            process.start()
+        reports = [results.get() for _ in processes]
+        for process in processes:
+            process.join()
+        elapsed = max(report[1] for report in reports) - min(report[0] for report in reports)
+        latencies = [latency for report in reports for latency in report[2]]
+
+        engine = build_engine(path)
+        with engine.connect() as conn:
+            actual = dict(conn.execute(
+                text("SELECT content_id, COUNT(*) FROM content_likes GROUP BY content_id")
+            ).all())
+            counters = {
+                row.content_id: row.likes_count
+                for row in conn.execute(text("SELECT content_id, likes_count FROM content_engagement"))
+            }
+        engine.dispose()
+        mismatched = sum(
+            1 for content_id in set(actual) | set(counters)
+            if actual.get(content_id, 0) != counters.get(content_id, 0)
+        )
+        latencies.sort()
+        return {
+            "rate": len(latencies) / elapsed,
+            "p50": statistics.median(latencies) * 1000,
+            "p99": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+            "likes": sum(actual.values()),
+            "mismatched": mismatched,
+        }
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--processes", type=int, default=4)
+    parser.add_argument("--likes", type=int, default=20000, help="전체 좋아요/취소 요청 수")
+    parser.add_argument("--contents", type=int, default=200)
+    parser.add_argument("--users", type=int, default=2000)
+    parser.add_argument("--modes", nargs="+", default=["direct", "buffered"])
+    parser.add_argument("--wal", action="store_true", help="journal_mode=WAL 로 실행")
+    parser.add_argument("--dir", default=None, help="DB 파일을 만들 디렉터리 (tmpfs 는 fsync 비용이 없음)")
+    args = parser.parse_args()
+
+    print(
+        f"{args.processes} processes, {args.likes} requests, flush every {settings.ENGAGEMENT_FLUSH_INTERVAL}s"
+        f", journal {'wal' if args.wal else 'delete'}"
+    )
+    for mode in args.modes:
+        result = run(mode, args)
+        print(
+            f"{mode:>9}: {result['rate']:9.0f} req/s  p50 {result['p50']:6.2f} ms  p99 {result['p99']:7.2f} ms"
+            f"  likes {result['likes']}  counter mismatches {result['mismatched']}"
+        )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""큰 이미지 워터마크 메모리/시간 벤치마크 (최대 RSS)
+
+    cd backend
+    python benchmarks/image_benchmark.py --megapixels 48 --jobs 4 --font /path/to/font.ttf --max-dimension 4096
+
+합성 JPEG 하나를 만든 뒤, 모드마다 새 프로세스에서 --jobs 개의 워터마크 작업을 스레드로 동시에
+실행하고 프로세스의 최대 RSS(ru_maxrss)를 잰다.
+
+1) legacy: 이전 방식 (전체 RGBA 변환 + 전체 크기 워터마크 레이어 합성)
+2) current: MediaService.add_watermark (헤더 확인, 축소 디코딩, 텍스트 영역만 합성, 메모리 예산)
+"""
+import argparse
+import multiprocessing
+import os
+import resource
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.config import settings
+
+FALLBACK_FONTS = [
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
+    "/usr/share/fonts/dejavu/DejaVuSans.ttf",
+    "/Library/Fonts/Arial.ttf",
+]
+
+def make_image(path: str, megapixels: float):
+    """4:3 합성 사진 (그라디언트 + 노이즈, 별도 프로세스에서 생성)"""
+    from PIL import Image
+    width = int((megapixels * 1_000_000 * 4 / 3) ** 0.5)
+    height = int(width * 3 / 4)
+    channels = [
+        Image.linear_gradient("L").resize((width, height)),
+        Image.radial_gradient("L").resize((width, height)),
+        Image.effect_noise((width, height), 40),
+    ]
+    Image.merge("RGB", channels).save(path, quality=90)
+
+def legacy_watermark(image_path: str, output_dir: str) -> str:
+    """비교용: 이전 add_watermark"""
+    from PIL import Image, ImageDraw, ImageFont
+    image = Image.open(image_path)
+    watermark = Image.new('RGBA', image.size, (0,0,0,0))
+    draw = ImageDraw.Draw(watermark)
+    font = ImageFont.truetype(settings.FONT_PATH, 12)
+    text = "Lento&Lux Inc."
+    text_width = draw.textlength(text, font=font)
+    draw.text(((image.width - text_width) // 2, (image.height - 12) // 2), text, font=font, fill=(128,128,128,128))
+    rotated_watermark = watermark.rotate(-45)
+    watermarked = Image.alpha_composite(image.convert('RGBA'), rotated_watermark)
+    output_path = os.path.join(output_dir, "legacy_watermarked.png")
+    watermarked.save(output_path)
+    return output_path
+
+def max_rss_mb() -> float:
+    # 리눅스는 KB, macOS 는 바이트
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return usage / 1024 / 1024 if sys.platform == "darwin" else usage / 1024
+
+def run_mode(mode: str, image_path: str, jobs: int, font_path: str, budget_mb: int, max_dimension: int, results):
+    settings.FONT_PATH = font_path
+    settings.IMAGE_MEMORY_BUDGET_MB = budget_mb
+    settings.WATERMARK_MAX_DIMENSION = max_dimension
+    import PIL.Image  # noqa: F401 (기준 RSS 에 포함)
+    from app.services.media_service import MediaService
+
+    baseline = max_rss_mb()
+    service = MediaService()
+    errors = []
+
+    def job(index: int):
+        output_dir = os.path.join(os.path.dirname(image_path), f"{mode}-{index}")
+        try:
+            if mode == "legacy":
+                os.makedirs(output_dir, exist_ok=True)
+                legacy_watermark(image_path, output_dir)
+            else:
+                service.add_watermark(image_path, output_dir=output_dir)
+        except Exception as e:
+            errors.append(repr(e))
+
+    threads = [threading.Thread(target=job, args=(index,)) for index in range(jobs)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    results.put((baseline, max_rss_mb(), time.perf_counter() - started, errors))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--megapixels", type=float, default=48)
+    parser.add_argument("--jobs", type=int, default=4, help="한 프로세스에서 동시에 처리할 이미지 수")
+    parser.add_argument("--modes", nargs="+", default=["legacy", "current"])
+    parser.add_argument("--font", default=None, help="기본값은 FONT_PATH (없으면 DejaVuSans)")
+    parser.add_argument("--budget-mb", type=int, default=settings.IMAGE_MEMORY_BUDGET_MB)
+    parser.add_argument(
+        "--max-dimension", type=int, default=settings.WATERMARK_MAX_DIMENSION,
+        help="current 모드의 WATERMARK_MAX_DIMENSION (0 이면 원본 크기)",
+    )
+    args = parser.parse_args()
+
+    font_path = args.font or next(
+        (path for path in [settings.FONT_PATH] + FALLBACK_FONTS if os.path.exists(path)), None
+    )
+    if font_path is None:
+        parser.error("TrueType 폰트를 찾을 수 없습니다 (--font 로 지정)")
+
+    context = multiprocessing.get_context("spawn")
+    with tempfile.TemporaryDirectory() as workdir:
+        image_path = os.path.join(workdir, "large.jpg")
+        start = time.perf_counter()
+        maker = context.Process(target=make_image, args=(image_path, args.megapixels))
+        maker.start()
+        maker.join()
+        print(
+            f"합성 JPEG 생성: {time.perf_counter() - start:.1f} s ({args.megapixels:g} MP, "
+            f"{os.path.getsize(image_path) / 1024 / 1024:.1f} MiB)"
+        )
+        print(
+            f"{args.jobs} jobs, WATERMARK_MAX_DIMENSION {args.max_dimension}, "
+            f"budget {args.budget_mb} MiB"
+        )
+
+        for mode in args.modes:
+            results = context.Queue()
+            process = context.Process(
+                target=run_mode,
+                args=(mode, image_path, args.jobs, font_path, args.budget_mb, args.max_dimension, results),
+            )
+            process.start()
+            process.join()
+            if process.exitcode != 0:
+                print(f"{mode:>8}: 프로세스 비정상 종료 (exit {process.exitcode}, 메모리 부족일 수 있음)")
+                continue
+            baseline, peak, elapsed, errors = results.get()
+            print(
+                f"{mode:>8}: peak RSS {peak:7.0f} MiB (+{peak - baseline:.0f} MiB)  {elapsed:6.2f} s"
+                + (f"  errors {errors}" if errors else "")
+            )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""비디오 미리보기(포스터 + 스프라이트) 추출 시간 벤치마크
+
+ffmpeg 로 긴 합성 영상을 만든 뒤, 키프레임만 디코딩하는 현재 방식과 전체 프레임을
+디코딩하는 방식을 비교한다. 네트워크는 사용하지 않는다.
+
+    cd backend
+    python benchmarks/preview_benchmark.py --duration 1800
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.config import settings
+from app.services.ffmpeg_utils import probe_video, run_ffmpeg
+from app.services.preview_service import PreviewService
+
+def make_clip(path: str, duration: int, size: str, fps: int, gop: int):
+    run_ffmpeg([
+        "-f", "lavfi", "-i", f"testsrc=size={size}:rate={fps}",
+        "-t", str(duration),
+        "-c:v", "libx264", "-preset", "ultrafast", "-g", str(gop), "-pix_fmt", "yuv420p",
+        path,
+    ])
+
+def full_decode_sprite(path: str, output_path: str):
+    """비교용: 모든 프레임을 디코딩해서 같은 스프라이트 생성"""
+    service = PreviewService()
+    info = probe_video(path)
+    interval = max(service.min_interval, info.duration / service.max_tiles)
+    run_ffmpeg([
+        "-i", path, "-an",
+        "-vf", f"fps=1/{interval:.3f},scale={service.thumb_width}:-2,tile={service.columns}x10",
+        "-frames:v", "1", output_path,
+    ])
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--duration", type=int, default=600, help="합성 영상 길이 (초)")
+    parser.add_argument("--size", default="1280x720")
+    parser.add_argument("--fps", type=int, default=30)
+    parser.add_argument("--gop", type=int, default=60, help="키프레임 간격 (프레임)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        clip = os.path.join(workdir, "clip.mp4")
+        start = time.perf_counter()
+        make_clip(clip, args.duration, args.size, args.fps, args.gop)
+        print(f"합성 영상 생성: {time.perf_counter() - start:.1f} s ({args.duration} s, {args.size})")
+
+        settings.PREVIEW_DIR = os.path.join(workdir, "previews")
+        service = PreviewService()
+
+        start = time.perf_counter()
+        service.generate(clip)
+        print(f"키프레임 추출 (포스터+스프라이트): {time.perf_counter() - start:.2f} s")
+
+        start = time.perf_counter()
+        service.generate(clip)
+        print(f"캐시 적중 (해시만 계산): {time.perf_counter() - start:.2f} s")
+
+        start = time.perf_counter()
+        full_decode_sprite(clip, os.path.join(workdir, "full.jpg"))
+        print(f"전체 디코딩 스프라이트 (비교용): {time.perf_counter() - start:.2f} s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""목록 응답 직렬화 비용 벤치마크 (기본 10,000건)
+
+    cd backend
+    python benchmarks/serialization_benchmark.py --items 10000
+
+1) ORM 객체 전체 조회 -> response_model 검증 -> jsonable_encoder -> 표준 json
+2) ORM 객체 전체 조회 -> response_model 검증 -> jsonable_encoder -> orjson
+3) 필요한 컬럼만 튜플로 조회 -> TypeAdapter 검증 + dump_json (현재 /api/content/list)
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import orjson
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app.models import Base, Content, ContentType, MediaType, ApprovalStatus
+from app.routers.content import content_response_query
+from app.schemas.content import ContentResponse, content_list_adapter
+
+def build_session(items: int):
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(insert(Content), [{
+            "user_id": 1,
+            "content_type": ContentType.DAILY,
+            "media_type": MediaType.IMAGE,
+            "title": f"운동 루틴 {i}",
+            "description": "하루 10분 스트레칭",
+            "file_path": f"uploads/{i:06d}_watermarked.png",
+            "github_path": f"contents/감성적_일상_나눔/{i:06d}.png",
+            "created_at": datetime(2024, 3, 19, 10, 0, 0),
+            "is_uploaded": i % 2 == 0,
+            "status": ApprovalStatus.APPROVED,
+        } for i in range(items)])
+    return sessionmaker(bind=engine)
+
+def orm_stdlib_json(db):
+    contents = db.query(Content).all()
+    models = [ContentResponse.model_validate(content) for content in contents]
+    return json.dumps(jsonable_encoder(models)).encode()
+
+def orm_orjson(db):
+    contents = db.query(Content).all()
+    models = [ContentResponse.model_validate(content) for content in contents]
+    return orjson.dumps(jsonable_encoder(models))
+
+def projected_adapter(db):
+    rows = content_response_query(db).all()
+    return content_list_adapter.dump_json(content_list_adapter.validate_python(rows, from_attributes=True))
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--items", type=int, default=10000)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    Session = build_session(args.items)
+    for name, fn in [
+        ("ORM + stdlib json", orm_stdlib_json),
+        ("ORM + orjson", orm_orjson),
+        ("projection + TypeAdapter", projected_adapter),
+    ]:
+        timings = []
+        for _ in range(args.runs):
+            db = Session()
+            start = time.perf_counter()
+            body = fn(db)
+            timings.append((time.perf_counter() - start) * 1000)
+            db.close()
+        print(f"{name:>26}: median {statistics.median(timings):8.1f} ms  ({len(body) / 1024:.0f} KiB)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""워커 콜드 스타트 벤치마크
+
+새 인터프리터에서 `app.main` import + create_app() + lifespan 시작까지의 시간을 잰다.
+임시 디렉터리에서 실행하므로 ./fitmate.db 는 매번 새로 만들어진다.
+
+    cd backend
+    python benchmarks/startup_benchmark.py --runs 10
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CHILD = r"""
+import asyncio, json, sys, time
+t0 = time.perf_counter()
+import app.main
+t1 = time.perf_counter()
+application = app.main.create_app()
+t2 = time.perf_counter()
+
+async def start():
+    async with application.router.lifespan_context(application):
+        pass
+
+asyncio.run(start())
+t3 = time.perf_counter()
+heavy = [name for name in ("moviepy", "PIL", "github") if name in sys.modules]
+print(json.dumps({"import": t1 - t0, "create_app": t2 - t1, "lifespan": t3 - t2, "heavy_modules": heavy}))
+"""
+
+def run_once(workdir: str) -> dict:
+    env = dict(os.environ, PYTHONPATH=BACKEND_DIR)
+    output = subprocess.check_output([sys.executable, "-c", CHILD], cwd=workdir, env=env)
+    return json.loads(output.decode().strip().splitlines()[-1])
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    results = []
+    for _ in range(args.runs):
+        with tempfile.TemporaryDirectory() as workdir:
+            results.append(run_once(workdir))
+
+    for key in ("import", "create_app", "lifespan"):
+        values = [r[key] * 1000 for r in results]
+        print(f"{key:>10}: median {statistics.median(values):8.1f} ms  max {max(values):8.1f} ms")
+    total = [(r["import"] + r["create_app"] + r["lifespan"]) * 1000 for r in results]
+    print(f"{'total':>10}: median {statistics.median(total):8.1f} ms  max {max(total):8.1f} ms")
+    print(f"heavy modules loaded at startup: {results[-1]['heavy_modules'] or 'none'}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,25 @@
+import os
+import sys
+import tempfile
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# DB, 업로드, 이벤트 파일 경로가 모두 현재 디렉터리 기준이므로 임시 디렉터리에서 실행
+os.chdir(tempfile.mkdtemp(prefix="fitmate-test-"))
+
+from app.core.security import create_access_token  # noqa: E402
+from app.main import init_database  # noqa: E402
+
+@pytest.fixture(scope="session", autouse=True)
+def database():
+    init_database(run_migrations=True, seed=True)
+
+@pytest.fixture
+def admin_headers():
+    return {"Authorization": f"Bearer {create_access_token({'sub': 'admin'})}"}
+
+@pytest.fixture
+def user_headers():
+    return {"Authorization": f"Bearer {create_access_token({'sub': 'user1'})}"}
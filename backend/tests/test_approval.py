@@ -0,0 +1,68 @@
+from datetime import datetime
+
+from fastapi.testclient import TestClient
+
+from app.database import SessionLocal
+from app.main import create_app
+from app.models import ApprovalStatus, Content, ContentType, MediaType
+from app.models.publication import ContentPublication
+
+REVIEWED_AT = datetime(2024, 1, 1)
+
+def _contents(*statuses) -> list:
+    db = SessionLocal()
+    try:
+        contents = [
+            Content(
+                user_id=2, content_type=ContentType.DAILY, media_type=MediaType.TEXT, title="승인",
+                status=status,
+                reviewed_by=None if status == ApprovalStatus.PENDING else 2,
+                reviewed_at=None if status == ApprovalStatus.PENDING else REVIEWED_AT,
+            )
+            for status in statuses
+        ]
+        db.add_all(contents)
+        db.commit()
+        return [content.id for content in contents]
+    finally:
+        db.close()
+
+def _review(content_id: int):
+    db = SessionLocal()
+    try:
+        content = db.get(Content, content_id)
+        queued = db.query(ContentPublication).filter(ContentPublication.content_id == content_id).count()
+        return content.status, content.reviewed_by, content.reviewed_at, queued
+    finally:
+        db.close()
+
+def test_batch_skips_already_reviewed(admin_headers):
+    pending, approved, rejected, other_pending = _contents(
+        ApprovalStatus.PENDING, ApprovalStatus.APPROVED, ApprovalStatus.REJECTED, ApprovalStatus.PENDING
+    )
+    missing = other_pending + 1000
+    ids = [approved, pending, missing, rejected, pending]
+
+    with TestClient(create_app(run_migrations=False, seed=False)) as client:
+        response = client.post(
+            "/api/content/approve/batch", headers=admin_headers,
+            json={"ids": ids, "action": "approve", "publish": True},
+        )
+        assert response.status_code == 200
+        # 요청 순서대로, 이 요청이 실제로 바꾼 id 만 updated
+        assert response.json() == {"updated": [pending, rejected], "skipped": [approved, missing]}
+
+        # 이미 승인된 컨텐츠는 검토자/시각이 그대로이고 게시 대기열에도 들어가지 않음
+        assert _review(approved) == (ApprovalStatus.APPROVED, 2, REVIEWED_AT, 0)
+        status, reviewed_by, reviewed_at, queued = _review(pending)
+        assert (status, reviewed_by, queued) == (ApprovalStatus.APPROVED, 1, 3)
+        assert reviewed_at != REVIEWED_AT
+
+        # 같은 id 를 다시 보내면 (다른 관리자가 먼저 처리한 경우) 모두 skipped
+        response = client.post(
+            "/api/content/approve/batch", headers=admin_headers,
+            json={"ids": [pending, rejected, other_pending], "action": "reject"},
+        )
+        assert response.json() == {"updated": [other_pending], "skipped": [pending, rejected]}
+        assert _review(pending)[0] == ApprovalStatus.APPROVED
+        assert _review(other_pending)[:2] == (ApprovalStatus.REJECTED, 1)
@@ -0,0 +1,68 @@
+import os
+from datetime import datetime, timedelta
+
+from app.core.config import settings
+from app.database import SessionLocal
+from app.models import ArchivedFile, Content, ContentType, MediaType
+from app.services.archive_service import ArchiveService
+
+def _old_content(db, name: str) -> Content:
+    os.makedirs(settings.UPLOAD_DIR, exist_ok=True)
+    path = os.path.join(settings.UPLOAD_DIR, name)
+    with open(path, "w") as f:
+        f.write(name * 100)
+    content = Content(
+        user_id=1, content_type=ContentType.DAILY, media_type=MediaType.TEXT, title=name, file_path=path,
+        created_at=datetime.utcnow() - timedelta(days=settings.ARCHIVE_MIN_AGE_DAYS + 1),
+    )
+    db.add(content)
+    db.commit()
+    return content
+
+def test_sweeps_move_past_archived_batches(monkeypatch):
+    monkeypatch.setattr(settings, "ARCHIVE_SWEEP_BATCH", 2)
+    db = SessionLocal()
+    try:
+        contents = [_old_content(db, f"sweep-{i}.txt") for i in range(3)]
+        paths = [content.file_path for content in contents]
+
+        first = ArchiveService(db).sweep()
+        second = ArchiveService(db).sweep()
+        third = ArchiveService(db).sweep()
+
+        assert (first.contents, first.archived) == (2, 2)
+        assert (second.contents, second.archived) == (1, 1)
+        assert third.contents == 0
+        assert not any(os.path.exists(path) for path in paths)
+        assert db.query(ArchivedFile).filter(ArchivedFile.path.in_(paths)).count() == 3
+
+        # 다시 꺼낸 파일은 다음 정리에서 다시 처리 (묶음에 있으므로 지우기만 함)
+        ArchiveService(db).restore(paths[0])
+        assert os.path.exists(paths[0])
+        released = ArchiveService(db).sweep()
+        assert (released.contents, released.released, released.archived) == (1, 1, 0)
+        assert not os.path.exists(paths[0])
+    finally:
+        db.close()
+
+def test_rewritten_restored_file_is_archived_again():
+    db = SessionLocal()
+    try:
+        content = _old_content(db, "rewrite.txt")
+        path = content.file_path
+        ArchiveService(db).sweep()
+        ArchiveService(db).restore(path)
+
+        # 꺼낸 뒤 같은 길이의 다른 내용으로 다시 씀
+        rewritten = "x" * os.path.getsize(path)
+        with open(path, "w") as f:
+            f.write(rewritten)
+        result = ArchiveService(db).sweep()
+        assert (result.released, result.archived) == (0, 1)
+        assert not os.path.exists(path)
+
+        ArchiveService(db).restore(path)
+        with open(path) as f:
+            assert f.read() == rewritten
+    finally:
+        db.close()
@@ -0,0 +1,125 @@
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+
+from app.database import SessionLocal
+from app.main import create_app
+from app.models import ApprovalStatus, Content, ContentEngagement, ContentLike, ContentType, MediaType
+from app.routers import content as content_router
+from app.services.engagement_service import EngagementBuffer
+
+def _content() -> int:
+    db = SessionLocal()
+    try:
+        content = Content(
+            user_id=1, content_type=ContentType.DAILY, media_type=MediaType.TEXT, title="좋아요",
+            status=ApprovalStatus.APPROVED,
+        )
+        db.add(content)
+        db.commit()
+        return content.id
+    finally:
+        db.close()
+
+def _stored(content_id: int):
+    """(content_likes 행의 user_id 목록, 저장된 좋아요 수)"""
+    db = SessionLocal()
+    try:
+        users = sorted(user_id for (user_id,) in db.query(ContentLike.user_id).filter(
+            ContentLike.content_id == content_id
+        ))
+        counter = db.query(ContentEngagement.likes_count).filter(ContentEngagement.content_id == content_id).first()
+        return users, counter.likes_count if counter else 0
+    finally:
+        db.close()
+
+def _likes_count(buffer: EngagementBuffer, content_id: int) -> int:
+    db = SessionLocal()
+    try:
+        return buffer.likes_count(db, content_id)
+    finally:
+        db.close()
+
+def test_repeated_likes_count_once():
+    content_id = _content()
+    buffer = EngagementBuffer()
+    assert buffer.set_like(content_id, 1, True)
+    assert not buffer.set_like(content_id, 1, True)
+    assert _likes_count(buffer, content_id) == 1
+    buffer.flush()
+    assert _stored(content_id) == ([1], 1)
+
+    # 이미 저장된 좋아요를 다시 눌러도 (새 워커라 상태를 몰라도) 반영 후에는 그대로 1
+    other_worker = EngagementBuffer()
+    other_worker.set_like(content_id, 1, True)
+    other_worker.flush()
+    assert _stored(content_id) == ([1], 1)
+    assert _likes_count(other_worker, content_id) == 1
+
+def test_unlike_before_flush():
+    content_id = _content()
+    buffer = EngagementBuffer()
+    buffer.set_like(content_id, 1, True)
+    buffer.set_like(content_id, 1, False)
+    assert _likes_count(buffer, content_id) == 0
+    buffer.flush()
+    assert _stored(content_id) == ([], 0)
+
+    # 저장된 좋아요를 반영 전에 취소
+    buffer.set_like(content_id, 2, True)
+    buffer.flush()
+    buffer.set_like(content_id, 2, False)
+    assert _likes_count(buffer, content_id) == 0
+    buffer.flush()
+    assert _stored(content_id) == ([], 0)
+
+def test_counters_match_rows_after_flush(monkeypatch):
+    content_id = _content()
+    workers = [EngagementBuffer(), EngagementBuffer()]
+    taps = [(1, True), (2, True), (3, True), (2, False), (1, True), (3, False), (3, True), (4, False)]
+    for index, (user_id, liked) in enumerate(taps):
+        workers[index % 2].set_like(content_id, user_id, liked)
+    for worker in workers:
+        worker.flush()
+    users, likes_count = _stored(content_id)
+    assert likes_count == len(users)
+    # 마지막으로 반영한 워커는 바로, 다른 워커는 캐시가 한 주기 지난 뒤 같은 값을 봄
+    assert _likes_count(workers[-1], content_id) == likes_count
+    monkeypatch.setattr(settings, "ENGAGEMENT_FLUSH_INTERVAL", 0)
+    for worker in workers:
+        assert _likes_count(worker, content_id) == likes_count
+
+def test_discard_during_flush_does_not_restore_likes():
+    content_id = _content()
+    buffer = EngagementBuffer()
+    buffer.set_like(content_id, 1, True)
+    write = buffer._write
+
+    def delete_while_flushing(likes, comments):
+        # 반영 중에 다른 요청이 컨텐츠를 삭제
+        db = SessionLocal()
+        try:
+            buffer.discard_content(db, content_id)
+            db.query(Content).filter(Content.id == content_id).delete()
+            db.commit()
+        finally:
+            db.close()
+        return write(likes, comments)
+
+    buffer._write = delete_while_flushing
+    buffer.flush()
+    assert _stored(content_id) == ([], 0)
+    assert buffer.pending_deltas() == {}
+    assert content_id not in buffer._like_totals
+
+def test_like_endpoint(monkeypatch, user_headers):
+    content_id = _content()
+    buffer = EngagementBuffer()
+    monkeypatch.setattr(content_router, "get_engagement_buffer", lambda: buffer)
+    with TestClient(create_app(run_migrations=False, seed=False)) as client:
+        url = f"/api/content/{content_id}/like"
+        assert client.post(url, headers=user_headers).json() == {"liked": True, "likes_count": 1}
+        assert client.post(url, headers=user_headers).json() == {"liked": True, "likes_count": 1}
+        assert client.delete(url, headers=user_headers).json() == {"liked": False, "likes_count": 0}
+    buffer.flush()
+    assert _stored(content_id) == ([], 0)
@@ -0,0 +1,46 @@
+import socket
+import threading
+import time
+
+import httpx
+import pytest
+import uvicorn
+
+from app.database import engine
+from app.main import create_app
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+@pytest.fixture
+def server():
+    port = _free_port()
+    config = uvicorn.Config(create_app(run_migrations=False, seed=False), port=port, log_level="warning")
+    instance = uvicorn.Server(config)
+    thread = threading.Thread(target=instance.run, daemon=True)
+    thread.start()
+    while not instance.started:
+        time.sleep(0.05)
+    yield f"http://127.0.0.1:{port}"
+    instance.should_exit = True
+    thread.join(timeout=10)
+
+def test_open_streams_do_not_hold_db_connections(server, admin_headers):
+    streams = engine.pool.size() + engine.pool._max_overflow + 2
+    client = httpx.Client(base_url=server, timeout=5)
+    responses = []
+    try:
+        for _ in range(streams):
+            response = client.send(client.build_request("GET", "/api/events/stream", headers=admin_headers), stream=True)
+            assert response.status_code == 200
+            next(response.iter_lines())  # retry: 줄까지 받아 스트림이 열렸는지 확인
+            responses.append(response)
+
+        response = client.get("/api/content/pending", headers=admin_headers)
+        assert response.status_code == 200
+    finally:
+        for response in responses:
+            response.close()
+        client.close()
@@ -0,0 +1,130 @@
+import os
+import threading
+import time
+
+from app.services.github_service import GitHubService, GitHubTreeCache
+
+class _Response:
+    def __init__(self, status_code, body=None, etag=None):
+        self.status_code = status_code
+        self._body = body
+        self.headers = {"ETag": etag} if etag else {}
+
+    def json(self):
+        return self._body
+
+    def raise_for_status(self):
+        pass
+
+class _FakeGitHub:
+    """ETag 가 같으면 304, 아니면 전체 트리"""
+
+    def __init__(self, files):
+        self.files = dict(files)
+        self.version = 1
+        self.requests = []
+
+    def get(self, url, params=None, headers=None, timeout=None):
+        etag = f'"v{self.version}"'
+        self.requests.append((headers or {}).get("If-None-Match"))
+        if (headers or {}).get("If-None-Match") == etag:
+            return _Response(304)
+        tree = [{"path": path, "sha": sha, "type": "blob"} for path, sha in self.files.items()]
+        return _Response(200, {"tree": tree, "truncated": False}, etag)
+
+def _cache(github) -> GitHubTreeCache:
+    cache = GitHubTreeCache("owner/repo", "main", "token", snapshot_path=None, ttl=60)
+    cache._session = github
+    return cache
+
+def test_writes_update_cache_in_place_and_keep_etag():
+    github = _FakeGitHub({"contents/a.png": "sha-a"})
+    cache = _cache(github)
+    assert cache.get_sha("contents/a.png") == "sha-a"
+    assert github.requests == [None]
+
+    cache.record_write("contents/b.png", "sha-b")
+    assert cache.etag == '"v1"'
+    assert cache.get_sha("contents/b.png") == "sha-b"
+    cache.record_write("contents/a.png", None)
+    assert cache.etag == '"v1"'
+    assert github.requests == [None]
+
+    # TTL 이 지나면 조건부 요청
+    cache._checked_at = time.monotonic() - 61
+    cache.has_directory("contents")
+    assert github.requests == [None, '"v1"']
+
+def test_misses_refresh_at_most_once_per_ttl():
+    github = _FakeGitHub({"contents/a.png": "sha-a"})
+    cache = _cache(github)
+    assert cache.get_sha("contents/missing-0.png") is None  # 첫 조회가 곧 새로 받은 트리
+    for i in range(1, 20):
+        assert cache.get_sha(f"contents/missing-{i}.png") is None
+    assert github.requests == [None, '"v1"']
+
+    # 다른 곳에서 추가된 파일은 다음 TTL 에 보임
+    github.files["contents/new.png"] = "sha-new"
+    github.version = 2
+    assert cache.get_sha("contents/new.png") is None
+    cache._checked_at = time.monotonic() - 61
+    assert cache.get_sha("contents/new.png") == "sha-new"
+    assert github.requests == [None, '"v1"', '"v1"']
+
+def test_concurrent_snapshot_writes(tmp_path):
+    snapshot_path = str(tmp_path / "tree.json")
+    caches = [
+        GitHubTreeCache("owner/repo", "main", "token", snapshot_path=snapshot_path, ttl=60)
+        for _ in range(4)
+    ]
+    for cache in caches:
+        cache._session = _FakeGitHub({})
+
+    def write(cache, index):
+        for i in range(50):
+            cache.record_write(f"contents/{index}-{i}.png", f"sha-{i}")
+
+    threads = [threading.Thread(target=write, args=(cache, i)) for i, cache in enumerate(caches)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert os.listdir(tmp_path) == ["tree.json"]
+    reloaded = GitHubTreeCache("owner/repo", "main", "token", snapshot_path=snapshot_path, ttl=60)
+    assert len(reloaded.files) == 50
+
+def test_snapshot_failure_does_not_fail_write(tmp_path, monkeypatch):
+    cache = GitHubTreeCache("owner/repo", "main", "token", snapshot_path=str(tmp_path / "tree.json"), ttl=60)
+
+    def fail(*args):
+        raise FileNotFoundError("다른 워커가 먼저 옮김")
+
+    monkeypatch.setattr(os, "replace", fail)
+    cache.record_write("contents/a.png", "sha-a")
+    assert cache.files == {"contents/a.png": "sha-a"}
+    assert os.listdir(tmp_path) == []
+
+class _Repo:
+    def __init__(self, private):
+        self.private = private
+        self.lookups = []
+
+    def get_contents(self, path, ref=None):
+        self.lookups.append(path)
+        return type("File", (), {"download_url": f"https://raw.example/{path}?token=secret"})()
+
+def _service(private):
+    service = GitHubService()
+    service._repo = _Repo(private)
+    service.tree = _cache(_FakeGitHub({"contents/a.png": "sha-a"}))
+    return service
+
+def test_private_repo_uses_api_download_url():
+    service = _service(private=True)
+    assert service.get_file_url("contents/a.png") == "https://raw.example/contents/a.png?token=secret"
+    assert service._repo.lookups == ["contents/a.png"]
+
+    service = _service(private=False)
+    assert service.get_file_url("contents/a.png").endswith("/owner/repo/main/contents/a.png")
+    assert service._repo.lookups == []
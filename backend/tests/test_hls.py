@@ -0,0 +1,115 @@
+import os
+import subprocess
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.database import SessionLocal
+from app.main import create_app
+from app.models import Content, ContentType, MediaType
+from app.routers import content as content_router
+from app.services.ffmpeg_utils import VideoInfo, ffmpeg_binary
+from app.services.hls_service import HLSService
+
+def _info(width: int, height: int) -> VideoInfo:
+    return VideoInfo(width=width, height=height, duration=10.0, fps=30.0, has_audio=True)
+
+@pytest.mark.parametrize("width, height, expected", [
+    (1280, 720, {"360p": (640, 360), "720p": (1280, 720)}),
+    (720, 1280, {"360p": (360, 640), "720p": (720, 1280)}),
+    (1080, 1920, {"360p": (360, 640), "720p": (720, 1280), "1080p": (1080, 1920)}),
+    (240, 426, {"360p": (240, 426)}),
+])
+def test_ladder_uses_short_edge(width, height, expected):
+    service = HLSService()
+    info = _info(width, height)
+    ladder = {r["name"]: service._output_size(r, info) for r in service._renditions_for(info)}
+    assert ladder == expected
+
+class _NoGitHub:
+    def delete_from_github(self, path):
+        return True
+
+def test_delete_removes_hls_and_unshared_preview(monkeypatch, admin_headers):
+    monkeypatch.setattr(content_router, "get_github_service", lambda: _NoGitHub())
+    hls_key = "hls-delete-test"
+    os.makedirs(os.path.join(settings.HLS_DIR, hls_key, "360p"), exist_ok=True)
+    for key in ("preview-own", "preview-shared"):
+        os.makedirs(os.path.join(settings.PREVIEW_DIR, key), exist_ok=True)
+
+    db = SessionLocal()
+    try:
+        def video(preview_key, hls_path=None):
+            content = Content(
+                user_id=1, content_type=ContentType.DAILY, media_type=MediaType.VIDEO, title="v",
+                file_path="missing.mp4", hls_path=hls_path, preview_key=preview_key,
+            )
+            db.add(content)
+            db.commit()
+            return content.id
+
+        own = video("preview-own", f"{hls_key}/master.m3u8")
+        shared = video("preview-shared")
+        video("preview-shared")
+    finally:
+        db.close()
+
+    with TestClient(create_app(run_migrations=False, seed=False)) as client:
+        assert client.delete(f"/api/content/{own}", headers=admin_headers).status_code == 200
+        assert client.delete(f"/api/content/{shared}", headers=admin_headers).status_code == 200
+
+    assert not os.path.exists(os.path.join(settings.HLS_DIR, hls_key))
+    assert not os.path.exists(os.path.join(settings.PREVIEW_DIR, "preview-own"))
+    assert os.path.exists(os.path.join(settings.PREVIEW_DIR, "preview-shared"))
+
+SMALL_LADDER = [
+    {"name": "180p", "height": 180, "video_kbps": 200, "audio_kbps": 64},
+    {"name": "360p", "height": 360, "video_kbps": 500, "audio_kbps": 64},
+    {"name": "720p", "height": 720, "video_kbps": 1500, "audio_kbps": 96},
+]
+
+def _ffmpeg(*args):
+    try:
+        subprocess.run([ffmpeg_binary(), "-hide_banner", "-loglevel", "error", "-y", *args],
+                       check=True, capture_output=True)
+    except (OSError, subprocess.CalledProcessError):
+        pytest.skip("ffmpeg(libx264/aac) 없음")
+
+@pytest.mark.parametrize("rotated", [False, True], ids=["portrait", "rotated-landscape"])
+def test_package_portrait_clip(rotated, tmp_path, monkeypatch):
+    """합성 세로 영상을 실제로 패키징해서 master/variant 플레이리스트 확인"""
+    monkeypatch.setattr(settings, "HLS_DIR", str(tmp_path / "hls"))
+    monkeypatch.setattr(settings, "HLS_SEGMENT_SECONDS", 1)
+    monkeypatch.setattr(settings, "HLS_RENDITIONS", SMALL_LADDER)
+    size = "640x360" if rotated else "360x640"
+    clip = str(tmp_path / "clip.mp4")
+    _ffmpeg(
+        "-f", "lavfi", "-i", f"testsrc=size={size}:rate=30:duration=3",
+        "-f", "lavfi", "-i", "sine=frequency=440:duration=3",
+        "-c:v", "libx264", "-pix_fmt", "yuv420p", "-c:a", "aac", "-shortest", clip,
+    )
+    if rotated:
+        # 휴대폰처럼 가로로 저장하고 회전 정보만 붙임
+        source, clip = clip, str(tmp_path / "rotated.mp4")
+        _ffmpeg("-display_rotation:v", "90", "-i", source, "-c", "copy", clip)
+
+    master_path = HLSService().package(clip, "portrait")
+    root = os.path.join(settings.HLS_DIR, "portrait")
+    with open(os.path.join(settings.HLS_DIR, master_path)) as f:
+        master = f.read().splitlines()
+
+    # 짧은 변(360) 기준으로 720p 는 만들지 않고, 세로 비율 그대로
+    variants = {
+        uri: line.split("RESOLUTION=")[1]
+        for line, uri in zip(master, master[1:]) if line.startswith("#EXT-X-STREAM-INF")
+    }
+    assert variants == {"180p/index.m3u8": "180x320", "360p/index.m3u8": "360x640"}
+    for uri in variants:
+        with open(os.path.join(root, uri)) as f:
+            playlist = f.read()
+        segments = [line for line in playlist.splitlines() if line.endswith(".ts")]
+        assert "#EXT-X-PLAYLIST-TYPE:VOD" in playlist and "#EXT-X-ENDLIST" in playlist
+        assert len(segments) >= 2
+        for segment in segments:
+            assert os.path.getsize(os.path.join(root, os.path.dirname(uri), segment)) > 0
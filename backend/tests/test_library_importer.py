@@ -0,0 +1,40 @@
+import os
+
+from fastapi.testclient import TestClient
+from PIL import Image
+
+from app.database import SessionLocal
+from app.main import create_app
+from app.models import Content
+from app.routers import content as content_router
+from app.services.library_importer import LibraryImporter
+
+class _RecordingGitHub:
+    def __init__(self):
+        self.deleted = []
+
+    def delete_from_github(self, path):
+        self.deleted.append(path)
+
+def test_deleting_imported_content_does_not_touch_github(tmp_path, monkeypatch, admin_headers):
+    folder = tmp_path / "감성인터뷰"
+    folder.mkdir()
+    Image.new("RGB", (8, 8), "white").save(folder / "interview.jpg")
+
+    db = SessionLocal()
+    try:
+        result = LibraryImporter(db, root=str(tmp_path), workers=1, watermark=False).run()
+        assert result.created == 1
+        content = db.query(Content).filter(Content.file_path == str(folder / "interview.jpg")).one()
+        assert content.github_path is None
+        content_id = content.id
+    finally:
+        db.close()
+
+    github = _RecordingGitHub()
+    monkeypatch.setattr(content_router, "get_github_service", lambda: github)
+    with TestClient(create_app(run_migrations=False, seed=False)) as client:
+        assert client.delete(f"/api/content/{content_id}", headers=admin_headers).status_code == 200
+    assert github.deleted == []
+    # 라이브러리 원본은 앱이 관리하는 파일이 아님
+    assert os.path.exists(folder / "interview.jpg")
@@ -0,0 +1,56 @@
+import io
+import os
+import struct
+import zlib
+
+import pytest
+from fastapi.testclient import TestClient
+from PIL import Image
+
+from app.core.config import settings
+from app.main import create_app
+
+def _png_header_only(width: int, height: int) -> bytes:
+    """작은 PNG 의 IHDR 크기만 바꾼 파일 (헤더 검사 전에 디코딩하면 실패)"""
+    buffer = io.BytesIO()
+    Image.new("RGB", (1, 1)).save(buffer, "PNG")
+    data = bytearray(buffer.getvalue())
+    # 시그니처(8) + 길이(4) + "IHDR"(4) 다음이 너비/높이, 그 뒤 5바이트 다음이 CRC
+    data[16:24] = struct.pack(">II", width, height)
+    data[29:33] = struct.pack(">I", zlib.crc32(bytes(data[12:29])))
+    return bytes(data)
+
+@pytest.mark.parametrize("megapixels", [200, 400])
+def test_oversized_image_upload_is_rejected_and_removed(megapixels, user_headers):
+    width = 20000
+    height = megapixels * 1_000_000 // width
+    before = set(os.listdir(settings.UPLOAD_DIR)) if os.path.isdir(settings.UPLOAD_DIR) else set()
+    with TestClient(create_app(run_migrations=False, seed=False)) as client:
+        response = client.post(
+            "/api/content/upload",
+            params={"content_type": "감성적_일상_나눔", "title": "big", "description": "big"},
+            files={"file": ("big.png", _png_header_only(width, height), "image/png")},
+            headers=user_headers,
+        )
+    assert response.status_code == 413
+    assert set(os.listdir(settings.UPLOAD_DIR)) == before
+
+FONT = "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf"
+
+@pytest.mark.parametrize("max_dimension, expected", [(0, (5000, 300)), (1000, (1000, 60))])
+def test_watermark_downscales_only_when_configured(max_dimension, expected, tmp_path, monkeypatch):
+    if not os.path.exists(FONT):
+        pytest.skip("DejaVuSans 폰트 없음")
+    from app.services.media_service import MediaService
+
+    monkeypatch.setattr(settings, "FONT_PATH", FONT)
+    monkeypatch.setattr(settings, "WATERMARK_MAX_DIMENSION", max_dimension)
+    source = str(tmp_path / "wide.jpg")
+    Image.new("RGB", (5000, 300), "white").save(source)
+    limit = Image.MAX_IMAGE_PIXELS
+
+    output = MediaService().add_watermark(source, output_dir=str(tmp_path / "out"))
+    with Image.open(output) as image:
+        assert image.size == expected
+    # Pillow 의 프로세스 전역 한도는 건드리지 않음
+    assert Image.MAX_IMAGE_PIXELS == limit
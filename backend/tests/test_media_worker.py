@@ -0,0 +1,31 @@
+import threading
+import time
+
+from app.core.rate_limit import ConcurrencyLimit, get_rate_limit_store
+from app.services import media_worker
+
+def test_jobs_wait_for_a_media_slot(monkeypatch):
+    limit = ConcurrencyLimit("media-test", 1, lease=60)
+    monkeypatch.setattr(media_worker, "_media_limit", limit)
+    store = get_rate_limit_store()
+    # 다른 워커의 업로드/인코딩이 슬롯을 모두 쓰는 중
+    holder = store.acquire_slot("media-test", 1, 60, time.time())
+    started = threading.Event()
+
+    def job():
+        started.set()
+        # 작업하는 동안에는 슬롯을 잡고 있음
+        assert store.acquire_slot("media-test", 1, 60, time.time()) is None
+        return "done"
+
+    try:
+        future = media_worker.submit(job)
+        assert not started.wait(0.5)
+        store.release_slot("media-test", holder)
+        assert future.result(timeout=5) == "done"
+        # 끝나면 슬롯을 돌려줌
+        holder = store.acquire_slot("media-test", 1, 60, time.time())
+        assert holder is not None
+    finally:
+        store.release_slot("media-test", holder)
+        media_worker.shutdown()
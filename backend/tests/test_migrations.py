@@ -0,0 +1,43 @@
+import json
+
+from sqlalchemy import create_engine, text
+
+from app.database import Base
+from app.migrations import run_migrations
+
+def test_backfill_tolerates_malformed_legacy_rows(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    Base.metadata.create_all(bind=engine)
+    statuses = {
+        1: {"instagram": {"state": "posted", "attempts": "", "post_id": 12345},
+            "facebook": {"status": "failed", "attempts": "n/a", "error": {"code": 190}}},
+        2: {"twitter": {"state": "queued", "attempts": "None"}},
+        3: {"youtube": {"state": "uploading", "attempts": "3"}},
+    }
+    with engine.begin() as conn:
+        for content_id, status in statuses.items():
+            conn.execute(text(
+                "INSERT INTO contents (id, user_id, content_type, media_type, title, upload_status, is_uploaded, status) "
+                "VALUES (:id, 1, 'DAILY', 'IMAGE', 'legacy', :status, 0, 'APPROVED')"
+            ), {"id": content_id, "status": json.dumps(status)})
+        conn.execute(text(
+            "INSERT INTO contents (id, user_id, content_type, media_type, title, upload_status, is_uploaded, status) "
+            "VALUES (4, 1, 'DAILY', 'IMAGE', 'legacy', 'not json', 1, 'APPROVED')"
+        ))
+
+    assert "0004_backfill_content_publications" in run_migrations(engine)
+
+    with engine.connect() as conn:
+        rows = {
+            (row.content_id, row.platform): (row.state, row.attempts, row.last_error, row.external_id)
+            for row in conn.execute(text(
+                "SELECT content_id, platform, state, attempts, last_error, external_id FROM content_publications"
+            ))
+        }
+    assert rows == {
+        (1, "instagram"): ("POSTED", 1, None, "12345"),
+        (1, "facebook"): ("FAILED", 1, '{"code": 190}', None),
+        (2, "twitter"): ("QUEUED", 0, None, None),
+        (3, "youtube"): ("UPLOADING", 3, None, None),
+    }
+    engine.dispose()
@@ -0,0 +1,34 @@
+import os
+import subprocess
+
+import pytest
+
+from app.core.config import settings
+from app.services.ffmpeg_utils import ffmpeg_binary
+from app.services.preview_service import POSTER_FILE, SPRITE_FILE, SPRITE_VTT_FILE, PreviewService
+
+def _single_keyframe_clip(path: str):
+    """7초 세로 영상, 키프레임은 맨 앞 하나뿐"""
+    try:
+        subprocess.run([
+            ffmpeg_binary(), "-hide_banner", "-loglevel", "error", "-y",
+            "-f", "lavfi", "-i", "testsrc=size=720x1280:rate=30:duration=7",
+            "-c:v", "libx264", "-g", "1000", "-keyint_min", "1000", "-sc_threshold", "0",
+            "-pix_fmt", "yuv420p", path,
+        ], check=True, capture_output=True)
+    except (OSError, subprocess.CalledProcessError):
+        pytest.skip("ffmpeg(libx264) 없음")
+
+def test_poster_without_keyframe_after_seek(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "PREVIEW_DIR", str(tmp_path / "previews"))
+    video_path = str(tmp_path / "single-gop.mp4")
+    _single_keyframe_clip(video_path)
+
+    key = PreviewService().generate(video_path)
+    output_dir = os.path.join(settings.PREVIEW_DIR, key)
+    assert sorted(os.listdir(output_dir)) == sorted([POSTER_FILE, SPRITE_FILE, SPRITE_VTT_FILE])
+
+    # 포스터 없이 남은 이전 결과는 캐시로 보지 않고 다시 생성
+    os.remove(os.path.join(output_dir, POSTER_FILE))
+    assert PreviewService().generate(video_path) == key
+    assert os.path.getsize(os.path.join(output_dir, POSTER_FILE)) > 0
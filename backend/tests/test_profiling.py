@@ -0,0 +1,68 @@
+import asyncio
+import json
+import time
+
+import httpx
+from fastapi import FastAPI
+
+from app.core.profiling import ProfilingMiddleware, get_profile_store
+
+def _busy(seconds: float):
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+def profiled_work():
+    _busy(0.8)
+
+def other_sync_work():
+    _busy(0.5)
+
+def _app() -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(ProfilingMiddleware)
+
+    @app.get("/profiled")
+    def profiled():
+        profiled_work()
+        return {}
+
+    @app.get("/other-sync")
+    def other_sync():
+        time.sleep(0.1)
+        other_sync_work()
+        return {}
+
+    @app.get("/other-async")
+    async def other_async_work():
+        await asyncio.sleep(0.1)
+        _busy(0.3)  # 이벤트 루프를 막는 다른 요청
+        return {}
+
+    return app
+
+def test_profile_excludes_concurrent_requests(admin_headers):
+    async def run():
+        transport = httpx.ASGITransport(app=_app())
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await asyncio.gather(
+                client.get("/profiled", headers={**admin_headers, "X-Profile": "1"}),
+                client.get("/other-sync", headers=admin_headers),
+                client.get("/other-async"),
+            )
+
+    profiled, other_sync, other_async = asyncio.run(run())
+    assert profiled.status_code == other_sync.status_code == other_async.status_code == 200
+    assert "x-profile-id" not in other_sync.headers
+
+    with open(get_profile_store().speedscope_path(profiled.headers["x-profile-id"]), encoding="utf-8") as f:
+        speedscope = json.load(f)
+    frames = speedscope["shared"]["frames"]
+    sampled = {
+        frames[index]["name"]
+        for profile in speedscope["profiles"] if profile["type"] == "sampled"
+        for stack in profile["samples"] for index in stack
+    }
+    assert "profiled_work" in sampled
+    assert "other_sync_work" not in sampled
+    assert not any(name.endswith("other_async_work") for name in sampled)
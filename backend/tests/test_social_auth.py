@@ -0,0 +1,130 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from fastapi import HTTPException
+from jose import jwk, jwt
+
+from app.core import http
+from app.core.config import settings
+from app.services import social_service
+from app.services.social_service import GoogleJWKSCache, SocialService, TTLCache
+
+CLIENT_ID = "fitmate-test.apps.googleusercontent.com"
+
+class _Key:
+    def __init__(self, kid: str):
+        self.kid = kid
+        private = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        self.private_pem = private.private_bytes(
+            serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+        )
+        public_pem = private.public_key().public_bytes(
+            serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo
+        )
+        self.jwk = {**jwk.construct(public_pem, "RS256").to_dict(), "kid": kid, "use": "sig"}
+
+    def token(self, **claims) -> str:
+        payload = {
+            "iss": "https://accounts.google.com", "aud": CLIENT_ID, "sub": "google-user",
+            "email": "user@example.com", "exp": int(time.time()) + 600, **claims,
+        }
+        return jwt.encode(payload, self.private_pem, algorithm="RS256", headers={"kid": self.kid})
+
+class _Provider:
+    """Google JWKS / Kakao 사용자 정보 대역 서버"""
+
+    def __init__(self):
+        self.keys = []
+        self.jwks_response = None  # 설정하면 JWKS 대신 이 응답
+        self.kakao_response = httpx.Response(200, json={"id": 1234, "kakao_account": {}})
+        self.requests = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(str(request.url))
+        if str(request.url) == settings.GOOGLE_JWKS_URL:
+            return self.jwks_response or httpx.Response(
+                200, json={"keys": [key.jwk for key in self.keys]}, headers={"cache-control": "max-age=3600"}
+            )
+        if str(request.url) == settings.KAKAO_USER_INFO_URL:
+            return self.kakao_response
+        return httpx.Response(404)
+
+@pytest.fixture
+def provider(monkeypatch):
+    provider = _Provider()
+    monkeypatch.setattr(http, "_client", httpx.AsyncClient(transport=httpx.MockTransport(provider)))
+    monkeypatch.setattr(social_service, "google_jwks_cache", GoogleJWKSCache())
+    monkeypatch.setattr(social_service, "kakao_token_cache", TTLCache(60, 100))
+    monkeypatch.setattr(settings, "GOOGLE_CLIENT_ID", CLIENT_ID)
+    return provider
+
+@pytest.fixture(scope="module")
+def keys():
+    return _Key("key-1"), _Key("key-2")
+
+def _verify_google(token: str) -> dict:
+    return asyncio.run(SocialService.verify_google_token(token))
+
+def _rejected(call) -> HTTPException:
+    with pytest.raises(HTTPException) as error:
+        call()
+    assert error.value.status_code == 400
+    return error.value
+
+def test_google_token_verified_with_cached_keys(provider, keys):
+    provider.keys = [keys[0]]
+    assert _verify_google(keys[0].token())["email"] == "user@example.com"
+    assert _verify_google(keys[0].token(sub="other"))["sub"] == "other"
+    assert provider.requests == [settings.GOOGLE_JWKS_URL]
+
+@pytest.mark.parametrize("claims", [
+    {"exp": int(time.time()) - 60},
+    {"aud": "someone-else"},
+    {"iss": "https://evil.example.com"},
+])
+def test_google_token_rejected(provider, keys, claims):
+    provider.keys = [keys[0]]
+    _rejected(lambda: _verify_google(keys[0].token(**claims)))
+
+def test_google_token_signed_by_unknown_key(provider, keys):
+    provider.keys = [keys[0]]
+    _rejected(lambda: _verify_google(keys[1].token()))
+
+def test_google_key_rotation(provider, keys, monkeypatch):
+    provider.keys = [keys[0]]
+    _verify_google(keys[0].token())
+
+    # Google 이 새 키로 교체. 모르는 kid 는 (최소 간격이 지난 뒤) 한 번 다시 받아서 검증
+    provider.keys = [keys[0], keys[1]]
+    monkeypatch.setattr(social_service, "_FORCED_REFRESH_INTERVAL", 0)
+    assert _verify_google(keys[1].token())["sub"] == "google-user"
+    assert provider.requests == [settings.GOOGLE_JWKS_URL] * 2
+
+@pytest.mark.parametrize("response", [
+    httpx.Response(200, text="<html>Service Unavailable</html>"),
+    httpx.Response(200, json={"keys": [{"kty": "RSA"}]}),
+    httpx.Response(200, json=["not", "an", "object"]),
+    httpx.Response(503, text="<html>Service Unavailable</html>"),
+])
+def test_google_malformed_jwks_response(provider, keys, response):
+    provider.jwks_response = response
+    _rejected(lambda: _verify_google(keys[0].token()))
+
+def test_kakao_token(provider):
+    assert asyncio.run(SocialService.verify_kakao_token("good"))["id"] == 1234
+    # 검증 결과는 잠시 캐시
+    assert asyncio.run(SocialService.verify_kakao_token("good"))["id"] == 1234
+    assert provider.requests == [settings.KAKAO_USER_INFO_URL]
+
+@pytest.mark.parametrize("response", [
+    httpx.Response(401, json={"msg": "this access token does not exist", "code": -401}),
+    httpx.Response(200, text="<html>Bad Gateway</html>"),
+    httpx.Response(200, json=[1, 2, 3]),
+])
+def test_kakao_invalid_or_malformed_response(provider, response):
+    provider.kakao_response = response
+    _rejected(lambda: asyncio.run(SocialService.verify_kakao_token("token")))
@@ -0,0 +1,32 @@
+import multiprocessing
+import os
+import sqlite3
+
+def _init_worker(directory, barrier, results):
+    os.chdir(directory)
+    from app.main import init_database
+    barrier.wait()
+    try:
+        init_database(run_migrations=True, seed=True)
+        results.put(None)
+    except Exception as e:
+        results.put(repr(e))
+
+def test_concurrent_worker_startup_on_fresh_database(tmp_path):
+    # uvicorn --workers 4 처럼 여러 프로세스가 동시에 빈 DB 를 초기화
+    workers = 4
+    context = multiprocessing.get_context("spawn")
+    barrier = context.Barrier(workers)
+    results = context.Queue()
+    processes = [
+        context.Process(target=_init_worker, args=(str(tmp_path), barrier, results)) for _ in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    errors = [results.get(timeout=60) for _ in processes]
+    for process in processes:
+        process.join()
+
+    assert errors == [None] * workers
+    with sqlite3.connect(tmp_path / "fitmate.db") as conn:
+        assert conn.execute("SELECT COUNT(*) FROM users").fetchone()[0] == 2